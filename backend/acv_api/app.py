@@ -1,4 +1,5 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import sys
@@ -10,12 +11,38 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    from acv_cli import metrics
+    from acv_cli.analytics import Analytics
+    from acv_cli.cache import QueryCache
     from acv_cli.config import get_config
     from acv_cli.db import Database
+    from acv_cli.live import get_live_dir
+    from acv_cli.related import RelatedGraph, RelatedUpdater
+    from acv_cli.suggest import SuggestIndex
+    from .live import LiveHub
     config = get_config()
+    metrics.enable(config.metrics.get("enabled", True))
     app.state.db = Database(config.data_paths["db_path"])
+    app.state.search_cache = QueryCache(
+        maxsize=config.search.get("cache_size", 1024),
+        ttl=config.search.get("cache_ttl", 60),
+    )
+    app.state.suggest = SuggestIndex()
+    app.state.analytics = Analytics(Path(config.analytics.get("dir", "./data/analytics")))
+    app.state.live = LiveHub(
+        get_live_dir(),
+        queue_size=config.live.get("queue_size", 256),
+        idle_timeout=config.live.get("idle_timeout", 60),
+    )
+    app.state.related = None
+    if config.related.get("enabled", True):
+        graph = RelatedGraph.from_settings(app.state.db, config.related)
+        app.state.related = RelatedUpdater(graph, interval=config.related.get("interval", 30)).start()
     yield
     # Shutdown
+    await app.state.live.close()
+    if app.state.related is not None:
+        app.state.related.close()
 
 app = FastAPI(
     title="Self-AI-Knowledge API",
@@ -33,13 +60,29 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Opt-in per-request profiles under data/profiles/ (off unless [profiling] enabled)
+from .profiling import ProfilingMiddleware
+
+app.add_middleware(ProfilingMiddleware)
+
+# Compress large bodies (gzip, or brotli when installed and accepted)
+from .caching import CompressionMiddleware, conditional_response, make_etag
+
+app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+# Per-route request latency for /metrics (outermost, so compression is included)
+from .metrics import MetricsMiddleware
+
+app.add_middleware(MetricsMiddleware)
+
 # Include routers
-from .routers import sessions, knowledge, skills, search
+from .routers import sessions, knowledge, skills, search, analytics
 
 app.include_router(sessions.router, prefix="/api/sessions")
 app.include_router(knowledge.router, prefix="/api/knowledge")
 app.include_router(skills.router, prefix="/api/skills")
 app.include_router(search.router, prefix="/api/search")
+app.include_router(analytics.router, prefix="/api/analytics")
 
 @app.get("/")
 async def root():
@@ -50,5 +93,15 @@ async def health():
     return {"status": "ok"}
 
 @app.get("/stats")
-async def stats():
-    return app.state.db.get_stats()
+async def stats(request: Request):
+    db = app.state.db
+    return conditional_response(request, make_etag("stats", db.get_generation()), db.get_stats)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Operation and request metrics in the Prometheus text format."""
+    from acv_cli import metrics
+
+    if not metrics.is_enabled():
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
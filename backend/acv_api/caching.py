@@ -0,0 +1,175 @@
+import hashlib
+import zlib
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Callable
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from acv_cli import metrics
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Clients may keep responses but must revalidate them on every use, which
+# turns polling into cheap conditional GETs.
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """Weak ETag derived from whatever identifies the current representation."""
+    digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def _not_modified_since(if_modified_since: str, last_modified: float) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since).timestamp()
+    except (TypeError, ValueError):
+        return False
+    # HTTP dates have one-second resolution.
+    return int(last_modified) <= since
+
+
+def conditional_response(
+    request: Request,
+    etag: str,
+    build: Callable[[], Any],
+    last_modified: float | None = None,
+) -> Response:
+    """Answer ``304 Not Modified`` when the client's validators still match.
+
+    ``build`` is only called when a full response is needed, so unchanged
+    polls skip the expensive part of the endpoint entirely.
+    Pass ``last_modified`` only for a single resource: for listings the
+    newest entry's mtime does not move when entries are deleted or archived,
+    so ``If-Modified-Since`` would validate a stale list (their ETag does).
+    """
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = formatdate(last_modified, usegmt=True)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        not_modified = _etag_matches(if_none_match, etag)
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        not_modified = bool(
+            if_modified_since
+            and last_modified is not None
+            and _not_modified_since(if_modified_since, last_modified)
+        )
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+    content = build()
+    with metrics.stage("api", "serialize"):
+        return JSONResponse(jsonable_encoder(content), headers=headers)
+
+
+# Streams whose chunks must reach the client as they are produced; a
+# compressor would hold them back until its buffer fills.
+_STREAMING_TYPES = ("text/event-stream", "application/x-ndjson")
+
+
+class _GzipCompressor:
+    """zlib with a gzip header, behind brotli's ``process``/``flush``/``finish`` interface."""
+
+    def __init__(self, level: int = 6):
+        self._zlib = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def process(self, data: bytes) -> bytes:
+        return self._zlib.compress(data)
+
+    def flush(self) -> bytes:
+        return self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._zlib.flush(zlib.Z_FINISH)
+
+
+class CompressionMiddleware:
+    """gzip response bodies, or brotli when the client accepts it and it is installed.
+
+    Bodies below ``minimum_size``, event streams and NDJSON streams are sent
+    uncompressed.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, brotli_quality: int = 4, gzip_level: int = 6):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.brotli_quality = brotli_quality
+        self.gzip_level = gzip_level
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            accept = Headers(scope=scope).get("accept-encoding", "")
+            tokens = [token.split(";")[0].strip() for token in accept.split(",")]
+            if brotli is not None and "br" in tokens:
+                await _CompressingResponder(self, send, "br").run(scope, receive)
+                return
+            if "gzip" in tokens:
+                await _CompressingResponder(self, send, "gzip").run(scope, receive)
+                return
+        await self.app(scope, receive, send)
+
+
+class _CompressingResponder:
+    def __init__(self, middleware: CompressionMiddleware, send: Send, encoding: str):
+        self.middleware = middleware
+        self.send = send
+        self.encoding = encoding
+        self.start: Message | None = None
+        self.compressor = None
+        self.passthrough = False
+
+    async def run(self, scope: Scope, receive: Receive) -> None:
+        await self.middleware.app(scope, receive, self.on_send)
+
+    def _compressor(self):
+        if self.encoding == "br":
+            return brotli.Compressor(quality=self.middleware.brotli_quality)
+        return _GzipCompressor(self.middleware.gzip_level)
+
+    async def on_send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            self.start = message
+            self.passthrough = (
+                "content-encoding" in headers
+                or headers.get("content-type", "").startswith(_STREAMING_TYPES)
+            )
+            return
+        if message["type"] != "http.response.body" or self.start is None:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.compressor is None:
+            if self.passthrough or (not more_body and len(body) < self.middleware.minimum_size):
+                await self.send(self.start)
+                self.start = None
+                await self.send(message)
+                return
+            self.compressor = self._compressor()
+            headers = MutableHeaders(raw=self.start["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            del headers["Content-Length"]
+            await self.send(self.start)
+
+        data = self.compressor.process(body)
+        data += self.compressor.finish() if not more_body else self.compressor.flush()
+        await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
@@ -0,0 +1,151 @@
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from pathlib import Path
+from typing import AsyncIterator
+
+# Queued in place of events for a subscriber that fell too far behind.
+DROPPED = {"type": "dropped", "reason": "slow consumer"}
+
+
+class _SessionFeed:
+    """Tails one session's live log and fans its events out to subscribers."""
+
+    def __init__(self, hub: "LiveHub", session_id: str, path: Path):
+        self.hub = hub
+        self.session_id = session_id
+        self.path = path
+        self.subscribers: set[asyncio.Queue] = set()
+        self.replay: deque[dict] = deque(maxlen=hub.replay_batches)
+        self.ended = False
+        self.task = asyncio.create_task(self._tail())
+
+    def subscribe(self) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.hub.queue_size)
+        for event in list(self.replay)[-self.hub.queue_size:]:
+            queue.put_nowait(event)
+        self.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self.subscribers.discard(queue)
+        if not self.subscribers:
+            self.task.cancel()
+            if self.hub._feeds.get(self.session_id) is self:
+                del self.hub._feeds[self.session_id]
+
+    def _publish(self, event: dict) -> None:
+        self.replay.append(event)
+        for queue in list(self.subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Slow consumer: discard its backlog and tell it to go away.
+                self.subscribers.discard(queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(DROPPED)
+
+    async def _tail(self) -> None:
+        try:
+            f = open(self.path, encoding="utf-8")
+        except FileNotFoundError:
+            # The recorder finished (and removed its log) before we attached.
+            self._publish({"type": "session_end", "session_id": self.session_id})
+            self.ended = True
+            return
+        with f:
+            partial = ""
+            while True:
+                chunk = f.read()
+                if not chunk:
+                    if self.hub.is_idle(os.fstat(f.fileno()).st_mtime):
+                        # The recorder died without writing its end marker.
+                        self._publish({"type": "session_end", "session_id": self.session_id, "reason": "idle"})
+                        self.ended = True
+                        return
+                    await asyncio.sleep(self.hub.poll_interval)
+                    continue
+                lines = (partial + chunk).split("\n")
+                partial = lines.pop()
+                for line in lines:
+                    if not line.strip():
+                        continue
+                    event = json.loads(line)
+                    self._publish(event)
+                    if event.get("type") == "session_end":
+                        self.ended = True
+                        return
+
+
+class LiveHub:
+    """Fan out live session events from the recorder's NDJSON logs.
+
+    One tail task runs per watched session regardless of the number of
+    viewers. Each viewer gets a bounded queue; viewers that let it fill up are
+    dropped instead of slowing down the others. A log not written (or kept
+    alive) for ``idle_timeout`` seconds counts as ended.
+    """
+
+    def __init__(
+        self,
+        live_dir: Path,
+        queue_size: int = 256,
+        replay_batches: int = 100,
+        poll_interval: float = 0.1,
+        heartbeat_interval: float = 15.0,
+        idle_timeout: float = 60.0,
+    ):
+        self.live_dir = live_dir
+        self.queue_size = queue_size
+        self.replay_batches = replay_batches
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.idle_timeout = idle_timeout
+        self._feeds: dict[str, _SessionFeed] = {}
+
+    def is_idle(self, mtime: float) -> bool:
+        return time.time() - mtime > self.idle_timeout
+
+    def is_live(self, session_id: str) -> bool:
+        feed = self._feeds.get(session_id)
+        if feed is not None and not feed.ended:
+            return True
+        try:
+            return not self.is_idle((self.live_dir / f"{session_id}.ndjson").stat().st_mtime)
+        except FileNotFoundError:
+            return False
+
+    async def subscribe(self, session_id: str) -> AsyncIterator[dict]:
+        """Yield live events for ``session_id`` until the session ends or we are dropped."""
+        feed = self._feeds.get(session_id)
+        if feed is None or feed.ended:
+            feed = _SessionFeed(self, session_id, self.live_dir / f"{session_id}.ndjson")
+            self._feeds[session_id] = feed
+        queue = feed.subscribe()
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), self.heartbeat_interval)
+                except asyncio.TimeoutError:
+                    yield {"type": "heartbeat"}
+                    continue
+                yield event
+                if event["type"] in ("session_end", "dropped"):
+                    return
+        finally:
+            feed.unsubscribe(queue)
+
+    async def sse(self, session_id: str) -> AsyncIterator[str]:
+        async for event in self.subscribe(session_id):
+            if event["type"] == "heartbeat":
+                yield ": heartbeat\n\n"
+            else:
+                yield f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+    async def close(self) -> None:
+        for feed in list(self._feeds.values()):
+            feed.task.cancel()
+        self._feeds.clear()
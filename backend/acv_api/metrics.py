@@ -0,0 +1,51 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from acv_cli import metrics
+
+
+def route_template(scope: Scope) -> str:
+    """Path template of the matched route, e.g. ``/api/sessions/{session_id}``."""
+    template = getattr(scope.get("route"), "path", None)
+    if template is None:
+        return "unmatched"
+    # Routes of an included router may report their path relative to its
+    # prefix; take the prefix from the leading segments of the request path.
+    depth = template.count("/")
+    segments = scope["path"].split("/")
+    prefix = "/".join(segments[:-depth] if depth else segments)
+    return prefix + template
+
+
+class MetricsMiddleware:
+    """Record request latency per route template (``/api/sessions/{session_id}``).
+
+    Requests that match no route share one label so arbitrary paths cannot
+    create unbounded series. Streaming responses are timed until their last
+    body chunk.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not metrics.is_enabled():
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            metrics.HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - start, scope["method"], route_template(scope), str(status)
+            )
@@ -0,0 +1,220 @@
+import cProfile
+import hmac
+import ipaddress
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import parse_qs
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+MODES = ("collapsed", "pstats")
+_SLUG = re.compile(r"[^A-Za-z0-9]+")
+
+
+class RateLimiter:
+    """Token bucket allowing ``per_minute`` acquisitions per minute, in bursts of up to that many."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = max(per_minute, 0)
+        self.rate = self.capacity / 60
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+class StackSampler:
+    """Periodically sample one thread's Python stack into collapsed-stack counts."""
+
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="acv-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.counts
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.counts[";".join(reversed(stack))] += 1
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's folded format, readable by flamegraph.pl and speedscope."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.counts.most_common())
+
+
+class ProfilingMiddleware:
+    """Profile individual API requests on demand.
+
+    A request is profiled when it sends ``X-Profile: collapsed|pstats`` (or
+    ``?profile=collapsed|pstats``), or when it is picked by ``sample_rate``.
+    Nothing happens unless ``[profiling] enabled``. Requested profiles must
+    carry the configured ``token`` in ``X-Profile-Token``; without a token
+    only loopback clients may request them (sampled profiles need neither).
+    Profiles are rate-limited to ``max_per_minute`` and run one at a time.
+
+    ``collapsed`` samples the event loop thread's stack every ``interval``
+    seconds (cheap enough for production, flamegraph-ready); ``pstats`` runs
+    cProfile (exact call counts, higher overhead). Either profile is written
+    to ``data/profiles/`` and named in the ``X-Profile-Path`` response header,
+    or returned as the response body with ``X-Profile-Output: response``.
+    Both observe the whole event loop thread, so concurrent requests show up
+    in the profile too.
+    """
+
+    def __init__(self, app: ASGIApp):
+        from acv_cli.config import get_config
+
+        config = get_config()
+        settings = config.profiling
+        self.app = app
+        self.enabled = settings.get("enabled", False)
+        self.token = settings.get("token", "")
+        self.sample_rate = settings.get("sample_rate", 0.0)
+        self.interval = settings.get("interval", 0.005)
+        self.max_files = settings.get("max_files", 200)
+        self.limiter = RateLimiter(settings.get("max_per_minute", 6))
+        self.output_dir = Path(config.data_paths.get("base_dir", "./data")) / "profiles"
+        self._busy = threading.Lock()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        mode = headers.get("x-profile") or query.get("profile", [None])[0]
+        requested = mode is not None
+        if mode in ("1", "true"):
+            mode = "collapsed"
+        if not requested and self.sample_rate and random.random() < self.sample_rate:
+            mode = "collapsed"
+
+        status = None
+        if mode is None:
+            pass
+        elif mode not in MODES:
+            status = "unknown-mode"
+        elif requested and not self._authorized(scope, headers):
+            status = "forbidden"
+        elif not self._busy.acquire(blocking=False):
+            status = "busy"
+        elif not self.limiter.acquire():
+            self._busy.release()
+            status = "rate-limited"
+        else:
+            try:
+                to_response = requested and headers.get("x-profile-output") == "response"
+                await self._profile(scope, receive, send, mode, to_response)
+            finally:
+                self._busy.release()
+            return
+
+        if status is None or not requested:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_status(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-Profile-Status"] = status
+            await send(message)
+
+        await self.app(scope, receive, send_with_status)
+
+    def _authorized(self, scope: Scope, headers: Headers) -> bool:
+        if self.token:
+            return hmac.compare_digest(headers.get("x-profile-token", ""), self.token)
+        client = scope.get("client")
+        try:
+            return client is not None and ipaddress.ip_address(client[0]).is_loopback
+        except ValueError:
+            return False
+
+    def _profile_path(self, scope: Scope, mode: str) -> Path:
+        slug = _SLUG.sub("_", scope["path"]).strip("_")[:60] or "root"
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        suffix = "collapsed" if mode == "collapsed" else "pstats"
+        return self.output_dir / f"{stamp}-{scope['method'].lower()}-{slug}-{uuid.uuid4().hex[:6]}.{suffix}"
+
+    async def _profile(self, scope: Scope, receive: Receive, send: Send, mode: str, to_response: bool) -> None:
+        path = self._profile_path(scope, mode)
+
+        async def send_with_path(message: Message) -> None:
+            if to_response:
+                return  # the profile replaces the response
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-Profile-Path"] = str(path)
+            await send(message)
+
+        if mode == "pstats":
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                await self.app(scope, receive, send_with_path)
+            finally:
+                profiler.disable()
+                self.output_dir.mkdir(parents=True, exist_ok=True)
+                profiler.dump_stats(path)
+        else:
+            sampler = StackSampler(threading.get_ident(), self.interval)
+            sampler.start()
+            try:
+                await self.app(scope, receive, send_with_path)
+            finally:
+                sampler.stop()
+                self.output_dir.mkdir(parents=True, exist_ok=True)
+                path.write_text(sampler.collapsed(), encoding="utf-8")
+        self._prune()
+
+        if to_response:
+            body = path.read_bytes()
+            media_type = b"text/plain; charset=utf-8" if mode == "collapsed" else b"application/octet-stream"
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", media_type),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"x-profile-path", str(path).encode()),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+
+    def _prune(self) -> None:
+        """Keep only the newest ``max_files`` profiles."""
+        profiles = sorted(self.output_dir.iterdir(), key=lambda p: p.stat().st_mtime)
+        for old in profiles[: max(len(profiles) - self.max_files, 0)]:
+            old.unlink(missing_ok=True)
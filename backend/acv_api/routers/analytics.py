@@ -0,0 +1,46 @@
+from fastapi import APIRouter, HTTPException, Request
+
+from ..caching import conditional_response, make_etag
+
+router = APIRouter()
+
+
+@router.get("")
+async def analytics(
+    request: Request,
+    group_by: str = "model_source",
+    period: str = "month",
+    since: str | None = None,
+    until: str | None = None,
+):
+    """Message volume, session length and response cadence per period and model/project.
+
+    Aggregates the tables written by ``acv export``; ``since``/``until`` are
+    inclusive ISO dates.
+    """
+    from acv_cli.analytics import GROUPS, PERIODS
+
+    if group_by not in GROUPS:
+        raise HTTPException(status_code=400, detail=f"group_by must be one of {', '.join(GROUPS)}")
+    if period not in PERIODS:
+        raise HTTPException(status_code=400, detail=f"period must be one of {', '.join(PERIODS)}")
+
+    engine = request.app.state.analytics
+    manifest = engine.manifest()
+    if manifest is None:
+        raise HTTPException(status_code=404, detail="No analytics export yet (run `acv export`)")
+
+    def build() -> dict:
+        return {
+            "group_by": group_by,
+            "period": period,
+            "exported_at": manifest["exported_at"],
+            "rows": {name: table["rows"] for name, table in manifest["tables"].items()},
+            "series": engine.aggregate(group_by, period, since, until),
+        }
+
+    return conditional_response(
+        request,
+        make_etag("analytics", group_by, period, since, until, manifest["exported_at"]),
+        build,
+    )
@@ -1,16 +1,81 @@
-from fastapi import APIRouter, HTTPException
+import asyncio
+import json
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response
+from itertools import islice
 from typing import Any
 
+from ..caching import conditional_response, make_etag
+from ..streaming import stream_items
+
 router = APIRouter()
 
+
+def provenance_response(
+    request: Request,
+    kind: str,
+    source: str,
+    category,
+    limit: int,
+    after: str | None,
+    stream: str | None = None,
+) -> Response:
+    """Items derived from a session or model, served from the ``item_sources`` index.
+
+    Newest first; a full page carries the next ``after`` cursor in ``X-Next-Cursor``.
+    """
+    from acv_cli.pagination import decode_cursor, next_cursor, search_key
+
+    db = request.app.state.db
+    try:
+        after_key = decode_cursor(after, 2) if after else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    page: list[dict] = []
+
+    def build() -> list[dict]:
+        for row in db.items_from_source(kind, source, limit=limit, category=category, after=after_key):
+            page.append({
+                "id": row["id"],
+                "title": row["title"],
+                "date": row["date"],
+                "category": row["category"],
+                "tags": json.loads(row["tags"] or "[]"),
+                "summary": row["summary"],
+                "confidence": row["confidence"],
+            })
+        return page
+
+    if stream:
+        return stream_items(build(), stream)
+    response = conditional_response(
+        request,
+        make_etag("provenance", kind, source, category, limit, after, db.get_generation()),
+        build,
+    )
+    cursor = next_cursor(page, limit, search_key)
+    if cursor:
+        response.headers["X-Next-Cursor"] = cursor
+    return response
+
 @router.get("")
 async def list_knowledge(
+    request: Request,
     category: str | None = None,
+    model: str | None = None,
     limit: int = 50,
+    after: str | None = None,
+    stream: str | None = None,
 ):
-    """List knowledge items."""
+    """List knowledge items (``stream=ndjson|json`` for a streamed response).
+
+    A full page carries the ``after`` cursor of the next one in ``X-Next-Cursor``.
+    ``model`` lists only the items derived from that model, newest first.
+    """
     from acv_cli.knowledge import KnowledgeManager
     from acv_cli.models import Category
+    from acv_cli.pagination import decode_cursor, knowledge_key, next_cursor
     
     mgr = KnowledgeManager()
     cat = None
@@ -19,26 +84,135 @@ async def list_knowledge(
             cat = Category(category)
         except ValueError:
             raise HTTPException(status_code=400, detail=f"Invalid category: {category}")
+    if model:
+        return provenance_response(request, "model", model, cat, limit, after, stream)
+    try:
+        after_key = decode_cursor(after, 3) if after else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    return mgr.list_knowledge_items(category=cat, limit=limit)
+    if stream:
+        return stream_items(islice(mgr.iter_knowledge_items(category=cat, after=after_key), limit), stream)
+    count, newest, size = mgr.listing_fingerprint(cat)
+    page: list[dict] = []
+
+    def build() -> list[dict]:
+        page.extend(mgr.list_knowledge_items(category=cat, limit=limit, after=after_key))
+        return page
+
+    response = conditional_response(
+        request,
+        make_etag("knowledge", category, limit, after, count, newest, size),
+        build,
+    )
+    cursor = next_cursor(page, limit, knowledge_key)
+    if cursor:
+        response.headers["X-Next-Cursor"] = cursor
+    return response
 
 @router.get("/{item_id}")
-async def get_knowledge(item_id: str):
+async def get_knowledge(item_id: str, request: Request):
     """Get knowledge item details."""
     from acv_cli.knowledge import KnowledgeManager
     
     mgr = KnowledgeManager()
-    item, path = mgr.load_knowledge_item(item_id)
-    if not item:
+    md_path = mgr.find_item_path(item_id)
+    if md_path is None:
         raise HTTPException(status_code=404, detail="Knowledge item not found")
-    
-    return {
-        "item": item.model_dump(),
-        "path": path,
-    }
+    st = md_path.stat()
+
+    def build() -> dict:
+        item, path = mgr.load_knowledge_item(item_id)
+        if not item:
+            raise HTTPException(status_code=404, detail="Knowledge item not found")
+        return {
+            "item": item.model_dump(),
+            "path": path,
+        }
+
+    return conditional_response(
+        request,
+        make_etag("knowledge-item", item_id, st.st_mtime_ns, st.st_size),
+        build,
+        last_modified=st.st_mtime,
+    )
+
+@router.get("/{item_id}/related")
+async def related_knowledge(item_id: str, request: Request, limit: int = 10):
+    """Related items from the precomputed neighbour graph, best first."""
+    db = request.app.state.db
+    state = db.related_state(item_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail="Knowledge item not found")
+    related = db.related_items(item_id, limit) if state == "ready" else []
+    for row in related:
+        row["tags"] = json.loads(row["tags"] or "[]")
+    # A new item is "pending" until the background updater has placed it.
+    return {"item_id": item_id, "related": related, "pending": state == "pending"}
+
+@router.get("/{item_id}/history")
+async def knowledge_history(item_id: str):
+    """Revisions of a knowledge item, oldest first (hand edits are recorded first)."""
+    from acv_cli.knowledge import KnowledgeManager
+
+    mgr = KnowledgeManager()
+    mgr.capture_edit(item_id)
+    versions = mgr.history.versions(item_id)
+    if not versions:
+        raise HTTPException(status_code=404, detail="Knowledge item not found")
+    return {"item_id": item_id, "versions": versions}
+
+@router.get("/{item_id}/versions/{version}")
+async def knowledge_version(item_id: str, version: int, request: Request):
+    """One revision of a knowledge item: its full markdown and its body."""
+    from acv_cli.knowledge import KnowledgeManager
+
+    mgr = KnowledgeManager()
+    meta = next((v for v in mgr.history.versions(item_id) if v["version"] == version), None)
+    if meta is None:
+        raise HTTPException(status_code=404, detail="Version not found")
+
+    def build() -> dict:
+        markdown = mgr.history.get(item_id, version)
+        parts = markdown.split("---\n")
+        body = "---\n".join(parts[2:]).strip() if len(parts) >= 3 else markdown
+        return {"item_id": item_id, **meta, "markdown": markdown, "content": body}
+
+    # Revisions never change, so their digest is a stable validator.
+    return conditional_response(request, make_etag("knowledge-version", item_id, version, meta["sha256"]), build)
+
+@router.patch("/{item_id}")
+async def update_knowledge(
+    item_id: str,
+    request: Request,
+    content: str | None = None,
+    title: str | None = None,
+    tags: list[str] | None = None,
+    confidence: str | None = None,
+):
+    """Update a knowledge item in place; the previous content stays in its history."""
+    from acv_cli.knowledge import KnowledgeManager
+    from acv_cli.models import Confidence
+
+    conf = None
+    if confidence:
+        try:
+            conf = Confidence(confidence)
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid confidence: {confidence}")
+
+    mgr = KnowledgeManager()
+    item, path = mgr.update_knowledge_item(item_id, content=content, title=title, tags=tags, confidence=conf)
+    if item is None:
+        raise HTTPException(status_code=404, detail="Knowledge item not found")
+
+    db = request.app.state.db
+    await asyncio.wrap_future(db.submit_knowledge_item(item, path))
+    return {"item": item.model_dump(), "path": path, "version": mgr.history.versions(item_id)[-1]["version"]}
 
 @router.post("")
 async def create_knowledge(
+    request: Request,
     title: str,
     content: str,
     category: str,
@@ -80,6 +254,9 @@ async def create_knowledge(
     from acv_cli.db import Database
     config = get_config()
     db = Database(config.data_paths["db_path"])
-    db.add_knowledge_item(item, path)
+    near_duplicates = db.find_near_duplicates(item.minhash, exclude_id=item.id)
+    await asyncio.wrap_future(db.submit_knowledge_item(item, path))
+    if getattr(request.app.state, "related", None) is not None:
+        request.app.state.related.notify()
     
-    return {"item": item.model_dump(), "path": path}
+    return {"item": item.model_dump(), "path": path, "near_duplicates": near_duplicates}
@@ -1,20 +1,35 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Request
+
+from ..streaming import stream_items
 
 router = APIRouter()
 
+
+def _cached(request: Request, key: tuple, compute):
+    """Serve from the per-worker result cache, keyed on the index generation."""
+    cache = request.app.state.search_cache
+    if cache.maxsize <= 0:
+        return compute()
+    return cache.get_or_compute(key, request.app.state.db.get_generation(), compute)
+
 @router.get("")
 async def search(
+    request: Request,
     q: str,
     limit: int = 20,
     category: str | None = None,
+    after: str | None = None,
+    stream: str | None = None,
 ):
-    """Search knowledge base."""
-    from acv_cli.db import Database
-    from acv_cli.config import get_config
+    """Search knowledge base (``stream=ndjson|json`` streams the bare result rows).
+
+    Results are newest first; pass ``next_cursor`` back as ``after`` for the next page.
+    """
+    from acv_cli.cache import normalize_query
     from acv_cli.models import Category
+    from acv_cli.pagination import decode_cursor, next_cursor, search_key
     
-    config = get_config()
-    db = Database(config.data_paths["db_path"])
+    db = request.app.state.db
     
     cat = None
     if category:
@@ -22,21 +37,47 @@ async def search(
             cat = Category(category)
         except ValueError:
             pass
+    try:
+        after_key = decode_cursor(after, 2) if after else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    results = db.search(query=q, limit=limit, category=cat)
-    return {"results": results, "count": len(results)}
+    if stream:
+        return stream_items(db.iter_search(query=q, limit=limit, category=cat, after=after_key), stream)
+    results = _cached(
+        request,
+        ("search", normalize_query(q, casefold=True, whitespace=False), cat, limit, after_key),
+        lambda: db.search(query=q, limit=limit, category=cat, after=after_key),
+    )
+    return {"results": results, "count": len(results), "next_cursor": next_cursor(results, limit, search_key)}
 
 @router.post("/fts")
 async def search_fts(
+    request: Request,
     q: str,
     limit: int = 20,
 ):
     """Full-text search."""
-    from acv_cli.db import Database
-    from acv_cli.config import get_config
+    from acv_cli.cache import normalize_query
     
-    config = get_config()
-    db = Database(config.data_paths["db_path"])
+    db = request.app.state.db
     
-    results = db.search_fts(query=q, limit=limit)
+    results = _cached(
+        request,
+        ("fts", normalize_query(q), limit),
+        lambda: db.search_fts(query=q, limit=limit),
+    )
     return {"results": results, "count": len(results)}
+
+@router.get("/suggest")
+async def suggest(request: Request, q: str, limit: int = 10):
+    """Typeahead completions from knowledge item titles and tags."""
+    index = request.app.state.suggest
+    index.refresh(request.app.state.db)
+    suggestions = index.suggest(q, limit=limit)
+    return {"suggestions": suggestions, "count": len(suggestions)}
+
+@router.get("/cache")
+async def search_cache_stats(request: Request):
+    """Hit-rate and size metrics of this worker's search result cache."""
+    return request.app.state.search_cache.stats()
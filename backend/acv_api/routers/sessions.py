@@ -1,29 +1,129 @@
-from fastapi import APIRouter, HTTPException
+import asyncio
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from itertools import islice
 from typing import Any
 
+from ..caching import conditional_response, make_etag
+from ..streaming import stream_items
+
 router = APIRouter()
 
 @router.get("")
-async def list_sessions(limit: int = 50, model: str | None = None):
-    """List recent sessions."""
+async def list_sessions(
+    request: Request,
+    limit: int = 50,
+    model: str | None = None,
+    after: str | None = None,
+    stream: str | None = None,
+    archived: bool = False,
+):
+    """List recent sessions (``stream=ndjson|json`` for a streamed response).
+
+    Pages are chained with ``after``: a full page carries the cursor of the
+    next one in the ``X-Next-Cursor`` header. ``archived=true`` continues the
+    listing into archived sessions.
+    """
+    from acv_cli.pagination import decode_cursor, next_cursor, session_key
     from acv_cli.sessions import SessionManager
     mgr = SessionManager()
-    return mgr.list_sessions(limit=limit, model_source=model)
+    try:
+        after_id = decode_cursor(after, 1)[0] if after else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if stream:
+        return stream_items(
+            islice(mgr.iter_sessions(model_source=model, after=after_id, include_archived=archived), limit),
+            stream,
+        )
+    count, newest, size = mgr.listing_fingerprint()
+    archive = mgr.archive.fingerprint() if archived else None
+    page: list[dict] = []
+
+    def build() -> list[dict]:
+        page.extend(mgr.list_sessions(limit=limit, model_source=model, after=after_id, include_archived=archived))
+        return page
+
+    response = conditional_response(
+        request,
+        make_etag("sessions", model, limit, after, count, newest, size, archive),
+        build,
+    )
+    cursor = next_cursor(page, limit, session_key)
+    if cursor:
+        response.headers["X-Next-Cursor"] = cursor
+    return response
 
 @router.get("/{session_id}")
-async def get_session(session_id: str):
-    """Get session details."""
+async def get_session(
+    session_id: str,
+    offset: int | None = Query(None, ge=0),
+    limit: int | None = Query(None, ge=0),
+):
+    """Get session details, optionally with only a range of its messages."""
     from acv_cli.sessions import SessionManager
     mgr = SessionManager()
-    session = mgr.load_session(session_id)
+    if offset is None and limit is None:
+        session = mgr.load_session(session_id)
+    else:
+        session = mgr.load_session_range(session_id, offset=offset or 0, limit=limit)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     return session
 
+@router.get("/{session_id}/knowledge")
+async def session_knowledge(
+    request: Request,
+    session_id: str,
+    category: str | None = None,
+    limit: int = 50,
+    after: str | None = None,
+    stream: str | None = None,
+):
+    """Knowledge items derived from a session, newest first."""
+    from acv_cli.models import Category
+    from .knowledge import provenance_response
+
+    cat = None
+    if category:
+        try:
+            cat = Category(category)
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid category: {category}")
+    return provenance_response(request, "session", session_id, cat, limit, after, stream)
+
+@router.get("/{session_id}/messages")
+async def stream_session_messages(
+    session_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int | None = Query(None, ge=0),
+    stream: str = "ndjson",
+):
+    """Stream the messages of a session as NDJSON (or a chunked JSON array)."""
+    from acv_cli.sessions import SessionManager
+    mgr = SessionManager()
+    if not mgr.session_exists(session_id):
+        raise HTTPException(status_code=404, detail="Session not found")
+    return stream_items(mgr.iter_messages(session_id, offset=offset, limit=limit), stream)
+
+@router.get("/{session_id}/live")
+async def live_session(session_id: str, request: Request):
+    """Server-sent events with message batches of a session that is still recording."""
+    hub = request.app.state.live
+    if not hub.is_live(session_id):
+        raise HTTPException(status_code=404, detail="Session is not being recorded")
+    return StreamingResponse(
+        hub.sse(session_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @router.post("/{session_id}/summarize")
-async def summarize_session(session_id: str):
-    """Summarize a session."""
+async def summarize_session(session_id: str, skill: str = "summarize-session", mode: str | None = None):
+    """Summarize a session with a skill and store the result on it."""
+    from starlette.concurrency import run_in_threadpool
     from acv_cli.sessions import SessionManager
+    from acv_cli.skills import SkillManager
     from acv_cli.db import Database
     from acv_cli.config import get_config
     
@@ -35,5 +135,14 @@ async def summarize_session(session_id: str):
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    # TODO: Implement actual summarization with LLM/skill
-    return {"message": "Summarization not yet implemented", "session_id": session_id}
+    # Skill runs block on a worker for up to the configured timeout.
+    params = {"mode": mode} if mode else {}
+    outcome = await run_in_threadpool(SkillManager().run_skill, skill, session, **params)
+    if "error" in outcome:
+        status = 404 if outcome["error"].startswith("Skill not found") else 500
+        raise HTTPException(status_code=status, detail=outcome["error"])
+    
+    session["summaries"] = outcome["result"]
+    await run_in_threadpool(mgr.save_session, session)
+    await asyncio.wrap_future(db.submit_session(session))
+    return {"session_id": session_id, "skill_id": skill, "summaries": session["summaries"]}
@@ -0,0 +1,54 @@
+import json
+from typing import Any, Iterable, Iterator
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+# Serialized items are coalesced into chunks of roughly this many bytes.
+CHUNK_SIZE = 16 * 1024
+
+STREAM_FORMATS = ("ndjson", "json")
+
+
+def _encode(item: Any) -> str:
+    return json.dumps(item, ensure_ascii=False, default=str)
+
+
+def _chunked(parts: Iterable[str]) -> Iterator[bytes]:
+    buffer: list[str] = []
+    size = 0
+    for part in parts:
+        buffer.append(part)
+        size += len(part)
+        if size >= CHUNK_SIZE:
+            yield "".join(buffer).encode("utf-8")
+            buffer.clear()
+            size = 0
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+
+def _ndjson_lines(items: Iterable[Any]) -> Iterator[str]:
+    for item in items:
+        yield _encode(item) + "\n"
+
+
+def _json_array(items: Iterable[Any]) -> Iterator[str]:
+    yield "["
+    first = True
+    for item in items:
+        yield _encode(item) if first else "," + _encode(item)
+        first = False
+    yield "]"
+
+
+def stream_items(items: Iterable[Any], fmt: str) -> StreamingResponse:
+    """Serialize ``items`` lazily as NDJSON or a chunked JSON array."""
+    if fmt == "ndjson":
+        return StreamingResponse(_chunked(_ndjson_lines(items)), media_type="application/x-ndjson")
+    if fmt == "json":
+        return StreamingResponse(_chunked(_json_array(items)), media_type="application/json")
+    raise HTTPException(
+        status_code=400,
+        detail=f"Invalid stream format: {fmt} (expected one of {', '.join(STREAM_FORMATS)})",
+    )
@@ -0,0 +1,584 @@
+"""Columnar export of the vault, and dashboard aggregations over it.
+
+``export()`` streams every session (archived ones included) and every
+indexed knowledge item into three tables, ``sessions``, ``messages`` and
+``knowledge_items``, written ``chunk_rows`` rows at a time: Parquet or Arrow
+IPC files with pyarrow, CSV files with the standard library otherwise. The
+files are written under temporary names and renamed into place together,
+then ``manifest.json`` records the format, row counts and export time.
+
+``Analytics`` loads only the columns an aggregation needs (kept until the
+next export) and groups them by period and model or project with numpy
+(``unique``/``bincount``), or with plain dicts without it.
+"""
+
+import csv
+import json
+import os
+import shutil
+import statistics
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, NamedTuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # CSV only
+    pa = None
+
+try:
+    import numpy as np
+except ImportError:  # the pure-Python aggregations give the same results
+    np = None
+
+FORMATS = {"parquet": ".parquet", "arrow": ".arrow", "csv": ".csv"}
+GROUPS = ("model_source", "project")
+PERIODS = ("day", "week", "month")
+
+TABLES: dict[str, list[tuple[str, str]]] = {
+    "sessions": [
+        ("session_id", "string"),
+        ("created_at", "timestamp"),
+        ("day", "string"),
+        ("model_source", "string"),
+        ("model_variant", "string"),
+        ("project", "string"),
+        ("tags", "string"),
+        ("message_count", "int"),
+        ("user_messages", "int"),
+        ("assistant_messages", "int"),
+        ("chars", "int"),
+        ("duration_seconds", "float"),
+        ("archived", "bool"),
+    ],
+    "messages": [
+        ("session_id", "string"),
+        ("seq", "int"),
+        ("role", "string"),
+        ("timestamp", "timestamp"),
+        ("day", "string"),
+        ("model_source", "string"),
+        ("project", "string"),
+        ("chars", "int"),
+        # Seconds from a user message to the assistant reply right after it.
+        ("response_seconds", "float"),
+    ],
+    "knowledge_items": [
+        ("id", "string"),
+        ("date", "timestamp"),
+        ("day", "string"),
+        ("category", "string"),
+        ("confidence", "string"),
+        ("title", "string"),
+        ("tags", "string"),
+        ("model_source", "string"),
+        ("generated_by_skill", "string"),
+        ("source_sessions", "int"),
+    ],
+}
+
+MANIFEST = "manifest.json"
+
+
+class ExportError(Exception):
+    pass
+
+
+def _timestamp(value: Any) -> datetime | None:
+    """A naive local datetime (aware ones are converted), or None if unparseable."""
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return dt.astimezone().replace(tzinfo=None) if dt.tzinfo else dt
+
+
+def _chars(content: Any) -> int:
+    if content is None:
+        return 0
+    return len(content) if isinstance(content, str) else len(json.dumps(content, ensure_ascii=False))
+
+
+def _session_rows(session: dict, archived: bool) -> tuple[tuple, list[tuple]]:
+    """The ``sessions`` row of a session and its ``messages`` rows."""
+    session_id = session["session_id"]
+    created = _timestamp(session.get("created_at"))
+    day = created.date().isoformat() if created else session_id[:10]
+    model, project = session.get("model_source"), session.get("project")
+
+    messages = []
+    counts = {"user": 0, "assistant": 0}
+    total_chars = 0
+    first = last = previous = None
+    previous_role = None
+    for seq, msg in enumerate(session.get("messages", [])):
+        role = msg.get("role")
+        ts = _timestamp(msg.get("timestamp"))
+        chars = _chars(msg.get("content"))
+        response = None
+        if role == "assistant" and previous_role == "user" and ts and previous:
+            seconds = (ts - previous).total_seconds()
+            response = seconds if seconds >= 0 else None
+        messages.append((
+            session_id, seq, role, ts, ts.date().isoformat() if ts else day, model, project, chars, response,
+        ))
+        counts[role] = counts.get(role, 0) + 1
+        total_chars += chars
+        if ts:
+            first = first or ts
+            last = ts
+        previous, previous_role = ts, role
+
+    row = (
+        session_id,
+        created,
+        day,
+        model,
+        session.get("model_variant"),
+        project,
+        json.dumps(session.get("tags", []), ensure_ascii=False),
+        len(messages),
+        counts["user"],
+        counts["assistant"],
+        total_chars,
+        (last - first).total_seconds() if first and last else None,
+        archived,
+    )
+    return row, messages
+
+
+def _knowledge_row(row: dict) -> tuple:
+    when = _timestamp(row["date"])
+    models = json.loads(row["model_sources"] or "[]")
+    return (
+        row["id"],
+        when,
+        when.date().isoformat() if when else None,
+        row["category"],
+        row["confidence"],
+        row["title"],
+        row["tags"] or "[]",
+        models[0] if models else None,
+        row["generated_by_skill"],
+        row["source_sessions"],
+    )
+
+
+class _CsvWriter:
+    def __init__(self, path: Path, columns: list[tuple[str, str]]):
+        self.types = [kind for _, kind in columns]
+        self.file = open(path, "w", newline="", encoding="utf-8")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow([name for name, _ in columns])
+
+    def write(self, rows: list[tuple]) -> None:
+        # Empty cells are nulls; timestamps are ISO 8601, booleans 1/0.
+        self.writer.writerows(
+            [
+                "" if value is None
+                else value.isoformat() if kind == "timestamp"
+                else int(value) if kind == "bool"
+                else value
+                for value, kind in zip(row, self.types)
+            ]
+            for row in rows
+        )
+
+    def close(self) -> None:
+        self.file.close()
+
+
+_ARROW_TYPES = {
+    "string": lambda: pa.string(),
+    "int": lambda: pa.int64(),
+    "float": lambda: pa.float64(),
+    "bool": lambda: pa.bool_(),
+    "timestamp": lambda: pa.timestamp("us"),
+}
+
+
+class _ArrowWriter:
+    def __init__(self, path: Path, columns: list[tuple[str, str]], fmt: str):
+        self.schema = pa.schema([(name, _ARROW_TYPES[kind]()) for name, kind in columns])
+        if fmt == "parquet":
+            self.writer = pq.ParquetWriter(str(path), self.schema, compression="zstd")
+        else:
+            self.writer = pa.ipc.new_file(str(path), self.schema)
+
+    def write(self, rows: list[tuple]) -> None:
+        arrays = [
+            pa.array(list(values), type=field.type)
+            for values, field in zip(zip(*rows), self.schema)
+        ]
+        self.writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class _Table:
+    """Rows of one table, buffered and written ``chunk_rows`` at a time."""
+
+    def __init__(self, path: Path, name: str, fmt: str, chunk_rows: int):
+        columns = TABLES[name]
+        self.writer = _CsvWriter(path, columns) if fmt == "csv" else _ArrowWriter(path, columns, fmt)
+        self.chunk_rows = chunk_rows
+        self.buffer: list[tuple] = []
+        self.rows = 0
+
+    def add(self, rows: list[tuple]) -> None:
+        self.buffer.extend(rows)
+        if len(self.buffer) >= self.chunk_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.buffer:
+            self.writer.write(self.buffer)
+            self.rows += len(self.buffer)
+            self.buffer = []
+
+    def close(self) -> None:
+        self.flush()
+        self.writer.close()
+
+
+def export(out_dir: Path, fmt: str, session_mgr, db, chunk_rows: int = 50_000) -> dict:
+    """Export the vault's tables to ``out_dir``; returns the manifest.
+
+    Parquet and Arrow need pyarrow; without it the export falls back to CSV
+    (the manifest records the format actually written).
+    """
+    if fmt not in FORMATS:
+        raise ExportError(f"Unknown format: {fmt} (expected one of {', '.join(FORMATS)})")
+    if pa is None:
+        fmt = "csv"
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    staging = out_dir / f".export-{os.getpid()}"
+    staging.mkdir()
+    started = time.perf_counter()
+
+    files = {name: f"{name}{FORMATS[fmt]}" for name in TABLES}
+    tables = {name: _Table(staging / files[name], name, fmt, chunk_rows) for name in TABLES}
+    try:
+        for listing in session_mgr.iter_sessions(include_archived=True):
+            session = session_mgr.load_session(listing["session_id"])
+            if session is None:
+                continue
+            archived = not session_mgr._session_path(listing["session_id"]).exists()
+            row, messages = _session_rows(session, archived)
+            tables["sessions"].add([row])
+            tables["messages"].add(messages)
+        for row in db.iter_knowledge_rows():
+            tables["knowledge_items"].add([_knowledge_row(row)])
+        for table in tables.values():
+            table.close()
+    except BaseException:
+        for table in tables.values():
+            try:
+                table.writer.close()
+            except Exception:
+                pass
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    previous = read_manifest(out_dir)
+    for name, filename in files.items():
+        os.replace(staging / filename, out_dir / filename)
+    staging.rmdir()
+    manifest = {
+        "format": fmt,
+        "exported_at": datetime.now().isoformat(),
+        "seconds": round(time.perf_counter() - started, 3),
+        "tables": {
+            name: {"file": files[name], "rows": tables[name].rows, "bytes": (out_dir / files[name]).stat().st_size}
+            for name in TABLES
+        },
+    }
+    tmp = out_dir / f"{MANIFEST}.tmp"
+    tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    os.replace(tmp, out_dir / MANIFEST)
+    # Files of an earlier export in another format are no longer referenced.
+    for name, table in (previous or {}).get("tables", {}).items():
+        if table["file"] != files.get(name):
+            (out_dir / table["file"]).unlink(missing_ok=True)
+    return manifest
+
+
+def read_manifest(root: Path) -> dict | None:
+    path = Path(root) / MANIFEST
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+class _Coded(NamedTuple):
+    """A dictionary-encoded string column (numpy only): its values are ``labels[codes]``."""
+
+    labels: Any
+    codes: Any
+
+    def take(self, keep) -> "_Coded":
+        return _Coded(self.labels, self.codes[keep])
+
+
+def _encode(values) -> _Coded:
+    labels, codes = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+    return _Coded(labels, codes.ravel())
+
+
+def _read_csv(path: Path, name: str, columns: list[str]) -> dict[str, Any]:
+    kinds = dict(TABLES[name])
+    parse = {
+        "string": lambda v: v,
+        "int": lambda v: int(v) if v else 0,
+        "float": lambda v: float(v) if v else float("nan"),
+        "bool": lambda v: v == "1",
+        "timestamp": lambda v: v,
+    }
+    result: dict[str, list] = {column: [] for column in columns}
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        positions = [(column, header.index(column), parse[kinds[column]]) for column in columns]
+        for row in reader:
+            for column, i, convert in positions:
+                result[column].append(convert(row[i]))
+    if np is None:
+        return result
+    return {
+        column: _encode(values) if kinds[column] == "string" else np.asarray(values)
+        for column, values in result.items()
+    }
+
+
+def _read_arrow(path: Path, fmt: str, columns: list[str]) -> dict[str, Any]:
+    if fmt == "parquet":
+        table = pq.read_table(path, columns=columns)
+    else:
+        with pa.memory_map(str(path)) as source:
+            table = pa.ipc.open_file(source).read_all().select(columns)
+    result = {}
+    for column in columns:
+        array = table.column(column)
+        if pa.types.is_string(array.type):
+            array = array.fill_null("")
+            if np is not None:
+                encoded = array.combine_chunks().dictionary_encode()
+                result[column] = _Coded(
+                    np.asarray(encoded.dictionary.to_pylist(), dtype=str), encoded.indices.to_numpy()
+                )
+                continue
+        elif pa.types.is_floating(array.type):
+            array = array.fill_null(float("nan"))
+        result[column] = array.to_numpy() if np is not None else array.to_pylist()
+    return result
+
+
+def _periods(days, period: str):
+    """Period label (``YYYY-MM-DD``, Monday of the ISO week, or ``YYYY-MM``) of each day."""
+    if np is not None:
+        # Only the distinct days are converted; rows keep their codes.
+        labels = np.where(days.labels == "", "1970-01-01", days.labels).astype("U10")
+        if period == "month":
+            labels = labels.astype("U7")
+        elif period == "week":
+            d = labels.astype("datetime64[D]")
+            # 1970-01-01 was a Thursday: (n + 3) % 7 is the number of days since Monday.
+            labels = (d - (d.astype(np.int64) + 3) % 7).astype("U10")
+        periods, inverse = np.unique(labels, return_inverse=True)
+        return _Coded(periods, inverse.ravel()[days.codes])
+    if period == "month":
+        return [d[:7] for d in days]
+    if period == "week":
+        return [(date.fromisoformat(d) - timedelta(days=date.fromisoformat(d).weekday())).isoformat() for d in days]
+    return list(days)
+
+
+class _Groups:
+    """Row-to-group codes of (period, group) keys, and per-group reductions."""
+
+    def __init__(self, periods, groups):
+        if np is not None:
+            width = len(groups.labels)
+            combined = periods.codes.astype(np.int64) * width + groups.codes
+            occupied = np.bincount(combined, minlength=len(periods.labels) * width) > 0
+            keys = np.flatnonzero(occupied)
+            self.codes = (np.cumsum(occupied) - 1)[combined]
+            self.labels = [(str(periods.labels[k // width]), str(groups.labels[k % width])) for k in keys.tolist()]
+        else:
+            index: dict[tuple[str, str], int] = {}
+            self.codes = [index.setdefault((p, g), len(index)) for p, g in zip(periods, groups)]
+            self.labels = list(index)
+
+    def count(self) -> list[int]:
+        if np is not None:
+            return np.bincount(self.codes, minlength=len(self.labels)).tolist()
+        counts = [0] * len(self.labels)
+        for code in self.codes:
+            counts[code] += 1
+        return counts
+
+    def total(self, values) -> tuple[list[float], list[int]]:
+        """Sum and count of the non-NaN ``values`` of each group."""
+        if np is not None:
+            values = np.asarray(values, dtype=np.float64)
+            present = ~np.isnan(values)
+            n = len(self.labels)
+            sums = np.bincount(self.codes[present], weights=values[present], minlength=n)
+            return sums.tolist(), np.bincount(self.codes[present], minlength=n).tolist()
+        sums, counts = [0.0] * len(self.labels), [0] * len(self.labels)
+        for code, value in zip(self.codes, values):
+            if value == value:  # not NaN
+                sums[code] += value
+                counts[code] += 1
+        return sums, counts
+
+    def median(self, values) -> list[float | None]:
+        """Lower median of the non-NaN ``values`` of each group."""
+        n = len(self.labels)
+        if np is not None:
+            values = np.asarray(values, dtype=np.float64)
+            present = ~np.isnan(values)
+            codes, values = self.codes[present], values[present]
+            if not len(values):
+                return [None] * n
+            ordered = values[np.lexsort((values, codes))]
+            counts = np.bincount(codes, minlength=n)
+            starts = np.cumsum(counts) - counts
+            picked = ordered[np.clip(starts + (counts - 1) // 2, 0, len(ordered) - 1)]
+            return [float(v) if c else None for v, c in zip(picked.tolist(), counts.tolist())]
+        per_group: list[list[float]] = [[] for _ in range(n)]
+        for code, value in zip(self.codes, values):
+            if value == value:
+                per_group[code].append(value)
+        return [statistics.median_low(v) if v else None for v in per_group]
+
+
+def _mask(columns: dict[str, Any], since: str | None, until: str | None) -> dict[str, Any]:
+    """Rows with a day in ``[since, until]`` (ISO dates, inclusive)."""
+    days = columns["day"]
+    if np is not None:
+        keep = days.labels != ""
+        if since:
+            keep &= days.labels >= since
+        if until:
+            keep &= days.labels <= until
+        keep = keep[days.codes]
+        return {
+            name: values.take(keep) if isinstance(values, _Coded) else values[keep]
+            for name, values in columns.items()
+        }
+    keep = [bool(d) and (not since or d >= since) and (not until or d <= until) for d in days]
+    return {name: [v for v, k in zip(values, keep) if k] for name, values in columns.items()}
+
+
+class Analytics:
+    """Aggregations over the tables exported to ``root``."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._cache: dict[tuple[str, tuple[str, ...]], dict[str, Any]] = {}
+        self._cache_key: str | None = None
+
+    def manifest(self) -> dict | None:
+        return read_manifest(self.root)
+
+    def columns(self, name: str, columns: list[str]) -> dict[str, Any] | None:
+        """Columns of an exported table, or None if the last export has no such table/columns."""
+        manifest = self.manifest()
+        if manifest is None or name not in manifest["tables"]:
+            return None
+        if not set(columns) <= {column for column, _ in TABLES[name]}:
+            return None
+        if manifest["exported_at"] != self._cache_key:
+            self._cache, self._cache_key = {}, manifest["exported_at"]
+        key = (name, tuple(columns))
+        if key not in self._cache:
+            path = self.root / manifest["tables"][name]["file"]
+            if manifest["format"] == "csv":
+                data = _read_csv(path, name, columns)
+            else:
+                data = _read_arrow(path, manifest["format"], columns)
+            self._cache[key] = data
+        return self._cache[key]
+
+    def aggregate(
+        self,
+        group_by: str = "model_source",
+        period: str = "month",
+        since: str | None = None,
+        until: str | None = None,
+    ) -> list[dict]:
+        """Per ``(period, group)``: message volume, session length and response cadence.
+
+        Knowledge item counts are included when grouping by model.
+        """
+        if group_by not in GROUPS:
+            raise ValueError(f"group_by must be one of {', '.join(GROUPS)}")
+        if period not in PERIODS:
+            raise ValueError(f"period must be one of {', '.join(PERIODS)}")
+        series: dict[tuple[str, str], dict[str, Any]] = {}
+        empty = {
+            "sessions": 0,
+            "avg_session_messages": None,
+            "avg_session_minutes": None,
+            "messages": 0,
+            "chars": 0,
+            "responses": 0,
+            "avg_response_seconds": None,
+            "median_response_seconds": None,
+        }
+        if group_by == "model_source":
+            empty["knowledge_items"] = 0
+
+        def rows(groups: _Groups, **metrics: list) -> None:
+            for i, label in enumerate(groups.labels):
+                row = series.setdefault(label, {"period": label[0], group_by: label[1] or None, **empty})
+                row.update({name: values[i] for name, values in metrics.items()})
+
+        sessions = self.columns("sessions", ["day", group_by, "message_count", "duration_seconds"])
+        if sessions is not None:
+            sessions = _mask(sessions, since, until)
+            groups = _Groups(_periods(sessions["day"], period), sessions[group_by])
+            count = groups.count()
+            msg_sum, msg_n = groups.total(sessions["message_count"])
+            dur_sum, dur_n = groups.total(sessions["duration_seconds"])
+            rows(
+                groups,
+                sessions=count,
+                avg_session_messages=[_ratio(s, n) for s, n in zip(msg_sum, msg_n)],
+                avg_session_minutes=[_ratio(s, n * 60) for s, n in zip(dur_sum, dur_n)],
+            )
+
+        messages = self.columns("messages", ["day", group_by, "chars", "response_seconds"])
+        if messages is not None:
+            messages = _mask(messages, since, until)
+            groups = _Groups(_periods(messages["day"], period), messages[group_by])
+            chars, _ = groups.total(messages["chars"])
+            resp_sum, resp_n = groups.total(messages["response_seconds"])
+            rows(
+                groups,
+                messages=groups.count(),
+                chars=[int(c) for c in chars],
+                responses=resp_n,
+                avg_response_seconds=[_ratio(s, n) for s, n in zip(resp_sum, resp_n)],
+                median_response_seconds=groups.median(messages["response_seconds"]),
+            )
+
+        if group_by == "model_source":
+            items = self.columns("knowledge_items", ["day", "model_source"])
+            if items is not None:
+                items = _mask(items, since, until)
+                groups = _Groups(_periods(items["day"], period), items["model_source"])
+                rows(groups, knowledge_items=groups.count())
+
+        return [series[label] for label in sorted(series)]
+
+
+def _ratio(total: float, count: float) -> float | None:
+    return round(total / count, 3) if count else None
@@ -0,0 +1,209 @@
+"""Cold tier for old sessions: one SQLite archive per month.
+
+``<archive_dir>/sessions-YYYY-MM.sqlar`` uses the SQLite Archive layout
+(``sqlite3 sessions-2024-01.sqlar -Atv`` lists it, ``-Ax`` extracts it):
+the ``sqlar`` table holds the session JSON and markdown files under their
+``<day>/<name>`` paths, zlib-compressed when that makes them smaller. An
+extra ``sessions`` table holds the listing fields of every archived session,
+so archived listings never decompress a file. Message offset indexes
+(``.idx``) are not archived; an archived session is decoded in memory.
+"""
+
+import json
+import os
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Iterator
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sqlar (
+    name TEXT PRIMARY KEY,
+    mode INT,
+    mtime INT,
+    sz INT,
+    data BLOB
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    model_source TEXT NOT NULL,
+    project TEXT,
+    tags TEXT
+) WITHOUT ROWID;
+"""
+
+_PREFIX = "sessions-"
+_SUFFIX = ".sqlar"
+
+
+def _pack(data: bytes) -> bytes:
+    # sqlar convention: stored raw when compression does not help (sz == len(data)).
+    packed = zlib.compress(data, 6)
+    return packed if len(packed) < len(data) else data
+
+
+def _unpack(data: bytes, size: int) -> bytes:
+    return data if len(data) == size else zlib.decompress(data)
+
+
+class SessionArchive:
+    """The per-month session archives under ``root``."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def path(self, month: str) -> Path:
+        return self.root / f"{_PREFIX}{month}{_SUFFIX}"
+
+    def months(self) -> list[str]:
+        """Archived months (``YYYY-MM``), oldest first."""
+        if not self.root.exists():
+            return []
+        return sorted(
+            entry.name[len(_PREFIX):-len(_SUFFIX)]
+            for entry in os.scandir(self.root)
+            if entry.name.startswith(_PREFIX) and entry.name.endswith(_SUFFIX)
+        )
+
+    def _connect(self, month: str) -> sqlite3.Connection | None:
+        path = self.path(month)
+        if not path.exists():
+            return None
+        return sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+
+    @staticmethod
+    def _name(session_id: str, suffix: str) -> str:
+        return f"{session_id[:10]}/{session_id}{suffix}"
+
+    def read(self, session_id: str, suffix: str = ".json") -> bytes | None:
+        """Contents of an archived session file, or None if it is not archived."""
+        conn = self._connect(session_id[:7])
+        if conn is None:
+            return None
+        try:
+            row = conn.execute(
+                "SELECT sz, data FROM sqlar WHERE name = ?", (self._name(session_id, suffix),)
+            ).fetchone()
+        finally:
+            conn.close()
+        return _unpack(row[1], row[0]) if row else None
+
+    def load(self, session_id: str) -> dict | None:
+        data = self.read(session_id)
+        return json.loads(data) if data is not None else None
+
+    def contains(self, session_id: str) -> bool:
+        conn = self._connect(session_id[:7])
+        if conn is None:
+            return False
+        try:
+            return conn.execute(
+                "SELECT 1 FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone() is not None
+        finally:
+            conn.close()
+
+    def iter_listings(self, after: str | None = None) -> Iterator[dict]:
+        """Listing fields of the archived sessions, newest first, resuming after ``after``."""
+        for month in reversed(self.months()):
+            if after and month > after[:7]:
+                continue
+            conn = self._connect(month)
+            if conn is None:
+                continue
+            try:
+                rows = conn.execute(
+                    "SELECT session_id, created_at, model_source, project, tags FROM sessions"
+                    " WHERE session_id < ? ORDER BY session_id DESC",
+                    (after or "\uffff",),
+                ).fetchall()
+            finally:
+                conn.close()
+            for session_id, created_at, model_source, project, tags in rows:
+                yield {
+                    "session_id": session_id,
+                    "created_at": created_at,
+                    "model_source": model_source,
+                    "project": project,
+                    "tags": json.loads(tags or "[]"),
+                }
+
+    def iter_json(self) -> Iterator[bytes]:
+        """Every archived session JSON file (for blob reference scans)."""
+        for month in self.months():
+            conn = self._connect(month)
+            if conn is None:
+                continue
+            try:
+                for size, data in conn.execute("SELECT sz, data FROM sqlar WHERE name LIKE '%.json'"):
+                    yield _unpack(data, size)
+            finally:
+                conn.close()
+
+    def add(self, month: str, files: list[tuple[Path, dict[str, Any]]]) -> None:
+        """Store session files of ``month`` in its archive, in one transaction.
+
+        ``files`` pairs each session JSON path with its listing fields; the
+        markdown transcript next to it is archived too. Sessions archived
+        before are replaced. The files are only durable in the archive once
+        this returns, so callers delete the hot copies afterwards.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path(month))
+        try:
+            conn.executescript(_SCHEMA)
+            with conn:
+                for json_path, listing in files:
+                    session_id = listing["session_id"]
+                    for suffix in (".json", ".md"):
+                        path = json_path.with_suffix(suffix)
+                        if not path.exists():
+                            continue
+                        data = path.read_bytes()
+                        st = path.stat()
+                        conn.execute(
+                            "INSERT OR REPLACE INTO sqlar (name, mode, mtime, sz, data) VALUES (?, ?, ?, ?, ?)",
+                            (self._name(session_id, suffix), st.st_mode, int(st.st_mtime), len(data), _pack(data)),
+                        )
+                    conn.execute(
+                        "INSERT OR REPLACE INTO sessions (session_id, created_at, model_source, project, tags)"
+                        " VALUES (?, ?, ?, ?, ?)",
+                        (
+                            session_id,
+                            listing["created_at"],
+                            listing["model_source"],
+                            listing.get("project"),
+                            json.dumps(listing.get("tags", [])),
+                        ),
+                    )
+        finally:
+            conn.close()
+
+    def fingerprint(self) -> tuple[int, int, int]:
+        """``(archive count, newest mtime_ns, total size)``, for cache validators."""
+        count = newest = total = 0
+        for month in self.months():
+            st = self.path(month).stat()
+            count += 1
+            newest = max(newest, st.st_mtime_ns)
+            total += st.st_size
+        return count, newest, total
+
+    def stats(self) -> dict:
+        sessions = 0
+        for month in self.months():
+            conn = self._connect(month)
+            if conn is not None:
+                try:
+                    sessions += conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+                finally:
+                    conn.close()
+        count, _, size = self.fingerprint()
+        return {"archives": count, "sessions": sessions, "bytes": size}
+
+
+def cutoff_day(older_than_days: float, now: float | None = None) -> str:
+    """``YYYY-MM-DD`` of the first day that is kept hot."""
+    return time.strftime("%Y-%m-%d", time.localtime((now or time.time()) - older_than_days * 86400))
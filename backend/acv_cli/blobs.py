@@ -0,0 +1,99 @@
+import hashlib
+import os
+import re
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Iterable, Iterator
+
+# Key that replaces "content" in messages whose body lives in the blob store.
+REF_KEY = "content_ref"
+
+# An unescaped quote can only start a JSON key, so this never matches inside message text.
+_REF_PATTERN = re.compile(rb'"' + REF_KEY.encode() + rb'":\s*"([0-9a-f]{64})"')
+
+
+class BlobStore:
+    """Content-addressed store of message bodies, one file per SHA-256 digest.
+
+    Blobs are immutable and shared by every message (in any session) with the
+    same content. They are not reference-counted: ``gc`` sweeps blobs no
+    session file refers to, skipping recently written ones so a session that
+    is being saved never loses its blobs.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def _path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def put(self, content: str) -> str:
+        data = content.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        try:
+            # Refresh the mtime so a concurrent gc treats the blob as new.
+            os.utime(path)
+        except FileNotFoundError:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{digest}.{os.getpid()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        return digest
+
+    def get(self, digest: str) -> str:
+        return self._path(digest).read_text(encoding="utf-8")
+
+    def iter_blobs(self) -> Iterator[os.DirEntry]:
+        if not self.root.exists():
+            return
+        for shard in os.scandir(self.root):
+            if shard.is_dir():
+                yield from (entry for entry in os.scandir(shard.path) if not entry.name.endswith(".tmp"))
+
+    @staticmethod
+    def scan_references(sessions_dir: Path, archived: Iterable[bytes] = ()) -> Counter:
+        """Number of references to each blob across all session files (and ``archived`` ones)."""
+        refs: Counter = Counter()
+        for json_file in Path(sessions_dir).glob("*/*.json"):
+            refs.update(m.decode() for m in _REF_PATTERN.findall(json_file.read_bytes()))
+        for data in archived:
+            refs.update(m.decode() for m in _REF_PATTERN.findall(data))
+        return refs
+
+    def stats(self, sessions_dir: Path, archived: Iterable[bytes] = ()) -> dict:
+        refs = self.scan_references(sessions_dir, archived)
+        sizes = {entry.name: entry.stat().st_size for entry in self.iter_blobs()}
+        stored = sum(size for digest, size in sizes.items() if digest in refs)
+        logical = sum(sizes.get(digest, 0) * count for digest, count in refs.items())
+        return {
+            "blobs": len(sizes),
+            "references": sum(refs.values()),
+            "missing": sum(1 for digest in refs if digest not in sizes),
+            "unreferenced": sum(1 for digest in sizes if digest not in refs),
+            "unreferenced_bytes": sum(size for digest, size in sizes.items() if digest not in refs),
+            "stored_bytes": stored,
+            "logical_bytes": logical,
+            "saved_bytes": logical - stored,
+            "dedup_ratio": logical / stored if stored else 1.0,
+        }
+
+    def gc(
+        self, sessions_dir: Path, grace_seconds: float = 3600, dry_run: bool = False, archived: Iterable[bytes] = ()
+    ) -> dict:
+        """Delete blobs no session refers to that are older than ``grace_seconds``."""
+        refs = self.scan_references(sessions_dir, archived)
+        cutoff = time.time() - grace_seconds
+        removed = freed = 0
+        for entry in self.iter_blobs():
+            if entry.name in refs:
+                continue
+            stat = entry.stat()
+            if stat.st_mtime > cutoff:
+                continue
+            if not dry_run:
+                os.unlink(entry.path)
+            removed += 1
+            freed += stat.st_size
+        return {"removed": removed, "freed_bytes": freed}
@@ -0,0 +1,101 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str, casefold: bool = False, whitespace: bool = True) -> str:
+    """Canonical form of a search query for use in cache keys.
+
+    Queries with the same key must return the same results, so only what the
+    search ignores may be normalized; the query itself is executed as given.
+    ``whitespace`` collapses and strips whitespace, which FTS tokenization
+    ignores but ``LIKE`` patterns do not. ``casefold`` lowercases ASCII-only
+    queries, which is safe for ``LIKE`` matching (case-insensitive for ASCII
+    only) but not for FTS syntax, where ``OR``/``NOT`` are case-sensitive
+    operators.
+    """
+    if whitespace:
+        query = _WHITESPACE.sub(" ", query).strip()
+    if casefold and query.isascii():
+        query = query.lower()
+    return query
+
+
+class QueryCache:
+    """Bounded TTL + LRU cache of query results, invalidated by index generation.
+
+    Callers pass the current index generation (``Database.get_generation``)
+    with every lookup. The counter lives in the database and is bumped on every
+    write, so caches in separate worker processes drop stale entries as soon
+    as any process writes.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._generation: int | None = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _sync_generation(self, generation: int) -> None:
+        if generation != self._generation:
+            if self._entries:
+                self.invalidations += 1
+                self._entries.clear()
+            self._generation = generation
+
+    def get_or_compute(self, key: Hashable, generation: int, compute: Callable[[], Any]) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            self._sync_generation(generation)
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+
+        value = compute()
+
+        with self._lock:
+            # Only store results computed against the generation still current.
+            if self._generation == generation:
+                self._entries[key] = (now + self.ttl, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "generation": self._generation,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
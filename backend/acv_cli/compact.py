@@ -0,0 +1,219 @@
+"""Compact in-memory representation of loaded sessions.
+
+A session loaded as plain JSON keeps one dict, a role string, a content
+string and an ISO timestamp string per message: several hundred bytes of
+object overhead before the text itself, which adds up to gigabytes when
+analysing a few hundred long sessions. ``CompactSession`` stores messages
+column-wise instead:
+
+- roles as small ints interned in a process-wide table,
+- timestamps as int64 microseconds since the epoch,
+- all contents as UTF-8 in one buffer, addressed by offsets.
+
+It behaves as a read-only mapping with the same keys as the session dict,
+and ``session["messages"]`` is a sequence that builds message dicts only
+when they are accessed. ``to_dict()`` materializes the whole session for
+code (or responses) that need real dicts.
+"""
+
+import threading
+from array import array
+from collections.abc import Mapping, Sequence
+from datetime import datetime, timedelta, tzinfo
+from typing import Any, Iterable, Iterator
+
+_ROLES: list[str] = ["user", "assistant", "system"]
+_ROLE_IDS: dict[str, int] = {role: i for i, role in enumerate(_ROLES)}
+_ROLES_LOCK = threading.Lock()
+
+# Timestamp column sentinels; other values are microseconds since the epoch.
+_NO_TIMESTAMP = -(2 ** 63)
+_EMPTY_TIMESTAMP = _NO_TIMESTAMP + 1
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+# Keys held in the columns; anything else a message carries is kept as-is.
+_COLUMN_KEYS = frozenset({"role", "content", "timestamp"})
+
+
+def _role_id(role: str) -> int | None:
+    role_id = _ROLE_IDS.get(role)
+    if role_id is None:
+        with _ROLES_LOCK:
+            role_id = _ROLE_IDS.get(role)
+            if role_id is None:
+                if len(_ROLES) >= 0xFFFF:
+                    return None
+                role_id = _ROLE_IDS[role] = len(_ROLES)
+                _ROLES.append(role)
+    return role_id
+
+
+class CompactSession(Mapping):
+    """Read-only, column-oriented session; see the module docstring."""
+
+    __slots__ = ("meta", "_roles", "_timestamps", "_offsets", "_buffer", "_tz", "_tz_fixed", "_extras", "_raw")
+
+    def __init__(self, meta: dict, messages: Iterable[dict] = ()):
+        self.meta = {key: value for key, value in meta.items() if key != "messages"}
+        self._roles = array("H")
+        self._timestamps = array("q")
+        self._offsets = array("q", [0])
+        self._tz: tzinfo | None = None
+        self._tz_fixed = False
+        # Message index -> keys beyond role/content/timestamp (or ones the columns cannot hold)
+        self._extras: dict[int, dict] = {}
+        # Message index -> messages without a string role and content, kept verbatim
+        self._raw: dict[int, dict] = {}
+        buffer = bytearray()
+        for msg in messages:
+            self._append(msg, buffer)
+        # An exact-size copy; the bytearray over-allocates while growing.
+        self._buffer = bytes(buffer)
+
+    def _append(self, msg: dict, buffer: bytearray) -> None:
+        index = len(self._roles)
+        role, content = msg.get("role"), msg.get("content")
+        role_id = _role_id(role) if isinstance(role, str) else None
+        if role_id is None or not isinstance(content, str):
+            self._raw[index] = msg
+            self._roles.append(0)
+            self._timestamps.append(_NO_TIMESTAMP)
+            self._offsets.append(len(buffer))
+            return
+
+        self._roles.append(role_id)
+        buffer += content.encode("utf-8")
+        self._offsets.append(len(buffer))
+
+        extras = {key: value for key, value in msg.items() if key not in _COLUMN_KEYS}
+        if "timestamp" in msg:
+            encoded = self._encode_timestamp(msg["timestamp"])
+            if encoded is None:
+                extras["timestamp"] = msg["timestamp"]
+                encoded = _NO_TIMESTAMP
+            self._timestamps.append(encoded)
+        else:
+            self._timestamps.append(_NO_TIMESTAMP)
+        if extras:
+            self._extras[index] = extras
+
+    def _encode_timestamp(self, value: Any) -> int | None:
+        """Microseconds since the epoch, or None if the value would not round-trip."""
+        if value == "":
+            return _EMPTY_TIMESTAMP
+        if not isinstance(value, str):
+            return None
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+        # All numeric timestamps of a session share one UTC offset (usually none),
+        # fixed by the first one.
+        if not self._tz_fixed:
+            self._tz, self._tz_fixed = parsed.tzinfo, True
+        if parsed.tzinfo != self._tz:
+            return None
+        micros = (parsed.replace(tzinfo=None) - _EPOCH) // _MICROSECOND
+        if self._decode_timestamp(micros) != value:
+            return None  # e.g. "Z" suffix or a truncated time
+        return micros
+
+    def _decode_timestamp(self, micros: int) -> str:
+        if micros == _EMPTY_TIMESTAMP:
+            return ""
+        return (_EPOCH + micros * _MICROSECOND).replace(tzinfo=self._tz).isoformat()
+
+    def __len__(self) -> int:
+        return len(self.meta) + 1
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.meta
+        yield "messages"
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "messages":
+            return MessageView(self)
+        return self.meta[key]
+
+    # Column accessors, for analysis code that should not build dicts at all.
+
+    @property
+    def message_count(self) -> int:
+        return len(self._roles)
+
+    def role(self, index: int) -> str:
+        raw = self._raw.get(index)
+        return raw.get("role") if raw is not None else _ROLES[self._roles[index]]
+
+    def content(self, index: int) -> str:
+        raw = self._raw.get(index)
+        if raw is not None:
+            return raw.get("content")
+        return self._buffer[self._offsets[index]:self._offsets[index + 1]].decode("utf-8")
+
+    def timestamp(self, index: int) -> str | None:
+        micros = self._timestamps[index]
+        if micros == _NO_TIMESTAMP:
+            source = self._raw.get(index) or self._extras.get(index) or {}
+            return source.get("timestamp")
+        return self._decode_timestamp(micros)
+
+    def contents(self) -> Iterator[str]:
+        for index in range(self.message_count):
+            yield self.content(index)
+
+    def message(self, index: int) -> dict:
+        raw = self._raw.get(index)
+        if raw is not None:
+            return dict(raw)
+        msg = {"role": _ROLES[self._roles[index]], "content": self.content(index)}
+        micros = self._timestamps[index]
+        if micros != _NO_TIMESTAMP:
+            msg["timestamp"] = self._decode_timestamp(micros)
+        extras = self._extras.get(index)
+        if extras:
+            msg.update(extras)
+        return msg
+
+    def to_dict(self) -> dict:
+        """The session as the plain dict ``SessionManager.load_session`` returns."""
+        return {**self.meta, "messages": [self.message(i) for i in range(self.message_count)]}
+
+    def nbytes(self) -> int:
+        """Approximate bytes held by the message columns (excluding metadata and fallbacks)."""
+        return (
+            len(self._buffer)
+            + self._roles.itemsize * len(self._roles)
+            + self._timestamps.itemsize * len(self._timestamps)
+            + self._offsets.itemsize * len(self._offsets)
+        )
+
+
+class MessageView(Sequence):
+    """Messages of a ``CompactSession``, materialized as dicts on access."""
+
+    __slots__ = ("_session",)
+
+    def __init__(self, session: CompactSession):
+        self._session = session
+
+    def __len__(self) -> int:
+        return self._session.message_count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._session.message(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("message index out of range")
+        return self._session.message(index)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (MessageView, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
@@ -42,6 +42,8 @@ class Config:
             "knowledge_dir": "./data/knowledge",
             "skills_dir": "./skills",
             "db_path": "./data/index.db",
+            "archive_dir": "./data/archive",
+            "history_path": "./data/history.db",
         })
 
     @property
@@ -62,12 +64,69 @@ class Config:
 
     @property
     def search(self) -> dict[str, Any]:
-        return self.get("search", {"default_limit": 20, "enable_fts": True})
+        return self.get("search", {
+            "default_limit": 20,
+            "enable_fts": True,
+            "cache_size": 1024,
+            "cache_ttl": 60,
+        })
 
     @property
     def skills(self) -> dict[str, Any]:
         return self.get("skills", {"enabled": True, "auto_summarize": False})
 
+    @property
+    def live(self) -> dict[str, Any]:
+        return self.get("live", {
+            "enabled": True,
+            "flush_interval": 0.2,
+            "max_batch": 100,
+            "queue_size": 256,
+            "idle_timeout": 60,
+        })
+
+    @property
+    def storage(self) -> dict[str, Any]:
+        return self.get("storage", {
+            "blob_store": False,
+            "blob_min_size": 4096,
+            "group_commit": True,
+            "commit_batch": 256,
+            "commit_delay": 0.001,
+        })
+
+    @property
+    def retention(self) -> dict[str, Any]:
+        return self.get("retention", {"archive_after_days": 90})
+
+    @property
+    def history(self) -> dict[str, Any]:
+        return self.get("history", {"checkpoint_every": 16})
+
+    @property
+    def snapshot(self) -> dict[str, Any]:
+        return self.get("snapshot", {"dir": "./snapshots", "workers": 4, "keep": 0})
+
+    @property
+    def sync(self) -> dict[str, Any]:
+        return self.get("sync", {"enabled": True, "batch": 500})
+
+    @property
+    def analytics(self) -> dict[str, Any]:
+        return self.get("analytics", {"dir": "./data/analytics", "format": "parquet", "chunk_rows": 50000})
+
+    @property
+    def related(self) -> dict[str, Any]:
+        return self.get("related", {"enabled": True, "k": 10, "interval": 30})
+
+    @property
+    def metrics(self) -> dict[str, Any]:
+        return self.get("metrics", {"enabled": True})
+
+    @property
+    def profiling(self) -> dict[str, Any]:
+        return self.get("profiling", {"enabled": False})
+
     def get_agent_command(self, agent: str, profile: Optional[str] = None) -> str:
         agents = self.agents
         if profile:
@@ -1,17 +1,38 @@
 import sqlite3
 import json
+import threading
+from concurrent.futures import Future
 from pathlib import Path
 from datetime import datetime
-from typing import Any
+from typing import Any, Callable, Iterator
 from contextlib import asynccontextmanager
 
+from . import metrics
+from .config import get_config
 from .models import KnowledgeItem, Category
+from .oplog import INDEX_KNOWLEDGE, INDEX_SESSION, KNOWLEDGE, SESSION, get_oplog
+from .write_queue import submit_write
+from .dedupe import (
+    DEFAULT_THRESHOLD,
+    band_keys,
+    cluster_pairs,
+    estimate_similarity,
+    signature_from_blob,
+    signature_to_blob,
+)
+
+_SEARCH_COLUMNS = [
+    "id", "path", "title", "date", "category", "tags", "summary", "confidence", "generated_by_skill",
+]
+
 
 class Database:
     def __init__(self, db_path: str):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
         self._init_db()
+        self.oplog = get_oplog(self.db_path)
 
     def _init_db(self) -> None:
         conn = sqlite3.connect(self.db_path)
@@ -29,9 +50,60 @@ class Database:
                 summary TEXT,
                 confidence TEXT,
                 generated_by_skill TEXT,
-                model_sources TEXT
+                model_sources TEXT,
+                minhash BLOB
             )
         """)
+        self._migrate_columns(cursor, "knowledge_items", {"minhash": "BLOB"})
+
+        # LSH band buckets of the MinHash signatures (near-duplicate lookup)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS knowledge_minhash_bands (
+                band INTEGER NOT NULL,
+                bucket INTEGER NOT NULL,
+                item_id TEXT NOT NULL,
+                PRIMARY KEY (band, bucket, item_id)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_minhash_bands_item
+            ON knowledge_minhash_bands(item_id)
+        """)
+
+        # Provenance links: the sessions and models each item was derived from.
+        # The key leads with the source so "items of session X / model Y" is a
+        # range scan already in (date, id) order; the item index serves rewrites.
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS item_sources (
+                kind TEXT NOT NULL,
+                source TEXT NOT NULL,
+                date TEXT NOT NULL,
+                item_id TEXT NOT NULL,
+                PRIMARY KEY (kind, source, date, item_id)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_item_sources_item
+            ON item_sources(item_id)
+        """)
+
+        # Related-items graph (see related.py): the k nearest neighbours of
+        # each item, and per item its neighbour count and weakest score.
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS knowledge_related (
+                item_id TEXT NOT NULL,
+                neighbour_id TEXT NOT NULL,
+                score REAL NOT NULL,
+                PRIMARY KEY (item_id, neighbour_id)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS knowledge_related_nodes (
+                item_id TEXT PRIMARY KEY,
+                degree INTEGER NOT NULL,
+                min_score REAL NOT NULL
+            ) WITHOUT ROWID
+        """)
 
         # Sessions table
         cursor.execute("""
@@ -46,6 +118,33 @@ class Database:
             )
         """)
 
+        # Composite indexes matching the keyset order of the paginated listings
+        for name, table, columns in (
+            ("idx_knowledge_date_id", "knowledge_items", "date, id"),
+            ("idx_knowledge_category_date_id", "knowledge_items", "category, date, id"),
+            ("idx_sessions_created_id", "sessions", "created_at, session_id"),
+            ("idx_sessions_model_created_id", "sessions", "model_source, created_at, session_id"),
+        ):
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table}({columns})")
+
+        # Content hashes of imported sessions and files (idempotent `acv import`)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS session_imports (
+                session_id TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                source TEXT,
+                imported_at TEXT NOT NULL
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS import_files (
+                file_hash TEXT PRIMARY KEY,
+                path TEXT NOT NULL,
+                sessions INTEGER NOT NULL,
+                imported_at TEXT NOT NULL
+            )
+        """)
+
         # FTS5 full-text search (simplified without external content)
         cursor.execute("""
             CREATE VIRTUAL TABLE IF NOT EXISTS knowledge_items_fts USING fts5(
@@ -53,17 +152,81 @@ class Database:
             )
         """)
 
+        # Change counter bumped by every write to the indexed tables; used as a
+        # cheap validator for HTTP caching and result caches.
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS index_meta (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            )
+        """)
+        cursor.execute("INSERT OR IGNORE INTO index_meta (key, value) VALUES ('generation', 0)")
+        for table in ("knowledge_items", "sessions", "item_sources"):
+            for event in ("INSERT", "UPDATE", "DELETE"):
+                cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS bump_generation_{table}_{event.lower()}
+                    AFTER {event} ON {table}
+                    BEGIN
+                        UPDATE index_meta SET value = value + 1 WHERE key = 'generation';
+                    END
+                """)
+
         conn.commit()
         conn.close()
 
+    def get_generation(self) -> int:
+        """Current value of the index change counter."""
+        # Polled on every cached lookup, so keep one read connection per thread.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.db_path)
+        row = conn.execute("SELECT value FROM index_meta WHERE key = 'generation'").fetchone()
+        return row[0] if row else 0
+
+    @staticmethod
+    def _migrate_columns(cursor: sqlite3.Cursor, table: str, columns: dict[str, str]) -> None:
+        """Add columns introduced after a table was first created."""
+        cursor.execute(f"PRAGMA table_info({table})")
+        existing = {row[1] for row in cursor.fetchall()}
+        for name, decl in columns.items():
+            if name not in existing:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {decl}")
+
+    def _submit(self, write: Callable[[sqlite3.Cursor], Any]) -> Future:
+        """Queue ``write`` for the next group commit; the future resolves once it is committed.
+
+        With ``group_commit = false`` in ``[storage]`` the write is committed
+        on its own connection before returning.
+        """
+        return submit_write(self.db_path, write, get_config().storage)
+
+    @metrics.timed("db", "add_knowledge_item")
     def add_knowledge_item(self, item: KnowledgeItem, path: str) -> None:
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        self.submit_knowledge_item(item, path).result()
+
+    def submit_knowledge_item(self, item: KnowledgeItem, path: str) -> Future:
+        """Queue a knowledge item for indexing (``asyncio.wrap_future`` to await it)."""
+        def write(cursor: sqlite3.Cursor) -> None:
+            self._write_knowledge_item(cursor, item, path)
+            self.oplog.append(cursor, INDEX_KNOWLEDGE, [item.id])
+
+        return self._submit(write)
+
+    @metrics.timed("db", "add_knowledge_items")
+    def add_knowledge_items(self, items: list[tuple[KnowledgeItem, str]]) -> None:
+        """Index many knowledge items in a single transaction."""
+        def write(cursor: sqlite3.Cursor) -> None:
+            for item, path in items:
+                self._write_knowledge_item(cursor, item, path)
+            self.oplog.append(cursor, INDEX_KNOWLEDGE, [item.id for item, _ in items])
 
+        self._submit(write).result()
+
+    def _write_knowledge_item(self, cursor: sqlite3.Cursor, item: KnowledgeItem, path: str) -> None:
         cursor.execute("""
             INSERT OR REPLACE INTO knowledge_items
-            (id, path, title, date, category, tags, summary, confidence, generated_by_skill, model_sources)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            (id, path, title, date, category, tags, summary, confidence, generated_by_skill, model_sources, minhash)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """, (
             item.id,
             path,
@@ -75,51 +238,286 @@ class Database:
             item.confidence.value,
             item.generated_by_skill,
             json.dumps(item.model_sources),
+            signature_to_blob(item.minhash) if item.minhash else None,
         ))
 
-        # Update FTS index
+        # Update FTS index; re-indexed items replace their row rather than adding one
+        cursor.execute("DELETE FROM knowledge_items_fts WHERE id = ?", (item.id,))
         cursor.execute("""
             INSERT INTO knowledge_items_fts(id, title, summary, content)
             VALUES(?, ?, ?, ?)
         """, (item.id, item.title, item.summary or "", item.title + " " + (item.summary or "")))
 
-        conn.commit()
+        if item.minhash:
+            self._write_minhash_bands(cursor, item.id, item.minhash)
+
+        self._write_item_sources(cursor, item)
+
+        # Neighbours were scored on the old text; the item goes back to items_without_related
+        cursor.execute("DELETE FROM knowledge_related WHERE item_id = ?", (item.id,))
+        cursor.execute("DELETE FROM knowledge_related_nodes WHERE item_id = ?", (item.id,))
+
+    @staticmethod
+    def _write_item_sources(cursor: sqlite3.Cursor, item: KnowledgeItem) -> None:
+        cursor.execute("DELETE FROM item_sources WHERE item_id = ?", (item.id,))
+        date = item.date.isoformat()
+        cursor.executemany("""
+            INSERT OR IGNORE INTO item_sources (kind, source, date, item_id)
+            VALUES (?, ?, ?, ?)
+        """, [("session", s, date, item.id) for s in item.source_sessions]
+            + [("model", m, date, item.id) for m in item.model_sources])
+
+    @metrics.timed("db", "set_item_sources")
+    def set_item_sources(self, items: list[KnowledgeItem]) -> None:
+        """Replace the provenance links of already indexed items in one transaction."""
+        def write(cursor: sqlite3.Cursor) -> None:
+            for item in items:
+                self._write_item_sources(cursor, item)
+
+        self._submit(write).result()
+
+    @metrics.timed("db", "items_from_source")
+    def items_from_source(
+        self,
+        kind: str,
+        source: str,
+        limit: int = 50,
+        category: Category | None = None,
+        after: tuple[str, str] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Knowledge items derived from a session (``kind="session"``) or model (``"model"``).
+
+        Newest first, as search results, continuing after the ``(date, id)`` key if given.
+        """
+        sql = f"""
+            SELECT {", ".join(f"k.{c}" for c in _SEARCH_COLUMNS)}
+            FROM item_sources s JOIN knowledge_items k ON k.id = s.item_id
+            WHERE s.kind = ? AND s.source = ?
+        """
+        params: list[Any] = [kind, source]
+        if category:
+            sql += " AND k.category = ?"
+            params.append(category.value)
+        if after:
+            sql += " AND (s.date, s.item_id) < (?, ?)"
+            params.extend(after)
+        sql += " ORDER BY s.date DESC, s.item_id DESC LIMIT ?"
+        params.append(limit)
+
+        conn = sqlite3.connect(self.db_path)
+        rows = conn.execute(sql, params).fetchall()
         conn.close()
+        metrics.observe_items("db", "items_from_source", len(rows))
+        return [dict(zip(_SEARCH_COLUMNS, row)) for row in rows]
+
+    @staticmethod
+    def _write_minhash_bands(cursor: sqlite3.Cursor, item_id: str, signature: list[int]) -> None:
+        cursor.execute("DELETE FROM knowledge_minhash_bands WHERE item_id = ?", (item_id,))
+        cursor.executemany("""
+            INSERT OR IGNORE INTO knowledge_minhash_bands (band, bucket, item_id)
+            VALUES (?, ?, ?)
+        """, [(band, bucket, item_id) for band, bucket in band_keys(signature)])
+
+    def set_minhash(self, item_id: str, signature: list[int]) -> None:
+        """Store (or replace) the MinHash signature of an indexed item."""
+        def write(cursor: sqlite3.Cursor) -> None:
+            cursor.execute(
+                "UPDATE knowledge_items SET minhash = ? WHERE id = ?",
+                (signature_to_blob(signature), item_id),
+            )
+            self._write_minhash_bands(cursor, item_id, signature)
+
+        self._submit(write).result()
 
-    def search(self, query: str, limit: int = 20, category: Category | None = None) -> list[dict[str, Any]]:
+    def knowledge_items_without_minhash(self) -> list[dict]:
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute("SELECT id, title, path FROM knowledge_items WHERE minhash IS NULL")
+        rows = cursor.fetchall()
+        conn.close()
+        return [dict(zip(["id", "title", "path"], row)) for row in rows]
+
+    @metrics.timed("db", "find_near_duplicates")
+    def find_near_duplicates(
+        self,
+        signature: list[int],
+        threshold: float = DEFAULT_THRESHOLD,
+        exclude_id: str | None = None,
+    ) -> list[dict]:
+        """Indexed items whose estimated similarity to ``signature`` reaches ``threshold``.
+
+        Only items sharing at least one LSH band bucket are compared, so the cost
+        depends on the number of candidates rather than the size of the index.
+        """
+        keys = band_keys(signature)
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT DISTINCT k.id, k.title, k.path, k.minhash
+            FROM knowledge_minhash_bands b
+            JOIN knowledge_items k ON k.id = b.item_id
+            WHERE {" OR ".join(["(b.band = ? AND b.bucket = ?)"] * len(keys))}
+        """, [value for key in keys for value in key])
+        rows = cursor.fetchall()
+        conn.close()
+        metrics.observe_items("db", "find_near_duplicates", len(rows))
+
+        matches = []
+        for item_id, title, path, blob in rows:
+            if item_id == exclude_id or blob is None:
+                continue
+            similarity = estimate_similarity(signature, signature_from_blob(blob))
+            if similarity >= threshold:
+                matches.append({
+                    "id": item_id,
+                    "title": title,
+                    "path": path,
+                    "similarity": similarity,
+                })
+        return sorted(matches, key=lambda m: m["similarity"], reverse=True)
+
+    @metrics.timed("db", "near_duplicate_clusters")
+    def near_duplicate_clusters(self, threshold: float = DEFAULT_THRESHOLD) -> list[dict]:
+        """Group indexed items into clusters of near-duplicates via shared LSH buckets."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT group_concat(item_id, char(31))
+            FROM knowledge_minhash_bands
+            GROUP BY band, bucket
+            HAVING COUNT(*) > 1
+        """)
+        candidate_pairs = set()
+        for (members,) in cursor.fetchall():
+            ids = sorted(members.split("\x1f"))
+            for i, a in enumerate(ids):
+                for b in ids[i + 1:]:
+                    candidate_pairs.add((a, b))
+
+        involved = sorted({x for pair in candidate_pairs for x in pair})
+        rows: dict[str, tuple] = {}
+        for start in range(0, len(involved), 500):
+            chunk = involved[start:start + 500]
+            cursor.execute(
+                f"SELECT id, title, path, minhash FROM knowledge_items "
+                f"WHERE id IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            )
+            rows.update({row[0]: row[1:] for row in cursor.fetchall()})
+        conn.close()
 
+        signatures = {i: signature_from_blob(r[2]) for i, r in rows.items() if r[2] is not None}
+        pairs = []
+        for a, b in candidate_pairs:
+            if a in signatures and b in signatures:
+                similarity = estimate_similarity(signatures[a], signatures[b])
+                if similarity >= threshold:
+                    pairs.append((a, b, similarity))
+
+        best: dict[str, float] = {}
+        for a, b, similarity in pairs:
+            best[a] = max(best.get(a, 0.0), similarity)
+            best[b] = max(best.get(b, 0.0), similarity)
+
+        return [
+            {
+                "items": [
+                    {"id": i, "title": rows[i][0], "path": rows[i][1], "similarity": best[i]}
+                    for i in cluster
+                ],
+            }
+            for cluster in cluster_pairs(pairs)
+        ]
+
+    def _search_sql(
+        self,
+        query: str,
+        limit: int | None,
+        category: Category | None,
+        after: tuple[str, str] | None = None,
+    ) -> tuple[str, list]:
         sql = """
             SELECT id, path, title, date, category, tags, summary, confidence, generated_by_skill
             FROM knowledge_items
         """
+        where = []
         params = []
 
         if category:
-            sql += " WHERE category = ?"
+            where.append("category = ?")
             params.append(category.value)
 
         if query:
-            if category:
-                sql += " AND"
-            else:
-                sql += " WHERE"
-            sql += " title LIKE ? OR summary LIKE ?"
+            where.append("(title LIKE ? OR summary LIKE ?)")
             params.extend([f"%{query}%", f"%{query}%"])
 
-        sql += " ORDER BY date DESC LIMIT ?"
-        params.append(limit)
+        if after:
+            # Keyset: rows strictly after the last (date, id) of the previous page
+            where.append("(date, id) < (?, ?)")
+            params.extend(after)
+
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY date DESC, id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return sql, params
+
+    @metrics.timed("db", "search")
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        category: Category | None = None,
+        after: tuple[str, str] | None = None,
+    ) -> list[dict[str, Any]]:
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
 
-        cursor.execute(sql, params)
+        cursor.execute(*self._search_sql(query, limit, category, after))
         rows = cursor.fetchall()
         conn.close()
+        metrics.observe_items("db", "search", len(rows))
+
+        return [dict(zip(_SEARCH_COLUMNS, row)) for row in rows]
+
+    def iter_search(
+        self,
+        query: str,
+        limit: int | None = None,
+        category: Category | None = None,
+        after: tuple[str, str] | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Stream search results row by row instead of building the full list."""
+        # Streaming responses may resume the generator from different threads.
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        try:
+            cursor = conn.execute(*self._search_sql(query, limit, category, after))
+            for row in cursor:
+                yield dict(zip(_SEARCH_COLUMNS, row))
+        finally:
+            conn.close()
+
+    @metrics.timed("db", "knowledge_rows_since")
+    def knowledge_rows_since(self, after_rowid: int) -> tuple[list[tuple], int]:
+        """Rows written after ``after_rowid`` (rowid, id, title, tags, date) plus the total count."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT rowid, id, title, tags, date
+            FROM knowledge_items
+            WHERE rowid > ?
+            ORDER BY rowid
+        """, (after_rowid,))
+        rows = cursor.fetchall()
+        cursor.execute("SELECT COUNT(*) FROM knowledge_items")
+        total = cursor.fetchone()[0]
+        conn.close()
+        metrics.observe_items("db", "knowledge_rows_since", len(rows))
+        return rows, total
 
-        return [dict(zip(
-            ["id", "path", "title", "date", "category", "tags", "summary", "confidence", "generated_by_skill"],
-            row
-        )) for row in rows]
-
+    @metrics.timed("db", "search_fts")
     def search_fts(self, query: str, limit: int = 20) -> list[dict[str, Any]]:
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
@@ -134,13 +532,134 @@ class Database:
 
         rows = cursor.fetchall()
         conn.close()
+        metrics.observe_items("db", "search_fts", len(rows))
 
         return [dict(zip(["id", "title", "summary"], row)) for row in rows]
 
-    def add_session(self, session_data: dict) -> None:
+    def knowledge_features(
+        self, item_ids: list[str] | None = None, exclude: list[str] | None = None
+    ) -> list[tuple[str, str, str, list[str], list[str]]]:
+        """``(id, title, summary, tags, source sessions)`` of the indexed items (all, or ``item_ids``)."""
         conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        if item_ids is not None:
+            conn.execute("CREATE TEMP TABLE selected (id TEXT PRIMARY KEY)")
+            conn.executemany("INSERT OR IGNORE INTO selected VALUES (?)", [(i,) for i in item_ids])
+            where = "WHERE id IN (SELECT id FROM selected)"
+        elif exclude:
+            conn.execute("CREATE TEMP TABLE selected (id TEXT PRIMARY KEY)")
+            conn.executemany("INSERT OR IGNORE INTO selected VALUES (?)", [(i,) for i in exclude])
+            where = "WHERE id NOT IN (SELECT id FROM selected)"
+        else:
+            where = ""
+        sessions: dict[str, list[str]] = {}
+        for item_id, source in conn.execute(f"""
+            SELECT item_id, source FROM item_sources
+            WHERE kind = 'session' {where.replace("WHERE id", "AND item_id")}
+        """):
+            sessions.setdefault(item_id, []).append(source)
+        rows = [
+            (item_id, title, summary or "", json.loads(tags or "[]"), sessions.get(item_id, []))
+            for item_id, title, summary, tags in conn.execute(
+                f"SELECT id, title, summary, tags FROM knowledge_items {where} ORDER BY id"
+            )
+        ]
+        conn.close()
+        metrics.observe_items("db", "knowledge_features", len(rows))
+        return rows
+
+    def items_without_related(self) -> list[str]:
+        """Indexed items not yet in the related-items graph."""
+        conn = sqlite3.connect(self.db_path)
+        rows = conn.execute("""
+            SELECT id FROM knowledge_items
+            WHERE id NOT IN (SELECT item_id FROM knowledge_related_nodes)
+        """).fetchall()
+        conn.close()
+        return [row[0] for row in rows]
+
+    def related_nodes(self) -> dict[str, tuple[int, float]]:
+        """``(neighbour count, weakest score)`` of every item in the graph."""
+        conn = sqlite3.connect(self.db_path)
+        rows = conn.execute("SELECT item_id, degree, min_score FROM knowledge_related_nodes").fetchall()
+        conn.close()
+        return {item_id: (degree, min_score) for item_id, degree, min_score in rows}
+
+    def related_neighbours(self, item_ids: list[str]) -> dict[str, list[tuple[str, float]]]:
+        """Current neighbour lists of ``item_ids``."""
+        result: dict[str, list[tuple[str, float]]] = {}
+        conn = sqlite3.connect(self.db_path)
+        for start in range(0, len(item_ids), 500):
+            chunk = item_ids[start:start + 500]
+            for item_id, neighbour_id, score in conn.execute(f"""
+                SELECT item_id, neighbour_id, score FROM knowledge_related
+                WHERE item_id IN ({", ".join("?" * len(chunk))})
+            """, chunk):
+                result.setdefault(item_id, []).append((neighbour_id, score))
+        conn.close()
+        return result
+
+    @metrics.timed("db", "write_related")
+    def write_related(self, lists: dict[str, list[tuple[str, float]]], replace_all: bool = False) -> None:
+        """Store the neighbour lists of ``lists`` (or the whole graph with ``replace_all``)."""
+        def write(cursor: sqlite3.Cursor) -> None:
+            if replace_all:
+                cursor.execute("DELETE FROM knowledge_related")
+                cursor.execute("DELETE FROM knowledge_related_nodes")
+            else:
+                cursor.executemany("DELETE FROM knowledge_related WHERE item_id = ?", [(i,) for i in lists])
+            cursor.executemany(
+                "INSERT INTO knowledge_related (item_id, neighbour_id, score) VALUES (?, ?, ?)",
+                [(item_id, n, score) for item_id, neighbours in lists.items() for n, score in neighbours],
+            )
+            cursor.executemany(
+                "INSERT OR REPLACE INTO knowledge_related_nodes (item_id, degree, min_score) VALUES (?, ?, ?)",
+                [
+                    (item_id, len(neighbours), min((s for _, s in neighbours), default=0.0))
+                    for item_id, neighbours in lists.items()
+                ],
+            )
+
+        self._submit(write).result()
+
+    def related_state(self, item_id: str) -> str | None:
+        """``"ready"`` once an item is in the related graph, ``"pending"`` before, None if not indexed."""
+        conn = sqlite3.connect(self.db_path)
+        row = conn.execute("""
+            SELECT EXISTS (SELECT 1 FROM knowledge_items WHERE id = ?),
+                   EXISTS (SELECT 1 FROM knowledge_related_nodes WHERE item_id = ?)
+        """, (item_id, item_id)).fetchone()
+        conn.close()
+        if not row[0]:
+            return None
+        return "ready" if row[1] else "pending"
+
+    @metrics.timed("db", "related_items")
+    def related_items(self, item_id: str, limit: int = 10) -> list[dict[str, Any]]:
+        """Precomputed neighbours of an item, best first (one primary-key range read)."""
+        conn = sqlite3.connect(self.db_path)
+        rows = conn.execute(f"""
+            SELECT {", ".join(f"k.{c}" for c in _SEARCH_COLUMNS)}, r.score
+            FROM knowledge_related r JOIN knowledge_items k ON k.id = r.neighbour_id
+            WHERE r.item_id = ?
+            ORDER BY r.score DESC
+            LIMIT ?
+        """, (item_id, limit)).fetchall()
+        conn.close()
+        return [dict(zip(_SEARCH_COLUMNS + ["score"], row)) for row in rows]
+
+    @metrics.timed("db", "add_session")
+    def add_session(self, session_data: dict) -> None:
+        self.submit_session(session_data).result()
+
+    def submit_session(self, session_data: dict) -> Future:
+        """Queue a session for indexing (``asyncio.wrap_future`` to await it)."""
+        def write(cursor: sqlite3.Cursor) -> None:
+            self._write_session(cursor, session_data)
+            self.oplog.append(cursor, INDEX_SESSION, [session_data["session_id"]])
+
+        return self._submit(write)
 
+    def _write_session(self, cursor: sqlite3.Cursor, session_data: dict) -> None:
         cursor.execute("""
             INSERT OR REPLACE INTO sessions
             (session_id, created_at, model_source, model_variant, project, tags, summaries)
@@ -155,9 +674,46 @@ class Database:
             json.dumps(session_data.get("summaries", {})),
         ))
 
-        conn.commit()
+    @metrics.timed("db", "add_imported_sessions")
+    def add_imported_sessions(self, sessions: list[tuple[dict, str, str]]) -> None:
+        """Index imported sessions with their (content hash, source) in one transaction."""
+        now = datetime.now().isoformat()
+
+        def write(cursor: sqlite3.Cursor) -> None:
+            for session_data, content_hash, source in sessions:
+                self._write_session(cursor, session_data)
+                cursor.execute("""
+                    INSERT OR REPLACE INTO session_imports (session_id, content_hash, source, imported_at)
+                    VALUES (?, ?, ?, ?)
+                """, (session_data["session_id"], content_hash, source, now))
+            # The importer's workers write the files without logging them; both ops are logged here.
+            ids = [session_data["session_id"] for session_data, _, _ in sessions]
+            self.oplog.append(cursor, SESSION, ids)
+            self.oplog.append(cursor, INDEX_SESSION, ids)
+
+        self._submit(write).result()
+
+    def import_hashes(self) -> dict[str, str]:
+        """Content hash of every imported session, keyed by session ID."""
+        conn = sqlite3.connect(self.db_path)
+        rows = conn.execute("SELECT session_id, content_hash FROM session_imports").fetchall()
         conn.close()
+        return dict(rows)
 
+    def is_file_imported(self, file_hash: str) -> bool:
+        conn = sqlite3.connect(self.db_path)
+        row = conn.execute("SELECT 1 FROM import_files WHERE file_hash = ?", (file_hash,)).fetchone()
+        conn.close()
+        return row is not None
+
+    def mark_file_imported(self, file_hash: str, path: str, sessions: int) -> None:
+        row = (file_hash, path, sessions, datetime.now().isoformat())
+        self._submit(lambda cursor: cursor.execute("""
+            INSERT OR REPLACE INTO import_files (file_hash, path, sessions, imported_at)
+            VALUES (?, ?, ?, ?)
+        """, row)).result()
+
+    @metrics.timed("db", "get_session")
     def get_session(self, session_id: str) -> dict | None:
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
@@ -171,25 +727,139 @@ class Database:
             return dict(zip(columns, row))
         return None
 
-    def list_sessions(self, limit: int = 50, model_source: str | None = None) -> list[dict]:
+    def session_rows(self, session_ids: list[str]) -> list[dict]:
+        """Index rows of ``session_ids``, in the form ``add_session`` takes (without messages)."""
+        columns = ["session_id", "created_at", "model_source", "model_variant", "project", "tags", "summaries"]
+        rows = []
+        conn = sqlite3.connect(self.db_path)
+        for start in range(0, len(session_ids), 500):
+            chunk = session_ids[start:start + 500]
+            rows += conn.execute(
+                f"SELECT {', '.join(columns)} FROM sessions WHERE session_id IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            ).fetchall()
+        conn.close()
+        sessions = []
+        for row in rows:
+            data = dict(zip(columns, row))
+            data["tags"] = json.loads(data["tags"] or "[]")
+            data["summaries"] = json.loads(data["summaries"] or "{}")
+            sessions.append(data)
+        return sessions
+
+    def knowledge_items(self, item_ids: list[str]) -> list[tuple[KnowledgeItem, str]]:
+        """Indexed knowledge items (with signatures and provenance) and their paths."""
+        result = []
+        conn = sqlite3.connect(self.db_path)
+        for start in range(0, len(item_ids), 500):
+            chunk = item_ids[start:start + 500]
+            marks = ", ".join("?" * len(chunk))
+            sources: dict[str, dict[str, list[str]]] = {}
+            for kind, source, item_id in conn.execute(
+                f"SELECT kind, source, item_id FROM item_sources WHERE item_id IN ({marks})", chunk
+            ):
+                sources.setdefault(item_id, {}).setdefault(kind, []).append(source)
+            for row in conn.execute(f"""
+                SELECT id, path, title, date, category, tags, summary, confidence, generated_by_skill, minhash
+                FROM knowledge_items WHERE id IN ({marks})
+            """, chunk):
+                item_id, path, title, date, category, tags, summary, confidence, skill, minhash = row
+                item = KnowledgeItem(
+                    id=item_id,
+                    title=title,
+                    date=datetime.fromisoformat(date),
+                    category=Category(category),
+                    tags=json.loads(tags or "[]"),
+                    source_sessions=sources.get(item_id, {}).get("session", []),
+                    model_sources=sources.get(item_id, {}).get("model", []),
+                    confidence=confidence,
+                    generated_by_skill=skill,
+                    summary=summary,
+                    minhash=signature_from_blob(minhash) if minhash else None,
+                )
+                result.append((item, path))
+        conn.close()
+        return result
+
+    def iter_knowledge_rows(self, batch: int = 5000) -> Iterator[dict[str, Any]]:
+        """Every indexed knowledge item with its number of source sessions, oldest first."""
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            cursor = conn.execute("""
+                SELECT k.id, k.title, k.date, k.category, k.tags, k.confidence, k.generated_by_skill,
+                       k.model_sources,
+                       (SELECT COUNT(*) FROM item_sources s
+                        WHERE s.item_id = k.id AND s.kind = 'session') AS source_sessions
+                FROM knowledge_items k
+                ORDER BY k.date, k.id
+            """)
+            while rows := cursor.fetchmany(batch):
+                for row in rows:
+                    yield dict(row)
+        finally:
+            conn.close()
+
+    def apply_remote(self, sessions: list[dict], items: list[tuple[KnowledgeItem, str]], ops: list) -> None:
+        """Write index rows replicated from another vault and log its ops, in one transaction.
+
+        No local ops are appended: the received ``ops`` already describe these changes.
+        """
+        def write(cursor: sqlite3.Cursor) -> None:
+            for session_data in sessions:
+                self._write_session(cursor, session_data)
+            for item, path in items:
+                self._write_knowledge_item(cursor, item, path)
+            self.oplog.insert(cursor, ops)
+
+        self._submit(write).result()
+
+    def log_unlogged(self) -> int:
+        """Append ops for indexed sessions and items that have none (indexed before the log existed)."""
+        def write(cursor: sqlite3.Cursor) -> int:
+            unlogged = self.oplog.unlogged(cursor)
+            self.oplog.append(cursor, SESSION, unlogged[INDEX_SESSION])
+            self.oplog.append(cursor, INDEX_SESSION, unlogged[INDEX_SESSION])
+            self.oplog.append(cursor, KNOWLEDGE, unlogged[INDEX_KNOWLEDGE])
+            self.oplog.append(cursor, INDEX_KNOWLEDGE, unlogged[INDEX_KNOWLEDGE])
+            return len(unlogged[INDEX_SESSION]) + len(unlogged[INDEX_KNOWLEDGE])
+
+        return self._submit(write).result()
+
+    @metrics.timed("db", "list_sessions")
+    def list_sessions(
+        self,
+        limit: int = 50,
+        model_source: str | None = None,
+        after: tuple[str, str] | None = None,
+    ) -> list[dict]:
+        """Indexed sessions, newest first; ``after`` is the last ``(created_at, session_id)`` seen."""
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
 
         sql = "SELECT * FROM sessions"
+        where = []
         params = []
         if model_source:
-            sql += " WHERE model_source = ?"
+            where.append("model_source = ?")
             params.append(model_source)
-        sql += " ORDER BY created_at DESC LIMIT ?"
+        if after:
+            where.append("(created_at, session_id) < (?, ?)")
+            params.extend(after)
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY created_at DESC, session_id DESC LIMIT ?"
         params.append(limit)
 
         cursor.execute(sql, params)
         rows = cursor.fetchall()
         conn.close()
+        metrics.observe_items("db", "list_sessions", len(rows))
 
         columns = ["session_id", "created_at", "model_source", "model_variant", "project", "tags", "summaries"]
         return [dict(zip(columns, row)) for row in rows]
 
+    @metrics.timed("db", "get_stats")
     def get_stats(self) -> dict:
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
@@ -0,0 +1,97 @@
+"""MinHash signatures and LSH banding for near-duplicate knowledge items."""
+
+import hashlib
+import random
+import re
+import zlib
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # the pure-Python path gives identical signatures
+    np = None
+
+NUM_PERM = 128
+BANDS = 16
+ROWS_PER_BAND = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+DEFAULT_THRESHOLD = 0.8
+
+_MERSENNE_PRIME = (1 << 31) - 1
+_TOKEN = re.compile(r"[a-z0-9_]+|[\u4e00-\u9fff]")
+
+_rng = random.Random(0x5EED)
+_PERM_A = [_rng.randrange(1, _MERSENNE_PRIME) for _ in range(NUM_PERM)]
+_PERM_B = [_rng.randrange(0, _MERSENNE_PRIME) for _ in range(NUM_PERM)]
+
+
+def _shingle_hashes(text: str) -> list[int]:
+    tokens = _TOKEN.findall(text.lower())
+    if len(tokens) < SHINGLE_SIZE:
+        shingles = {" ".join(tokens)}
+    else:
+        shingles = {
+            " ".join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)
+        }
+    return [zlib.crc32(s.encode("utf-8")) for s in shingles]
+
+
+def minhash_signature(text: str) -> list[int]:
+    """Compute a ``NUM_PERM``-value MinHash signature over word 3-gram shingles."""
+    hashes = _shingle_hashes(text)
+    if np is not None:
+        x = np.asarray(hashes, dtype=np.uint64)
+        a = np.asarray(_PERM_A, dtype=np.uint64)[:, None]
+        b = np.asarray(_PERM_B, dtype=np.uint64)[:, None]
+        return ((a * x + b) % _MERSENNE_PRIME).min(axis=1).tolist()
+    return [
+        min((a * x + b) % _MERSENNE_PRIME for x in hashes)
+        for a, b in zip(_PERM_A, _PERM_B)
+    ]
+
+
+def signature_to_blob(signature: list[int]) -> bytes:
+    return array("I", signature).tobytes()
+
+
+def signature_from_blob(blob: bytes) -> list[int]:
+    values = array("I")
+    values.frombytes(blob)
+    return values.tolist()
+
+
+def band_keys(signature: list[int]) -> list[tuple[int, int]]:
+    """Split a signature into ``(band, bucket)`` keys for the LSH index."""
+    keys = []
+    for band in range(BANDS):
+        chunk = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(array("I", chunk).tobytes(), digest_size=8).digest()
+        keys.append((band, int.from_bytes(digest, "big", signed=True)))
+    return keys
+
+
+def estimate_similarity(sig_a: list[int], sig_b: list[int]) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / NUM_PERM
+
+
+def cluster_pairs(pairs: list[tuple[str, str, float]]) -> list[list[str]]:
+    """Group near-duplicate pairs into connected clusters (union-find)."""
+    parent: dict[str, str] = {}
+
+    def find(x: str) -> str:
+        parent.setdefault(x, x)
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for a, b, _ in pairs:
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[root_b] = root_a
+
+    clusters: dict[str, list[str]] = {}
+    for x in parent:
+        clusters.setdefault(find(x), []).append(x)
+    return sorted((sorted(c) for c in clusters.values()), key=len, reverse=True)
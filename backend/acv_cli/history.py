@@ -0,0 +1,189 @@
+"""Revision history of knowledge items, stored as line deltas.
+
+Every revision of an item's markdown file (frontmatter included) is a row
+of ``revisions`` in ``history.db``. Most rows are deltas against the
+previous revision: the ``difflib`` opcodes of the two line lists, encoded
+as ``[start, end]`` ranges copied from the previous revision and strings
+inserted between them, zlib-compressed. Every ``checkpoint_every``-th
+revision (and any revision whose delta would be no smaller) is stored
+whole, so rebuilding a version applies at most ``checkpoint_every - 1``
+deltas to the nearest checkpoint before it.
+"""
+
+import difflib
+import hashlib
+import json
+import sqlite3
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS revisions (
+    item_id TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    source TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    checkpoint INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (item_id, version)
+);
+"""
+
+
+def make_delta(old: str, new: str) -> list:
+    """Opcodes turning ``old`` into ``new``, line by line."""
+    a = old.splitlines(keepends=True)
+    b = new.splitlines(keepends=True)
+    delta: list = []
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if tag == "equal":
+            delta.append([i1, i2])
+        elif j2 > j1:
+            delta.append("".join(b[j1:j2]))
+    return delta
+
+
+def apply_delta(old: str, delta: list) -> str:
+    a = old.splitlines(keepends=True)
+    return "".join(op if isinstance(op, str) else "".join(a[op[0]:op[1]]) for op in delta)
+
+
+class ItemHistory:
+    """Revisions of knowledge items, in the SQLite database at ``path``."""
+
+    def __init__(self, path: Path, checkpoint_every: int = 16):
+        self.path = Path(path)
+        self.checkpoint_every = max(1, checkpoint_every)
+        self._ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._ready:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        if not self._ready:
+            conn.executescript(_SCHEMA)
+            self._ready = True
+        return conn
+
+    @staticmethod
+    def _rebuild(rows: list[tuple[int, bytes]]) -> str:
+        """Text of the last of ``rows``: a checkpoint followed by the deltas after it."""
+        text = ""
+        for checkpoint, data in rows:
+            raw = zlib.decompress(data).decode("utf-8")
+            text = raw if checkpoint else apply_delta(text, json.loads(raw))
+        return text
+
+    def _chain(self, conn: sqlite3.Connection, item_id: str, version: int) -> list[tuple[int, bytes]]:
+        return conn.execute("""
+            SELECT checkpoint, data FROM revisions
+            WHERE item_id = ? AND version <= ? AND version >= (
+                SELECT MAX(version) FROM revisions
+                WHERE item_id = ? AND version <= ? AND checkpoint = 1
+            )
+            ORDER BY version
+        """, (item_id, version, item_id, version)).fetchall()
+
+    def record(self, item_id: str, text: str, source: str) -> int | None:
+        """Store ``text`` as the next revision; returns its version, or None if unchanged."""
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                last = conn.execute(
+                    "SELECT version, sha256 FROM revisions WHERE item_id = ? ORDER BY version DESC LIMIT 1",
+                    (item_id,),
+                ).fetchone()
+                if last and last[1] == digest:
+                    conn.execute("ROLLBACK")
+                    return None
+                version = last[0] + 1 if last else 1
+                full = zlib.compress(text.encode("utf-8"))
+                data, checkpoint = full, 1
+                if last and (version - 1) % self.checkpoint_every:
+                    previous = self._rebuild(self._chain(conn, item_id, last[0]))
+                    delta = zlib.compress(json.dumps(make_delta(previous, text), ensure_ascii=False).encode("utf-8"))
+                    if len(delta) < len(full):
+                        data, checkpoint = delta, 0
+                conn.execute(
+                    "INSERT INTO revisions (item_id, version, created_at, source, sha256, size, checkpoint, data)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (item_id, version, datetime.now().isoformat(), source, digest,
+                     len(text.encode("utf-8")), checkpoint, data),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+        return version
+
+    def get(self, item_id: str, version: int) -> str | None:
+        """Text of ``version`` of an item, or None if there is no such revision."""
+        conn = self._connect()
+        try:
+            rows = self._chain(conn, item_id, version)
+            exists = conn.execute(
+                "SELECT 1 FROM revisions WHERE item_id = ? AND version = ?", (item_id, version)
+            ).fetchone()
+        finally:
+            conn.close()
+        return self._rebuild(rows) if exists else None
+
+    def versions(self, item_id: str) -> list[dict]:
+        """Revision metadata of an item, oldest first."""
+        conn = self._connect()
+        try:
+            rows = conn.execute("""
+                SELECT version, created_at, source, sha256, size, checkpoint, LENGTH(data)
+                FROM revisions WHERE item_id = ? ORDER BY version
+            """, (item_id,)).fetchall()
+        finally:
+            conn.close()
+        return [
+            {
+                "version": version,
+                "created_at": created_at,
+                "source": source,
+                "sha256": sha256,
+                "size": size,
+                "checkpoint": bool(checkpoint),
+                "stored": stored,
+            }
+            for version, created_at, source, sha256, size, checkpoint, stored in rows
+        ]
+
+    def latest_hashes(self) -> dict[str, str]:
+        """sha256 of the newest revision of every item."""
+        conn = self._connect()
+        try:
+            return dict(conn.execute("""
+                SELECT r.item_id, r.sha256 FROM revisions r
+                JOIN (SELECT item_id, MAX(version) AS version FROM revisions GROUP BY item_id) m
+                    ON m.item_id = r.item_id AND m.version = r.version
+            """))
+        finally:
+            conn.close()
+
+    def stats(self) -> dict:
+        conn = self._connect()
+        try:
+            items, revisions, checkpoints, logical, stored = conn.execute("""
+                SELECT COUNT(DISTINCT item_id), COUNT(*), COALESCE(SUM(checkpoint), 0),
+                       COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(data)), 0)
+                FROM revisions
+            """).fetchone()
+        finally:
+            conn.close()
+        return {
+            "items": items,
+            "revisions": revisions,
+            "checkpoints": checkpoints,
+            "logical_bytes": logical,
+            "stored_bytes": stored,
+        }
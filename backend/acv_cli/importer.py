@@ -0,0 +1,327 @@
+"""Bulk import of exported conversation logs as recorded sessions."""
+
+import hashlib
+import html
+import json
+import logging
+import os
+import re
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterator
+
+from pydantic import ValidationError
+
+from .db import Database
+from .jsonstream import JsonStream
+from .models import Session
+from .oplog import replaying
+from .sessions import SessionManager
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("auto", "claude", "gemini", "copilot", "acv")
+EXPORT_SUFFIXES = (".json", ".jsonl", ".ndjson")
+
+_BLOCK_TAG = re.compile(r"<(?:br|/p|/div|/li|/h[1-6]|/pre|/tr)\b[^>]*>", re.IGNORECASE)
+_TAG = re.compile(r"<[^>]+>")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def _html_to_text(markup: str) -> str:
+    text = _TAG.sub("", _BLOCK_TAG.sub("\n", markup))
+    return _BLANK_LINES.sub("\n\n", html.unescape(text)).strip()
+
+
+def _parse_time(value) -> datetime | None:
+    """ISO 8601 strings or Unix timestamps (seconds or milliseconds)."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        seconds = value / 1000 if value > 1e11 else value
+        return datetime.fromtimestamp(seconds, tz=timezone.utc)
+    if isinstance(value, str) and value:
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    return None
+
+
+def _message(role: str, content: str, timestamp: datetime) -> dict:
+    return {"role": role, "content": content, "timestamp": timestamp.isoformat()}
+
+
+def _make_session(
+    model: str,
+    source_id: str,
+    created: datetime | None,
+    messages: list[dict],
+    title: str | None = None,
+    model_variant: str | None = None,
+) -> dict | None:
+    if not messages or created is None:
+        return None
+    # Stable across re-exports of the same conversation, so an updated export
+    # replaces the earlier import instead of adding a copy.
+    digest = hashlib.blake2b(f"{model}:{source_id}".encode("utf-8"), digest_size=4).hexdigest()
+    if title:
+        messages.insert(0, _message("system", f"[AI Context Vault] Imported: {title}", created))
+    return {
+        "session_id": created.strftime("%Y-%m-%dT%H-%M-%S") + f"-{model}-{digest}",
+        "created_at": created.isoformat(),
+        "model_source": model,
+        "model_variant": model_variant,
+        "entry_point": "import",
+        "project": None,
+        "tags": [],
+        "messages": messages,
+        "summaries": {},
+    }
+
+
+def _from_claude(conversation: dict) -> dict | None:
+    """One conversation of a claude.ai ``conversations.json`` export."""
+    created = _parse_time(conversation.get("created_at"))
+    messages = []
+    for msg in conversation.get("chat_messages") or []:
+        text = msg.get("text") or "\n\n".join(
+            block.get("text", "") for block in msg.get("content") or [] if block.get("type") == "text"
+        )
+        if not text:
+            continue
+        role = "user" if msg.get("sender") == "human" else "assistant"
+        timestamp = _parse_time(msg.get("created_at")) or created
+        created = created or timestamp
+        messages.append(_message(role, text, timestamp))
+    source_id = conversation.get("uuid") or (messages[0]["content"] if messages else "")
+    return _make_session("claude", source_id, created, messages, title=conversation.get("name"))
+
+
+def _from_gemini(entry: dict) -> dict | None:
+    """One prompt of a Google Takeout "Gemini Apps" ``MyActivity.json`` export."""
+    title = entry.get("title") or ""
+    if not title.startswith("Prompted "):
+        return None
+    created = _parse_time(entry.get("time"))
+    prompt = title[len("Prompted "):]
+    response = "\n\n".join(
+        _html_to_text(item.get("html", "")) for item in entry.get("safeHtmlItem") or []
+    )
+    messages = [_message("user", prompt, created)] if created else []
+    if response and created:
+        messages.append(_message("assistant", response, created))
+    return _make_session("gemini", f"{entry.get('time')}:{prompt}", created, messages)
+
+
+def _from_copilot(export: dict) -> dict | None:
+    """A VS Code "Chat: Export Chat..." file (one Copilot chat)."""
+    requests = export.get("requests") or []
+    created = _parse_time(export.get("creationDate"))
+    messages = []
+    variant = None
+    for request in requests:
+        timestamp = _parse_time(request.get("timestamp")) or created
+        if timestamp is None:
+            continue
+        created = created or timestamp
+        variant = variant or request.get("modelId")
+        text = (request.get("message") or {}).get("text")
+        if text:
+            messages.append(_message("user", text, timestamp))
+        response = "".join(
+            part["value"] for part in request.get("response") or []
+            if isinstance(part, dict) and isinstance(part.get("value"), str)
+        )
+        if response:
+            messages.append(_message("assistant", response, timestamp))
+    source_id = export.get("sessionId") or (requests[0].get("requestId") if requests else None)
+    if not source_id and messages:
+        source_id = messages[0]["content"]
+    return _make_session("copilot", source_id or "", created, messages, model_variant=variant)
+
+
+def _from_acv(session: dict) -> dict | None:
+    """A session file of another vault; keeps its session ID."""
+    if not session.get("session_id") or not session.get("messages"):
+        return None
+    return {**session, "entry_point": "import"}
+
+
+_NORMALIZERS: dict[str, Callable[[dict], dict | None]] = {
+    "claude": _from_claude,
+    "gemini": _from_gemini,
+    "copilot": _from_copilot,
+    "acv": _from_acv,
+}
+
+
+def detect_format(record: dict) -> str | None:
+    if "chat_messages" in record:
+        return "claude"
+    if "requests" in record:
+        return "copilot"
+    if "session_id" in record and "messages" in record:
+        return "acv"
+    if "safeHtmlItem" in record or str(record.get("title", "")).startswith("Prompted "):
+        return "gemini"
+    return None
+
+
+def normalize(record, fmt: str = "auto") -> dict | None:
+    """Session dict for one exported conversation, or None if it is unusable."""
+    if not isinstance(record, dict):
+        return None
+    normalizer = _NORMALIZERS.get(detect_format(record) if fmt == "auto" else fmt)
+    if normalizer is None:
+        return None
+    try:
+        return normalizer(record)
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return None
+
+
+def iter_export(path: Path, fmt: str = "auto") -> Iterator[dict | None]:
+    """Normalized sessions of an export file, one conversation in memory at a time.
+
+    Handles a top-level array of conversations, a single conversation object
+    and newline-delimited conversations. Unusable records are yielded as None.
+    """
+    with open(path, encoding="utf-8") as f:
+        stream = JsonStream(f)
+        if stream.peek() == "[":
+            for record in stream.iter_items():
+                yield normalize(record, fmt)
+            return
+        while stream.peek():
+            yield normalize(stream.value(), fmt)
+
+
+def content_hash(session: dict) -> str:
+    encoded = json.dumps(session, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def file_hash(path: Path) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while chunk := f.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def iter_export_files(paths: list[Path]) -> Iterator[Path]:
+    for path in paths:
+        if path.is_dir():
+            yield from sorted(
+                p for p in path.rglob("*") if p.is_file() and p.suffix.lower() in EXPORT_SUFFIXES
+            )
+        else:
+            yield path
+
+
+_worker_session_mgr: SessionManager | None = None
+
+
+def _write_batch(sessions: list[dict]) -> list[dict | None]:
+    """Validate and save sessions (runs in a worker); returns their index rows."""
+    global _worker_session_mgr
+    if _worker_session_mgr is None:
+        _worker_session_mgr = SessionManager()
+    rows = []
+    for data in sessions:
+        try:
+            data = Session(**data).model_dump(mode="json")
+        except ValidationError as e:
+            logger.warning(f"Invalid session {data.get('session_id')}: {e}")
+            rows.append(None)
+            continue
+        # Logged by the parent with the batch's index rows (add_imported_sessions), in one commit.
+        with replaying():
+            _worker_session_mgr.save_session(data)
+        data.pop("messages")
+        rows.append(data)
+    return rows
+
+
+class SessionImporter:
+    """Stream export files into the vault.
+
+    The parent process parses and hashes conversations; batches that changed
+    since the last import are written to session files by a pool of worker
+    processes, and each finished batch is indexed in one database transaction.
+    Files and sessions whose content hash is already recorded are skipped, so
+    re-running an import only pays for reading the files.
+    """
+
+    def __init__(self, db: Database, workers: int = 0, batch_size: int = 200, force: bool = False):
+        self.db = db
+        self.workers = workers or min(os.cpu_count() or 1, 8)
+        self.batch_size = batch_size
+        self.force = force
+
+    def run(self, paths: list[Path], fmt: str = "auto") -> dict:
+        stats = {"files": 0, "files_unchanged": 0, "sessions": 0, "imported": 0, "unchanged": 0, "invalid": 0}
+        known = {} if self.force else self.db.import_hashes()
+        executor = ProcessPoolExecutor(self.workers) if self.workers > 1 else None
+        try:
+            for path in iter_export_files(paths):
+                self._import_file(path, fmt, executor, known, stats)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        return stats
+
+    def _import_file(self, path: Path, fmt: str, executor, known: dict, stats: dict) -> None:
+        stats["files"] += 1
+        digest = file_hash(path)
+        if not self.force and self.db.is_file_imported(digest):
+            stats["files_unchanged"] += 1
+            return
+
+        pending: deque[tuple[Future, list]] = deque()
+        batch: list[tuple[dict, str]] = []
+        count = 0
+        for session in iter_export(path, fmt):
+            stats["sessions"] += 1
+            if session is None:
+                stats["invalid"] += 1
+                continue
+            count += 1
+            session_hash = content_hash(session)
+            if known.get(session["session_id"]) == session_hash:
+                stats["unchanged"] += 1
+                continue
+            known[session["session_id"]] = session_hash
+            batch.append((session, session_hash))
+            if len(batch) >= self.batch_size:
+                pending.append(self._submit(executor, batch))
+                batch = []
+                # Bound the sessions held in flight.
+                while len(pending) > 2 * self.workers:
+                    self._commit(*pending.popleft(), str(path), stats)
+        if batch:
+            pending.append(self._submit(executor, batch))
+        while pending:
+            self._commit(*pending.popleft(), str(path), stats)
+        self.db.mark_file_imported(digest, str(path), count)
+
+    @staticmethod
+    def _submit(executor, batch: list[tuple[dict, str]]) -> tuple[Future, list]:
+        sessions = [session for session, _ in batch]
+        if executor is None:
+            future: Future = Future()
+            future.set_result(_write_batch(sessions))
+        else:
+            future = executor.submit(_write_batch, sessions)
+        return future, batch
+
+    def _commit(self, future: Future, batch: list[tuple[dict, str]], source: str, stats: dict) -> None:
+        rows = [
+            (row, digest, source)
+            for row, (_, digest) in zip(future.result(), batch)
+            if row is not None
+        ]
+        self.db.add_imported_sessions(rows)
+        stats["imported"] += len(rows)
+        stats["invalid"] += len(batch) - len(rows)
@@ -0,0 +1,115 @@
+"""Incremental JSON reading for large session files."""
+
+import json
+import re
+from typing import IO, Any, Iterator
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# What may still follow a number the scanner stopped short of the buffer edge ("12" of "12.5").
+_NUMBER_TAIL = re.compile(r"[0-9.eE+-]*\Z")
+_decoder = json.JSONDecoder()
+
+
+class JsonStream:
+    """Pull values out of a JSON document without loading the whole file.
+
+    Scalars and small containers are decoded with ``json``'s own scanner; only
+    arrays requested through ``stream_keys`` / ``iter_items`` are walked item
+    by item, so memory stays bounded by the largest single item.
+    """
+
+    def __init__(self, fp: IO[str], chunk_size: int = 1 << 16):
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Read the next chunk into the buffer; False at end of file."""
+        if self._eof:
+            return False
+        if self._pos:
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        # Grow reads with the pending buffer so one huge value stays linear.
+        data = self._fp.read(max(self._chunk_size, len(self._buf)))
+        if not data:
+            self._eof = True
+            return False
+        self._buf += data
+        return True
+
+    def _peek(self) -> str:
+        """Next non-whitespace character, or '' at end of file."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def peek(self) -> str:
+        """First character of the next value ('[', '{', ...), or '' at end of file."""
+        return self._peek()
+
+    def _expect(self, chars: str) -> str:
+        ch = self._peek()
+        if not ch or ch not in chars:
+            raise ValueError(f"Malformed JSON: expected one of {chars!r}, got {ch!r}")
+        self._pos += 1
+        return ch
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self._peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number cut by the buffer edge may continue in the next chunk.
+            if (
+                isinstance(value, (int, float))
+                and _NUMBER_TAIL.match(self._buf, end)
+                and self._fill()
+            ):
+                continue
+            self._pos = end
+            return value
+
+    def iter_items(self) -> Iterator[Any]:
+        """Yield the elements of the array at the current position."""
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self.value()
+            if self._expect(",]") == "]":
+                return
+
+    def iter_object(self, stream_keys: frozenset[str] = frozenset()) -> Iterator[tuple[str, Any]]:
+        """Yield ``(key, value)`` pairs of the object at the current position.
+
+        Array values under ``stream_keys`` are yielded as lazy item iterators;
+        anything the caller leaves unconsumed is skipped before the next key.
+        """
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            self._expect(":")
+            if key in stream_keys and self._peek() == "[":
+                items = self.iter_items()
+                yield key, items
+                for _ in items:
+                    pass
+            else:
+                yield key, self.value()
+            if self._expect(",}") == "}":
+                return
@@ -1,17 +1,31 @@
+import hashlib
 import json
+import os
 import re
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 import uuid
 
+from . import metrics
 from .config import get_config
 from .models import KnowledgeItem, Category, Confidence
+from .dedupe import minhash_signature
+from .history import ItemHistory
+from .oplog import KNOWLEDGE, get_oplog
 
 class KnowledgeManager:
-    def __init__(self):
+    def __init__(self, data_paths: dict[str, str] | None = None):
+        """``data_paths`` overrides ``[data_paths]``, to work on another vault (sync)."""
         self.config = get_config()
-        self.knowledge_dir = Path(self.config.data_paths["knowledge_dir"])
+        self.data_paths = data_paths or self.config.data_paths
+        self.knowledge_dir = Path(self.data_paths["knowledge_dir"])
+        base_dir = Path(self.data_paths.get("base_dir", "./data"))
+        self.history = ItemHistory(
+            Path(self.data_paths.get("history_path", base_dir / "history.db")),
+            checkpoint_every=self.config.history.get("checkpoint_every", 16),
+        )
         self._ensure_directories()
 
     def _ensure_directories(self) -> None:
@@ -23,6 +37,7 @@ class KnowledgeManager:
     def get_category_path(self, category: Category) -> Path:
         return self.knowledge_dir / category.value
 
+    @metrics.timed("knowledge", "create_knowledge_item")
     def create_knowledge_item(
         self,
         title: str,
@@ -49,6 +64,7 @@ class KnowledgeManager:
             confidence=confidence,
             generated_by_skill=generated_by_skill,
             summary=self._extract_summary(content),
+            minhash=minhash_signature(f"{title}\n{content}"),
         )
 
         # Save to markdown file
@@ -57,10 +73,71 @@ class KnowledgeManager:
         year_dir.mkdir(parents=True, exist_ok=True)
 
         md_path = year_dir / f"{item_id}.md"
-        self._save_markdown(item, content, md_path)
+        self.history.record(item_id, self._save_markdown(item, content, md_path), "create")
+        self._log(item_id)
+        return item, str(md_path)
+
+    @metrics.timed("knowledge", "update_knowledge_item")
+    def update_knowledge_item(
+        self,
+        item_id: str,
+        content: str | None = None,
+        title: str | None = None,
+        tags: list[str] | None = None,
+        confidence: Confidence | None = None,
+    ) -> tuple[KnowledgeItem | None, str | None]:
+        """Rewrite a knowledge item in place, keeping its previous revisions.
+
+        Fields left as None keep their current value. Hand edits made to the
+        file since its last revision are recorded first, so they stay in the
+        history too.
+        """
+        md_path = self.find_item_path(item_id)
+        if md_path is None:
+            return None, None
+        self.capture_edit(item_id, md_path)
+        item = self._parse_markdown(md_path)
+        if item is None:
+            return None, None
+        if content is None:
+            content = self.read_content(md_path)
+        item.title = title if title is not None else item.title
+        item.tags = tags if tags is not None else item.tags
+        item.confidence = confidence or item.confidence
+        item.summary = self._extract_summary(content)
+        item.minhash = minhash_signature(f"{item.title}\n{content}")
 
+        self.history.record(item_id, self._save_markdown(item, content, md_path), "update")
+        self._log(item_id)
         return item, str(md_path)
 
+    def capture_edit(self, item_id: str, md_path: Path | None = None) -> int | None:
+        """Record the item's file as a new revision if it changed since the last one."""
+        md_path = md_path or self.find_item_path(item_id)
+        if md_path is None:
+            return None
+        source = "edit" if self.history.versions(item_id) else "initial"
+        return self.history.record(item_id, md_path.read_text(encoding="utf-8"), source)
+
+    def capture_edits(self) -> int:
+        """Record a revision for every item edited by hand (or never recorded); returns how many."""
+        latest = self.history.latest_hashes()
+        captured = 0
+        for category in Category:
+            for md_file in self.get_category_path(category).glob("*/*.md"):
+                digest = hashlib.sha256(md_file.read_bytes()).hexdigest()
+                if latest.get(md_file.stem) == digest:
+                    continue
+                source = "edit" if md_file.stem in latest else "initial"
+                if self.history.record(md_file.stem, md_file.read_text(encoding="utf-8"), source):
+                    captured += 1
+        return captured
+
+    def _log(self, item_id: str) -> None:
+        logged = get_oplog(Path(self.data_paths.get("db_path", "./data/index.db"))).record(KNOWLEDGE, item_id)
+        if logged is not None:
+            logged.result()
+
     def _extract_summary(self, content: str, max_length: int = 200) -> str:
         """Extract a brief summary from content."""
         text = re.sub(r'[#*`\[\]]', '', content)
@@ -69,8 +146,8 @@ class KnowledgeManager:
             return text
         return text[:max_length].rstrip() + "..."
 
-    def _save_markdown(self, item: KnowledgeItem, content: str, path: Path) -> None:
-        """Save knowledge item with YAML frontmatter."""
+    def _save_markdown(self, item: KnowledgeItem, content: str, path: Path) -> str:
+        """Save knowledge item with YAML frontmatter; returns the written text."""
         frontmatter = [
             "---",
             f'id: "{item.id}"',
@@ -89,9 +166,13 @@ class KnowledgeManager:
         full_content = "\n".join(frontmatter) + "\n\n" + content
         with open(path, "w", encoding="utf-8") as f:
             f.write(full_content)
+            if metrics.is_enabled():
+                metrics.observe_bytes("knowledge", "save_markdown", f.tell(), "written")
+        return full_content
 
-    def load_knowledge_item(self, item_id: str) -> tuple[KnowledgeItem | None, str | None]:
-        """Load knowledge item by ID."""
+    @metrics.timed("knowledge", "find_item_path")
+    def find_item_path(self, item_id: str) -> Path | None:
+        """Locate the markdown file of a knowledge item without parsing it."""
         for category in Category:
             category_path = self.get_category_path(category)
             for year_dir in category_path.iterdir():
@@ -99,13 +180,52 @@ class KnowledgeManager:
                     continue
                 md_path = year_dir / f"{item_id}.md"
                 if md_path.exists():
-                    return self._parse_markdown(md_path), str(md_path)
-        return None, None
+                    return md_path
+        return None
+
+    @metrics.timed("knowledge", "load_knowledge_item")
+    def load_knowledge_item(self, item_id: str) -> tuple[KnowledgeItem | None, str | None]:
+        """Load knowledge item by ID."""
+        md_path = self.find_item_path(item_id)
+        if md_path is None:
+            return None, None
+        return self._parse_markdown(md_path), str(md_path)
+
+    def listing_fingerprint(self, category: Category | None = None) -> tuple[int, int, int]:
+        """``(file count, newest mtime_ns, total size)`` of the listed markdown files."""
+        count = newest = total = 0
+        categories = [category] if category else list(Category)
+        for cat in categories:
+            category_path = self.get_category_path(cat)
+            if not category_path.is_dir():
+                continue
+            for year_dir in os.scandir(category_path):
+                if not year_dir.is_dir():
+                    continue
+                for entry in os.scandir(year_dir.path):
+                    if entry.name.endswith(".md"):
+                        st = entry.stat()
+                        count += 1
+                        newest = max(newest, st.st_mtime_ns)
+                        total += st.st_size
+        return count, newest, total
+
+    def read_content(self, path: str | Path) -> str:
+        """Return the markdown body of a knowledge item, without frontmatter."""
+        with open(path, encoding="utf-8") as f:
+            content = f.read()
+        parts = content.split("---\n")
+        if len(parts) < 3:
+            return content
+        return "---\n".join(parts[2:]).strip()
 
+    @metrics.timed("knowledge", "parse_markdown")
     def _parse_markdown(self, path: Path) -> KnowledgeItem | None:
         """Parse markdown file with frontmatter."""
         with open(path, encoding="utf-8") as f:
             content = f.read()
+            if metrics.is_enabled():
+                metrics.observe_bytes("knowledge", "parse_markdown", f.tell(), "read")
 
         parts = content.split("---\n")
         if len(parts) < 3:
@@ -140,49 +260,40 @@ class KnowledgeManager:
             summary=data.get("summary"),
         )
 
-    def list_knowledge_items(
-        self,
-        category: Category | None = None,
-        limit: int = 50,
-    ) -> list[dict]:
-        """List knowledge items."""
-        items = []
-        
+    def iter_knowledge_items(
+        self, category: Category | None = None, after: tuple[str, str, str] | None = None
+    ) -> Iterator[dict]:
+        """Yield knowledge item listings, newest first within each category.
+
+        ``after`` is the ``(category, year, id)`` of the last item already seen;
+        directories and files that sort before it are skipped unread.
+        """
         if category:
             # 特定 category：直接遍历年份目录
-            search_dir = self.knowledge_dir / category.value
-            if not search_dir.exists():
-                return []
-            
-            for year_dir in sorted(search_dir.iterdir(), reverse=True):
-                if not year_dir.is_dir():
-                    continue
-                for md_file in sorted(year_dir.glob("*.md"), reverse=True):
-                    item = self._parse_markdown(md_file)
-                    if item:
-                        items.append({
-                            "id": item.id,
-                            "title": item.title,
-                            "date": item.date.isoformat(),
-                            "category": item.category.value,
-                            "tags": item.tags,
-                            "summary": item.summary,
-                            "confidence": item.confidence.value,
-                        })
-                    if len(items) >= limit:
-                        return items
+            category_dirs = [self.knowledge_dir / category.value]
         else:
             # 所有 category：遍历所有子目录下的年份目录
-            for category_dir in sorted(self.knowledge_dir.iterdir(), reverse=True):
+            category_dirs = sorted(self.knowledge_dir.iterdir(), reverse=True)
+
+        scanned = 0
+        try:
+            for category_dir in category_dirs:
                 if not category_dir.is_dir():
                     continue
+                if after and category_dir.name > after[0]:
+                    continue
                 for year_dir in sorted(category_dir.iterdir(), reverse=True):
                     if not year_dir.is_dir():
                         continue
+                    if after and (category_dir.name, year_dir.name) > after[:2]:
+                        continue
                     for md_file in sorted(year_dir.glob("*.md"), reverse=True):
+                        if after and (category_dir.name, year_dir.name, md_file.stem) >= after:
+                            continue
+                        scanned += 1
                         item = self._parse_markdown(md_file)
                         if item:
-                            items.append({
+                            yield {
                                 "id": item.id,
                                 "title": item.title,
                                 "date": item.date.isoformat(),
@@ -190,8 +301,24 @@ class KnowledgeManager:
                                 "tags": item.tags,
                                 "summary": item.summary,
                                 "confidence": item.confidence.value,
-                            })
-                        if len(items) >= limit:
-                            return items
+                            }
+        finally:
+            metrics.observe_items("knowledge", "iter_knowledge_items", scanned, "files")
+
+    def iter_items(self) -> Iterator[tuple[KnowledgeItem, str]]:
+        """Yield every knowledge item with its markdown path, parsed from disk."""
+        for category in Category:
+            for md_file in sorted(self.get_category_path(category).glob("*/*.md")):
+                item = self._parse_markdown(md_file)
+                if item:
+                    yield item, str(md_file)
 
-        return items[:limit]
+    @metrics.timed("knowledge", "list_knowledge_items")
+    def list_knowledge_items(
+        self,
+        category: Category | None = None,
+        limit: int = 50,
+        after: tuple[str, str, str] | None = None,
+    ) -> list[dict]:
+        """List knowledge items, starting after the ``(category, year, id)`` key if given."""
+        return list(islice(self.iter_knowledge_items(category, after), limit))
@@ -0,0 +1,95 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from .config import get_config
+
+
+def get_live_dir() -> Path:
+    config = get_config()
+    return Path(config.data_paths.get("base_dir", "./data")) / "live"
+
+
+def live_log_path(session_id: str, live_dir: Path | None = None) -> Path:
+    return (live_dir or get_live_dir()) / f"{session_id}.ndjson"
+
+
+class LiveLogPublisher:
+    """Append a recording session's messages to a shared NDJSON event log.
+
+    Messages are buffered and written one batch per line, either when
+    ``max_batch`` messages are pending or ``flush_interval`` seconds after the
+    first pending message, so viewers see output promptly without a write per
+    line. The API tails these logs to serve ``/api/sessions/{id}/live``.
+    While the session is quiet the log's mtime is bumped every ``keepalive``
+    seconds; a log left untouched longer than the API's idle timeout belongs
+    to a recorder that died without writing its end marker.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        live_dir: Path | None = None,
+        flush_interval: float = 0.2,
+        max_batch: int = 100,
+        keepalive: float = 15.0,
+    ):
+        self.session_id = session_id
+        self.path = live_log_path(session_id, live_dir)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.keepalive = keepalive
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._pending: list[dict] = []
+        self._written_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flusher.start()
+
+    def publish(self, message: dict) -> None:
+        with self._lock:
+            if self._closed.is_set():
+                return
+            self._pending.append(message)
+            if len(self._pending) >= self.max_batch:
+                self._write_batch()
+
+    def _write_batch(self) -> None:
+        if not self._pending:
+            return
+        event = {"type": "messages", "session_id": self.session_id, "messages": self._pending}
+        self._file.write(json.dumps(event, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self._pending = []
+        self._written_at = time.monotonic()
+
+    def _flush_loop(self) -> None:
+        while not self._closed.wait(self.flush_interval):
+            with self._lock:
+                if self._closed.is_set():
+                    return
+                self._write_batch()
+                if time.monotonic() - self._written_at >= self.keepalive:
+                    os.utime(self.path)
+                    self._written_at = time.monotonic()
+
+    def close(self, remove: bool = True) -> None:
+        """Flush, write the end marker and (by default) unlink the log.
+
+        Tailers that already opened the log keep reading it after the unlink.
+        """
+        with self._lock:
+            if self._closed.is_set():
+                return
+            self._closed.set()
+            self._write_batch()
+            end = {"type": "session_end", "session_id": self.session_id, "ended_at": time.time()}
+            self._file.write(json.dumps(end) + "\n")
+            self._file.close()
+        self._flusher.join()
+        if remove:
+            self.path.unlink(missing_ok=True)
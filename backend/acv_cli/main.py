@@ -13,6 +13,7 @@ from .sessions import SessionManager
 from .knowledge import KnowledgeManager
 from .skills import SkillManager
 from .db import Database
+from .live import LiveLogPublisher
 
 app = typer.Typer(
     name="acv",
@@ -34,13 +35,42 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Live event logs of the sessions being recorded by this process
+_live_publishers: dict[str, LiveLogPublisher] = {}
+
+
+def _publish_live(session_id: str, message: dict) -> None:
+    publisher = _live_publishers.get(session_id)
+    if publisher is None:
+        live = config.live
+        publisher = LiveLogPublisher(
+            session_id,
+            flush_interval=live.get("flush_interval", 0.2),
+            max_batch=live.get("max_batch", 100),
+            # Keep the log fresh well within the API's idle timeout.
+            keepalive=live.get("idle_timeout", 60) / 4,
+        )
+        _live_publishers[session_id] = publisher
+    publisher.publish(message)
+
+
+def _close_live_publishers() -> None:
+    """End the live logs of sessions the recorder left without a ``session_end``."""
+    while _live_publishers:
+        _, publisher = _live_publishers.popitem()
+        publisher.close()
+
 
 def _on_message(msg: dict) -> None:
     """Callback for subprocess messages."""
     if msg["type"] == "message":
-        # Messages are already printed by subprocess_wrap
-        pass
+        # Messages are already printed by subprocess_wrap; forward them to live viewers
+        if config.live.get("enabled", True):
+            _publish_live(msg["session_id"], msg["message"])
     elif msg["type"] == "session_end":
+        publisher = _live_publishers.pop(msg["session_id"], None)
+        if publisher:
+            publisher.close()
         # Save session
         session_data = msg["data"]
         path = session_mgr.save_session(session_data)
@@ -96,33 +126,69 @@ def run(
         )
     except KeyboardInterrupt:
         typer.echo("\n⚠️  Session interrupted")
+    finally:
+        _close_live_publishers()
+
+
+def _decode_after(after: Optional[str], size: int) -> Optional[tuple[str, ...]]:
+    from .pagination import decode_cursor
+
+    if not after:
+        return None
+    try:
+        return decode_cursor(after, size)
+    except ValueError as e:
+        typer.echo(f"❌ {e}")
+        raise typer.Exit(1)
+
+
+def _echo_next_page(items: list, limit: int, key) -> None:
+    from .pagination import next_cursor
+
+    cursor = next_cursor(items, limit, key)
+    if cursor:
+        typer.echo(f"➡️  Next page: --after {cursor}")
+
+
+AFTER_HELP = "Continue after the cursor printed by the previous page"
 
 
 @app.command()
 def sessions(
     limit: int = typer.Option(20, "-l", "--limit"),
     model: Optional[str] = typer.Option(None, "-m", "--model", help="Filter by model"),
+    after: Optional[str] = typer.Option(None, "--after", help=AFTER_HELP),
+    archived: bool = typer.Option(False, "-a", "--archived", help="Continue into archived sessions"),
 ):
     """List recent sessions."""
+    from .pagination import session_key
+
+    after_key = _decode_after(after, 1)
     typer.echo(f"📜 Recent sessions (limit: {limit})")
     typer.echo("-" * 60)
 
-    sessions = session_mgr.list_sessions(limit=limit, model_source=model)
+    sessions = session_mgr.list_sessions(
+        limit=limit, model_source=model, after=after_key[0] if after_key else None, include_archived=archived
+    )
     for s in sessions:
         date = s["created_at"][:16].replace("T", " ")
         tags = f" [{', '.join(s['tags'])}]" if s['tags'] else ""
-        typer.e(f"{date} | {s['model_source']:8} | {s['session_id']}")
+        typer.echo(f"{date} | {s['model_source']:8} | {s['session_id']}", nl=False)
         if s.get("project"):
-            typer.e(f" (@{s['project']})")
-        typer.e(f"{tags}\n")
+            typer.echo(f" (@{s['project']})", nl=False)
+        typer.echo(f"{tags}\n")
+    _echo_next_page(sessions, limit, session_key)
 
 
 @app.command()
 def session(
     session_id: str = typer.Argument(..., help="Session ID"),
+    offset: int = typer.Option(0, "-o", "--offset", min=0, help="First message to show"),
+    limit: int = typer.Option(0, "-l", "--limit", min=0, help="Number of messages to show"),
 ):
-    """Show session details."""
-    session_data = session_mgr.load_session(session_id)
+    """Show session details, and a page of its messages with --limit."""
+    # Only the requested page is decoded, so this stays cheap on huge sessions.
+    session_data = session_mgr.load_session_range(session_id, offset=offset, limit=limit)
     if not session_data:
         typer.echo(f"❌ Session not found: {session_id}")
         raise typer.Exit(1)
@@ -132,7 +198,7 @@ def session(
     typer.echo(f"Date: {session_data['created_at']}")
     if session_data.get("project"):
         typer.echo(f"Project: {session_data['project']}")
-    typer.echo(f"Messages: {len(session_data.get('messages', []))}")
+    typer.echo(f"Messages: {session_data['message_count']}")
     
     # Show summary if available
     summaries = session_data.get("summaries", {})
@@ -140,11 +206,24 @@ def session(
         typer.echo("\n📝 Summary:")
         typer.echo(summaries["short"])
 
+    messages = session_data["messages"]
+    if messages:
+        typer.echo("")
+        typer.echo("-" * 60)
+        for i, msg in enumerate(messages, start=offset):
+            timestamp = (msg.get("timestamp") or "")[:19].replace("T", " ")
+            typer.echo(f"[{i}] {msg.get('role', '?')} {timestamp}")
+            typer.echo(f"{msg.get('content', '')}\n")
+        end = offset + len(messages)
+        if end < session_data["message_count"]:
+            typer.echo(f"➡️  Next page: --offset {end} --limit {limit}")
+
 
 @app.command()
 def summarize(
     session_id: str = typer.Argument(..., help="Session ID"),
     skill: Optional[str] = typer.Option(None, "-s", "--skill", help="Skill to use"),
+    mode: Optional[str] = typer.Option(None, "-m", "--mode", help="Summary mode (heuristic, extractive)"),
 ):
     """Summarize a session and extract knowledge candidates."""
     session_data = session_mgr.load_session(session_id)
@@ -152,15 +231,27 @@ def summarize(
         typer.echo(f"❌ Session not found: {session_id}")
         raise typer.Exit(1)
 
-    typer.echo(f"📊 Summarizing session: {session_id}")
-    
-    # This would call a skill or LLM to summarize
-    # For now, just show the structure
-    typer.echo("   (Summarization skill not yet implemented)")
-    
+    skill_id = skill or "summarize-session"
+    typer.echo(f"📊 Summarizing session: {session_id} (skill: {skill_id})")
+
+    params = {"mode": mode} if mode else {}
+    outcome = skill_mgr.run_skill(skill_id, session_data, **params)
+    if "error" in outcome:
+        typer.echo(f"❌ {outcome['error']}")
+        raise typer.Exit(1)
+
+    summaries = outcome["result"]
+    session_data["summaries"] = summaries
+    if isinstance(summaries, dict):
+        if summaries.get("short"):
+            typer.echo(f"   {summaries['short']}")
+        candidates = summaries.get("knowledge_candidates") or []
+        typer.echo(f"   {len(summaries.get('action_items') or [])} action items, {len(candidates)} knowledge candidates")
+
     # Save updated session
     session_mgr.save_session(session_data)
     db.add_session(session_data)
+    typer.echo("✅ Summary saved")
 
 
 @app.command()
@@ -193,10 +284,14 @@ def promote(
 @app.command()
 def knowledge(
     category: Optional[str] = typer.Option(None, "-c", "--category", help="Filter by category"),
+    model: Optional[str] = typer.Option(None, "-m", "--model", help="Only items derived from this model"),
+    session_id: Optional[str] = typer.Option(None, "-s", "--session", help="Only items derived from this session"),
     limit: int = typer.Option(20, "-l", "--limit"),
+    after: Optional[str] = typer.Option(None, "--after", help=AFTER_HELP),
 ):
     """List knowledge items."""
     from .models import Category as KCategory
+    from .pagination import knowledge_key, search_key
 
     cat = None
     if category:
@@ -205,15 +300,34 @@ def knowledge(
         except ValueError:
             typer.echo(f"❌ Invalid category: {category}")
             raise typer.Exit(1)
+    if model and session_id:
+        typer.echo("❌ Use either --model or --session")
+        raise typer.Exit(1)
 
+    if model or session_id:
+        # Provenance lookups come from the index, newest first like search results
+        kind, source = ("model", model) if model else ("session", session_id)
+        after_key = _decode_after(after, 2)
+        typer.echo(f"📚 Knowledge items from {kind} {source} (limit: {limit})")
+        typer.echo("-" * 60)
+        results = db.items_from_source(kind, source, limit=limit, category=cat, after=after_key)
+        for r in results:
+            tags = json.loads(r["tags"] or "[]")
+            tag_str = f" [{', '.join(tags)}]" if tags else ""
+            typer.echo(f"{r['date'][:10]} | {r['category']:15} | {r['title'][:40]}{tag_str}\n")
+        _echo_next_page(results, limit, search_key)
+        return
+
+    after_key = _decode_after(after, 3)
     typer.echo(f"📚 Knowledge items (limit: {limit})")
     typer.echo("-" * 60)
 
-    items = knowledge_mgr.list_knowledge_items(category=cat, limit=limit)
+    items = knowledge_mgr.list_knowledge_items(category=cat, limit=limit, after=after_key)
     for item in items:
         date = item["date"][:10]
         tags = f" [{', '.join(item['tags'])}]" if item['tags'] else ""
         typer.echo(f"{date} | {item['category']:15} | {item['title'][:40]}{tags}\n")
+    _echo_next_page(items, limit, knowledge_key)
 
 
 @app.command()
@@ -221,9 +335,11 @@ def search(
     query: str = typer.Argument(..., help="Search query"),
     limit: int = typer.Option(20, "-l", "--limit"),
     category: Optional[str] = typer.Option(None, "-c", "--category", help="Filter by category"),
+    after: Optional[str] = typer.Option(None, "--after", help=AFTER_HELP),
 ):
     """Search knowledge base."""
     from .models import Category
+    from .pagination import search_key
 
     cat = None
     if category:
@@ -233,15 +349,324 @@ def search(
             typer.echo(f"❌ Invalid category: {category}")
             raise typer.Exit(1)
 
+    after_key = _decode_after(after, 2)
     typer.echo(f"🔍 Searching: {query}")
     typer.echo("-" * 60)
 
-    results = db.search(query, limit=limit, category=cat)
+    results = db.search(query, limit=limit, category=cat, after=after_key)
     for r in results:
         date = r["date"][:10]
         tags = json.loads(r["tags"] or "[]")
         tag_str = f" [{', '.join(tags)}]" if tags else ""
         typer.echo(f"{date} | {r['category']:15} | {r['title']}{tag_str}\n")
+    _echo_next_page(results, limit, search_key)
+
+
+@app.command()
+def dedupe(
+    threshold: float = typer.Option(0.8, "--threshold", help="Minimum estimated similarity"),
+    rebuild: bool = typer.Option(
+        False, "--rebuild", help="Compute missing MinHash signatures from the markdown files"
+    ),
+):
+    """Report clusters of near-duplicate knowledge items."""
+    from .dedupe import minhash_signature
+
+    if rebuild:
+        missing = db.knowledge_items_without_minhash()
+        for row in missing:
+            if not Path(row["path"]).exists():
+                continue
+            content = knowledge_mgr.read_content(row["path"])
+            db.set_minhash(row["id"], minhash_signature(f"{row['title']}\n{content}"))
+        typer.echo(f"🔁 Signatures rebuilt: {len(missing)}")
+
+    clusters = db.near_duplicate_clusters(threshold=threshold)
+    typer.echo(f"🧬 Near-duplicate clusters (threshold: {threshold}): {len(clusters)}")
+    typer.echo("-" * 60)
+
+    for n, cluster in enumerate(clusters, 1):
+        typer.echo(f"#{n} ({len(cluster['items'])} items)")
+        for item in cluster["items"]:
+            typer.echo(f"  • {item['similarity']:.2f} | {item['id']} | {item['title'][:40]}")
+
+
+@app.command()
+def reindex():
+    """Rebuild the session/model provenance links of knowledge items from their markdown files."""
+    items = [item for item, _ in knowledge_mgr.iter_items()]
+    db.set_item_sources(items)
+    links = sum(len(item.source_sessions) + len(item.model_sources) for item in items)
+    typer.echo(f"🔁 Provenance reindexed: {len(items)} items, {links} links")
+    captured = knowledge_mgr.capture_edits()
+    if captured:
+        typer.echo(f"🕘 Recorded {captured} edited items in their history")
+
+
+@app.command()
+def history(
+    item_id: str = typer.Argument(..., help="Knowledge item ID"),
+    version: Optional[int] = typer.Option(None, "-v", "--version", help="Print this version of the item"),
+):
+    """Show the revisions of a knowledge item, or print one of them."""
+    knowledge_mgr.capture_edit(item_id)
+    if version is not None:
+        text = knowledge_mgr.history.get(item_id, version)
+        if text is None:
+            typer.echo(f"❌ Version {version} of {item_id} not found")
+            raise typer.Exit(1)
+        typer.echo(text)
+        return
+
+    versions = knowledge_mgr.history.versions(item_id)
+    if not versions:
+        typer.echo(f"❌ Knowledge item not found: {item_id}")
+        raise typer.Exit(1)
+    typer.echo(f"🕘 History of {item_id} ({len(versions)} versions)")
+    typer.echo("-" * 60)
+    for v in versions:
+        kind = "full" if v["checkpoint"] else "delta"
+        typer.echo(
+            f"v{v['version']:<4} {v['created_at'][:19]} | {v['source']:7} | "
+            f"{v['size']:>7} bytes, stored {v['stored']:>6} ({kind})"
+        )
+
+
+@app.command()
+def related(
+    item_id: Optional[str] = typer.Argument(None, help="Knowledge item ID"),
+    limit: int = typer.Option(10, "-l", "--limit"),
+    rebuild: bool = typer.Option(False, "--rebuild", help="Recompute the whole graph"),
+):
+    """Update the related-items graph and show the items related to a knowledge item."""
+    from .related import RelatedGraph
+
+    graph = RelatedGraph.from_settings(db, config.related)
+    result = graph.rebuild() if rebuild else graph.update()
+    if result["mode"] != "none":
+        typer.echo(f"🕸️  Related graph {result['mode']}: {result['items']} items in {result['seconds']:.2f}s")
+    if not item_id:
+        return
+
+    rows = db.related_items(item_id, limit)
+    typer.echo(f"🔗 Related to {item_id}")
+    typer.echo("-" * 60)
+    for r in rows:
+        typer.echo(f"{r['score']:.2f} | {r['category']:15} | {r['title'][:40]}")
+
+
+@app.command("import")
+def import_(
+    paths: list[Path] = typer.Argument(..., help="Export files or directories of exports"),
+    fmt: str = typer.Option("auto", "-f", "--format", help="auto, claude, gemini, copilot or acv"),
+    workers: int = typer.Option(0, "-w", "--workers", help="Writer processes (0 = one per CPU)"),
+    batch_size: int = typer.Option(200, "--batch-size", help="Sessions per transaction"),
+    force: bool = typer.Option(False, "--force", help="Re-import files and sessions seen before"),
+):
+    """Import exported Claude, Gemini or Copilot conversations as sessions."""
+    from .importer import FORMATS, SessionImporter
+
+    if fmt not in FORMATS:
+        typer.echo(f"❌ Unknown format: {fmt} (choose from {', '.join(FORMATS)})")
+        raise typer.Exit(1)
+    missing = [str(p) for p in paths if not p.exists()]
+    if missing:
+        typer.echo(f"❌ Not found: {', '.join(missing)}")
+        raise typer.Exit(1)
+
+    importer = SessionImporter(db, workers=workers, batch_size=batch_size, force=force)
+    stats = importer.run(paths, fmt=fmt)
+
+    typer.echo(f"📥 Files: {stats['files']} ({stats['files_unchanged']} unchanged)")
+    typer.echo(f"   Sessions imported: {stats['imported']}")
+    typer.echo(f"   Sessions unchanged: {stats['unchanged']}")
+    if stats["invalid"]:
+        typer.echo(f"   ⚠️  Skipped (unrecognized or invalid): {stats['invalid']}")
+
+
+@app.command()
+def blobs(
+    gc: bool = typer.Option(False, "--gc", help="Delete blobs no session refers to"),
+    grace: float = typer.Option(3600, "--grace", help="Keep unreferenced blobs newer than this (seconds)"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Report what --gc would delete"),
+):
+    """Show blob store deduplication stats, or garbage-collect unused blobs."""
+    store = session_mgr.blobs
+    if gc:
+        result = store.gc(
+            session_mgr.sessions_dir, grace_seconds=grace, dry_run=dry_run, archived=session_mgr.archive.iter_json()
+        )
+        verb = "Would remove" if dry_run else "Removed"
+        typer.echo(f"🧹 {verb} {result['removed']} blobs ({result['freed_bytes'] / 1024:.1f} KB)")
+        return
+
+    stats = store.stats(session_mgr.sessions_dir, archived=session_mgr.archive.iter_json())
+    status = "enabled" if session_mgr.blob_min_size is not None else "disabled"
+    typer.echo(f"🗃️  Blob store ({status}): {store.root}")
+    typer.echo("-" * 60)
+    typer.echo(
+        f"  Blobs: {stats['blobs']} ({stats['unreferenced']} unreferenced, "
+        f"{stats['unreferenced_bytes'] / 1024:.1f} KB)"
+    )
+    typer.echo(f"  References: {stats['references']}")
+    typer.echo(f"  Stored: {stats['stored_bytes'] / 1024:.1f} KB")
+    typer.echo(f"  Referenced content: {stats['logical_bytes'] / 1024:.1f} KB")
+    typer.echo(f"  Saved: {stats['saved_bytes'] / 1024:.1f} KB (dedup ratio {stats['dedup_ratio']:.2f}x)")
+    if stats["missing"]:
+        typer.echo(f"  ⚠️  Missing blobs: {stats['missing']}")
+
+
+@app.command()
+def archive(
+    older_than: Optional[float] = typer.Option(
+        None, "--older-than", help="Archive sessions older than this many days (default: [retention])"
+    ),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Report what would be archived"),
+):
+    """Move old sessions into per-month archives (still loadable, left out of listings)."""
+    days = older_than if older_than is not None else config.retention.get("archive_after_days", 90)
+    if not days or days <= 0:
+        typer.echo("Archiving is disabled (the retention period must be a positive number of days)")
+        return
+    result = session_mgr.archive_sessions(days, dry_run=dry_run)
+    verb = "Would archive" if dry_run else "Archived"
+    typer.echo(
+        f"🧊 {verb} {result['sessions']} sessions from before {result['cutoff']} "
+        f"({result['bytes'] / 1024:.1f} KB) into {result['months']} monthly archives"
+    )
+    stats = session_mgr.archive.stats()
+    typer.echo(
+        f"   Archive: {stats['sessions']} sessions in {stats['archives']} files "
+        f"({stats['bytes'] / 1024:.1f} KB) at {session_mgr.archive.root}"
+    )
+
+
+@app.command()
+def export(
+    format_: Optional[str] = typer.Option(
+        None, "-f", "--format", help="parquet, arrow or csv (default: [analytics])"
+    ),
+    out: Optional[Path] = typer.Option(None, "-o", "--out", help="Output directory (default: [analytics].dir)"),
+    chunk_rows: Optional[int] = typer.Option(None, "--chunk-rows", help="Rows per written batch"),
+):
+    """Export sessions, messages and knowledge items as columnar tables for analytics."""
+    from . import analytics
+
+    settings = config.analytics
+    fmt = format_ or settings.get("format", "parquet")
+    out_dir = out or Path(settings.get("dir", "./data/analytics"))
+    try:
+        manifest = analytics.export(
+            out_dir, fmt, session_mgr, db, chunk_rows=chunk_rows or settings.get("chunk_rows", 50000)
+        )
+    except analytics.ExportError as e:
+        typer.echo(f"❌ {e}")
+        raise typer.Exit(1)
+    if manifest["format"] != fmt:
+        typer.echo(f"⚠️  pyarrow is not installed, wrote CSV instead of {fmt}")
+    typer.echo(f"📦 Exported to {out_dir} ({manifest['format']}) in {manifest['seconds']:.1f}s")
+    for name, table in manifest["tables"].items():
+        typer.echo(f"   {name:16} {table['rows']:>9} rows  {table['bytes'] / 1024:>9.1f} KB  {table['file']}")
+
+
+@app.command()
+def sync(
+    path: Path = typer.Argument(..., help="Other vault: its root (with config.toml) or its data directory"),
+    batch: Optional[int] = typer.Option(None, "--batch", help="Ops per transaction (default: [sync])"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Only count the ops each side is missing"),
+):
+    """Exchange changes with another vault through the op logs (two-way, last writer wins)."""
+    from .sync import Vault, sync as sync_vaults
+
+    if not path.exists():
+        typer.echo(f"📁 New vault at {path}")
+    local = Vault(config.data_paths)
+    remote = Vault.open(path)
+    try:
+        result = sync_vaults(local, remote, batch or config.sync.get("batch", 500), dry_run=dry_run)
+    except ValueError as e:
+        typer.echo(f"❌ {e}")
+        raise typer.Exit(1)
+
+    for direction, label in (("pulled", "⬇️  Pulled"), ("pushed", "⬆️  Pushed")):
+        r = result[direction]
+        if dry_run:
+            typer.echo(f"{label} would transfer {r['ops']} ops")
+        else:
+            typer.echo(
+                f"{label} {r['ops']} ops: {r['sessions']} sessions, {r['items']} knowledge items, {r['blobs']} blobs"
+            )
+    logged = result["logged"]
+    if logged["local"] or logged["remote"]:
+        typer.echo(f"   Logged existing entries: {logged['local']} here, {logged['remote']} in {path}")
+
+
+@app.command()
+def snapshot(
+    list_: bool = typer.Option(False, "--list", help="List snapshots"),
+    verify: Optional[str] = typer.Option(None, "--verify", help="Check a snapshot's stored contents"),
+    restore: Optional[str] = typer.Option(None, "--restore", help="Restore a snapshot"),
+    to: Optional[Path] = typer.Option(None, "--to", help="Restore into this directory instead of the vault"),
+    prune: Optional[int] = typer.Option(None, "--prune", help="Keep only the newest N snapshots"),
+):
+    """Take a consistent, incremental snapshot of the vault (or list, verify, restore, prune)."""
+    from .snapshot import SnapshotError, SnapshotStore
+
+    settings = config.snapshot
+    store = SnapshotStore(
+        Path(settings.get("dir", "./snapshots")),
+        Path(config.data_paths.get("base_dir", "./data")),
+        db_path=Path(config.data_paths["db_path"]),
+        workers=settings.get("workers", 4),
+    )
+    try:
+        if list_:
+            typer.echo(f"📸 Snapshots in {store.root}")
+            typer.echo("-" * 60)
+            for s in store.snapshots():
+                typer.echo(f"{s['id']} | {s['files_count']:6} files | {s['bytes'] / 1024 / 1024:8.1f} MB")
+            return
+        if verify:
+            bad = store.verify(verify)
+            for rel in bad:
+                typer.echo(f"  ❌ {rel}")
+            if bad:
+                typer.echo(f"❌ {len(bad)} files missing or corrupt in {verify}")
+                raise typer.Exit(1)
+            typer.echo(f"✅ Snapshot {verify} verified")
+            return
+        if restore:
+            if to is None:
+                typer.echo("⚠️  Stop the API and other acv processes before restoring over the vault.")
+                typer.confirm(f"Replace {store.data_dir} with snapshot {restore}?", abort=True)
+            result = store.restore(restore, to)
+            typer.echo(
+                f"♻️  Restored {result['files']} files ({result['bytes'] / 1024 / 1024:.1f} MB) "
+                f"into {result['target']} in {result['seconds']:.2f}s, all verified"
+            )
+            if result["previous"]:
+                typer.echo(f"   Previous contents moved to {result['previous']}")
+            return
+        if prune is None:
+            result = store.create()
+            typer.echo(
+                f"📸 Snapshot {result['id']}: {result['files_count']} files "
+                f"({result['bytes'] / 1024 / 1024:.1f} MB) in {result['seconds']:.2f}s"
+            )
+            typer.echo(
+                f"   Read {result['hashed']} changed files, stored {result['stored']} new "
+                f"({result['stored_bytes'] / 1024:.1f} KB)"
+            )
+        keep = prune if prune is not None else settings.get("keep", 0)
+        if keep:
+            pruned = store.prune(keep)
+            typer.echo(
+                f"🧹 Pruned {pruned['snapshots']} snapshots, {pruned['objects']} objects "
+                f"({pruned['freed_bytes'] / 1024:.1f} KB)"
+            )
+    except SnapshotError as e:
+        typer.echo(f"❌ {e}")
+        raise typer.Exit(1)
 
 
 @app.command()
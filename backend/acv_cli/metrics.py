@@ -0,0 +1,209 @@
+"""In-process metrics in the Prometheus text exposition format.
+
+Hot paths report latency, rows/files scanned and bytes moved per operation.
+Recording is off until ``enable()`` is called (the API does so at startup
+when ``[metrics] enabled``); while off, every hook returns after a single
+flag check. Metrics are per process: with several API workers, each worker
+exports its own series.
+"""
+
+import functools
+import inspect
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Iterable
+
+LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (1, 5, 10, 50, 100, 500, 1_000, 5_000, 10_000, 50_000, 100_000)
+BYTE_BUCKETS = tuple(1024 * 4 ** i for i in range(10))  # 1 KiB .. 256 MiB
+
+_enabled = False
+
+
+def enable(flag: bool = True) -> None:
+    global _enabled
+    _enabled = flag
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def _format_labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, *labels) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def collect(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # labels -> [per-bucket counts (last one is +Inf), sum]
+        self._series: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def collect(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            snapshot = sorted((labels, list(counts), total) for labels, (counts, total) in self._series.items())
+        for labels, counts, total in snapshot:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                le = _format_labels(self.labelnames, labels, f'le="{bound}"')
+                yield f"{self.name}_bucket{le} {cumulative}"
+            cumulative += counts[-1]
+            inf = _format_labels(self.labelnames, labels, 'le="+Inf"')
+            yield f"{self.name}_bucket{inf} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}"
+
+
+OPERATION_SECONDS = Histogram(
+    "acv_operation_seconds",
+    "Latency of instrumented operations.",
+    ("component", "operation"),
+)
+OPERATION_ITEMS = Histogram(
+    "acv_operation_items",
+    "Rows or files scanned per operation.",
+    ("component", "operation", "kind"),
+    COUNT_BUCKETS,
+)
+OPERATION_BYTES = Histogram(
+    "acv_operation_bytes",
+    "Bytes read or written per operation.",
+    ("component", "operation", "direction"),
+    BYTE_BUCKETS,
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "acv_http_request_seconds",
+    "API request latency by route.",
+    ("method", "route", "status"),
+)
+SUBPROCESS_OUTPUT = Counter(
+    "acv_subprocess_output_total",
+    "Lines and bytes read from recorded agent processes.",
+    ("agent", "unit"),
+)
+
+REGISTRY = [OPERATION_SECONDS, OPERATION_ITEMS, OPERATION_BYTES, HTTP_REQUEST_SECONDS, SUBPROCESS_OUTPUT]
+
+
+def render() -> str:
+    """All metrics in the Prometheus text format (version 0.0.4)."""
+    return "\n".join(line for metric in REGISTRY for line in metric.collect()) + "\n"
+
+
+def observe_items(component: str, operation: str, count: int, kind: str = "rows") -> None:
+    if _enabled:
+        OPERATION_ITEMS.observe(count, component, operation, kind)
+
+
+def observe_bytes(component: str, operation: str, size: int, direction: str = "read") -> None:
+    if _enabled:
+        OPERATION_BYTES.observe(size, component, operation, direction)
+
+
+def record_subprocess_output(agent: str, line: str) -> None:
+    if _enabled:
+        SUBPROCESS_OUTPUT.inc(1, agent, "lines")
+        SUBPROCESS_OUTPUT.inc(len(line.encode("utf-8")), agent, "bytes")
+
+
+def timed(component: str, operation: str) -> Callable:
+    """Record the latency of a function (or of fully iterating a generator function)."""
+    def decorator(fn: Callable) -> Callable:
+        if inspect.isgeneratorfunction(fn):
+            @functools.wraps(fn)
+            def generator_wrapper(*args, **kwargs):
+                if not _enabled:
+                    return (yield from fn(*args, **kwargs))
+                start = time.perf_counter()
+                try:
+                    return (yield from fn(*args, **kwargs))
+                finally:
+                    OPERATION_SECONDS.observe(time.perf_counter() - start, component, operation)
+            return generator_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                OPERATION_SECONDS.observe(time.perf_counter() - start, component, operation)
+        return wrapper
+    return decorator
+
+
+class stage:
+    """Context manager timing an inline stage, e.g. serialization inside a handler."""
+
+    __slots__ = ("component", "operation", "start")
+
+    def __init__(self, component: str, operation: str):
+        self.component = component
+        self.operation = operation
+        self.start = 0.0
+
+    def __enter__(self) -> "stage":
+        if _enabled:
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if _enabled and self.start:
+            OPERATION_SECONDS.observe(time.perf_counter() - self.start, self.component, self.operation)
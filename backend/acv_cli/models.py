@@ -61,11 +61,13 @@ class KnowledgeItem(BaseModel):
     confidence: Confidence = Confidence.MEDIUM
     generated_by_skill: Optional[str] = None
     summary: Optional[str] = None
+    minhash: Optional[List[int]] = Field(default=None, exclude=True)
 
 class Skill(BaseModel):
     skill_id: str
     name: str
     description: str
     command: Optional[str] = None
+    entrypoint: Optional[str] = None
     parameters: dict = {}
     created_at: datetime = Field(default_factory=datetime.now)
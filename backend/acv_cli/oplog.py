@@ -0,0 +1,209 @@
+"""Append-only change log of a vault, for multi-machine sync (see sync.py).
+
+Every mutation of a session or knowledge item (its file, or its index row)
+appends an op ``(origin, seq, lamport, kind, key)`` to the ``oplog`` table
+of the index database. ``origin`` identifies the vault and ``seq`` numbers
+its own ops, so ``{origin: highest seq}`` is a version vector that tells
+exactly which ops another vault is missing. ``lamport`` is a Lamport clock:
+one more than any op the vault had seen when the op was appended, so an op
+always orders after everything its vault already knew of. Conflicting
+writes to the same key are resolved by the highest ``(lamport, origin)``.
+
+Ops carry no payload: sync ships the current state of each key whose
+latest op it transfers, which is all a last-writer-wins merge needs.
+"""
+
+import sqlite3
+import threading
+import uuid
+from concurrent.futures import Future
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, NamedTuple
+
+from .write_queue import submit_write
+
+# Kinds of ops: files written by the managers, and index rows written by Database.
+SESSION = "session"
+KNOWLEDGE = "knowledge"
+INDEX_SESSION = "index.session"
+INDEX_KNOWLEDGE = "index.knowledge"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS oplog (
+    origin TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    lamport INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    PRIMARY KEY (origin, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_oplog_key ON oplog(kind, key, lamport);
+CREATE INDEX IF NOT EXISTS idx_oplog_lamport ON oplog(lamport, origin);
+CREATE TABLE IF NOT EXISTS oplog_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class Op(NamedTuple):
+    origin: str
+    seq: int
+    lamport: int
+    kind: str
+    key: str
+
+    def order(self) -> tuple[int, str]:
+        return self.lamport, self.origin
+
+
+_local = threading.local()
+
+
+@contextmanager
+def replaying() -> Iterator[None]:
+    """Suppress recording in this thread (sync applies ops it already logged elsewhere)."""
+    previous = getattr(_local, "replaying", False)
+    _local.replaying = True
+    try:
+        yield
+    finally:
+        _local.replaying = previous
+
+
+class OpLog:
+    """The op log kept in the index database at ``db_path``."""
+
+    def __init__(self, db_path: Path, enabled: bool = True, settings: dict | None = None):
+        self.db_path = Path(db_path)
+        self.enabled = enabled
+        self.settings = settings or {}
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.executescript(_SCHEMA)
+            with conn:
+                conn.execute(
+                    "INSERT OR IGNORE INTO oplog_meta (key, value) VALUES ('origin', ?)", (uuid.uuid4().hex,)
+                )
+                conn.execute("INSERT OR IGNORE INTO oplog_meta (key, value) VALUES ('clock', '0')")
+            self.origin = conn.execute("SELECT value FROM oplog_meta WHERE key = 'origin'").fetchone()[0]
+        finally:
+            conn.close()
+
+    @property
+    def recording(self) -> bool:
+        return self.enabled and not getattr(_local, "replaying", False)
+
+    def append(self, cursor: sqlite3.Cursor, kind: str, keys: list[str]) -> None:
+        """Append local ops for ``keys`` inside the caller's write transaction."""
+        if not keys or not self.recording:
+            return
+        clock = int(cursor.execute("SELECT value FROM oplog_meta WHERE key = 'clock'").fetchone()[0])
+        seq = cursor.execute(
+            "SELECT COALESCE(MAX(seq), 0) FROM oplog WHERE origin = ?", (self.origin,)
+        ).fetchone()[0]
+        cursor.executemany(
+            "INSERT INTO oplog (origin, seq, lamport, kind, key) VALUES (?, ?, ?, ?, ?)",
+            [(self.origin, seq + i, clock + i, kind, key) for i, key in enumerate(keys, start=1)],
+        )
+        cursor.execute("UPDATE oplog_meta SET value = ? WHERE key = 'clock'", (str(clock + len(keys)),))
+
+    def record(self, kind: str, key: str) -> Future | None:
+        """Append a local op in a write of its own (for file changes made outside the index)."""
+        if not self.recording:
+            return None
+        return submit_write(self.db_path, lambda cursor: self.append(cursor, kind, [key]), self.settings)
+
+    def vector(self) -> dict[str, int]:
+        """Highest seq of every origin in the log."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return dict(conn.execute("SELECT origin, MAX(seq) FROM oplog GROUP BY origin"))
+        finally:
+            conn.close()
+
+    def missing(self, vector: dict[str, int]) -> Iterator[Op]:
+        """Ops not covered by ``vector`` (another vault's), in causal (Lamport) order."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute("CREATE TEMP TABLE seen (origin TEXT PRIMARY KEY, seq INTEGER)")
+            conn.executemany("INSERT INTO seen VALUES (?, ?)", vector.items())
+            rows = conn.execute("""
+                SELECT o.origin, o.seq, o.lamport, o.kind, o.key FROM oplog o
+                LEFT JOIN seen s ON s.origin = o.origin
+                WHERE o.seq > COALESCE(s.seq, 0)
+                ORDER BY o.lamport, o.origin
+            """)
+            for row in rows:
+                yield Op(*row)
+        finally:
+            conn.close()
+
+    def latest(self, kind: str, keys: list[str]) -> dict[str, tuple[int, str]]:
+        """``(lamport, origin)`` of the newest logged op of each of ``keys``."""
+        result: dict[str, tuple[int, str]] = {}
+        conn = sqlite3.connect(self.db_path)
+        try:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = conn.execute(f"""
+                    SELECT key, lamport, origin FROM oplog
+                    WHERE kind = ? AND key IN ({", ".join("?" * len(chunk))})
+                """, (kind, *chunk))
+                for key, lamport, origin in rows:
+                    if (lamport, origin) > result.get(key, (-1, "")):
+                        result[key] = (lamport, origin)
+        finally:
+            conn.close()
+        return result
+
+    def insert(self, cursor: sqlite3.Cursor, ops: list[Op]) -> None:
+        """Add ops received from another vault (already present ones are ignored) and advance the clock."""
+        cursor.executemany(
+            "INSERT OR IGNORE INTO oplog (origin, seq, lamport, kind, key) VALUES (?, ?, ?, ?, ?)", ops
+        )
+        cursor.execute(
+            "UPDATE oplog_meta SET value = MAX(CAST(value AS INTEGER), ?) WHERE key = 'clock'",
+            (max(op.lamport for op in ops),),
+        )
+
+    def unlogged(self, cursor: sqlite3.Cursor) -> dict[str, list[str]]:
+        """Indexed sessions and items without any op (created before the log existed)."""
+        return {
+            INDEX_SESSION: [row[0] for row in cursor.execute("""
+                SELECT session_id FROM sessions WHERE session_id NOT IN
+                    (SELECT key FROM oplog WHERE kind = 'index.session')
+            """)],
+            INDEX_KNOWLEDGE: [row[0] for row in cursor.execute("""
+                SELECT id FROM knowledge_items WHERE id NOT IN
+                    (SELECT key FROM oplog WHERE kind = 'index.knowledge')
+            """)],
+        }
+
+    def stats(self) -> dict:
+        conn = sqlite3.connect(self.db_path)
+        try:
+            ops, origins = conn.execute("SELECT COUNT(*), COUNT(DISTINCT origin) FROM oplog").fetchone()
+            clock = int(conn.execute("SELECT value FROM oplog_meta WHERE key = 'clock'").fetchone()[0])
+        finally:
+            conn.close()
+        return {"origin": self.origin, "ops": ops, "origins": origins, "clock": clock}
+
+
+_logs: dict[Path, OpLog] = {}
+_logs_lock = threading.Lock()
+
+
+def get_oplog(db_path: Path) -> OpLog:
+    """The op log of the index at ``db_path``, configured from ``[sync]``."""
+    from .config import get_config
+
+    key = Path(db_path).resolve()
+    with _logs_lock:
+        log = _logs.get(key)
+        if log is None:
+            config = get_config()
+            log = _logs[key] = OpLog(db_path, enabled=config.sync.get("enabled", True), settings=config.storage)
+        return log
@@ -0,0 +1,42 @@
+import base64
+import json
+from typing import Any, Callable, Sequence
+
+
+def encode_cursor(key: Sequence[str]) -> str:
+    """Opaque token for the sort key of the last item on a page."""
+    raw = json.dumps(list(key), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(token: str, size: int) -> tuple[str, ...]:
+    """Sort key of an ``encode_cursor`` token; ``ValueError`` if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        key = json.loads(raw)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {token}") from e
+    if not isinstance(key, list) or len(key) != size or not all(isinstance(k, str) for k in key):
+        raise ValueError(f"Invalid cursor: {token}")
+    return tuple(key)
+
+
+def next_cursor(items: Sequence[Any], limit: int, key: Callable[[Any], Sequence[str]]) -> str | None:
+    """Cursor for the page after ``items``, or None when this was the last page."""
+    if limit <= 0 or len(items) < limit:
+        return None
+    return encode_cursor(key(items[-1]))
+
+
+# Sort keys of each listing, matching their keyset order (newest first).
+def session_key(session: dict) -> tuple[str]:
+    return (session["session_id"],)
+
+
+def knowledge_key(item: dict) -> tuple[str, str, str]:
+    # Files live at <category>/<year>/<id>.md
+    return (item["category"], item["date"][:4], item["id"])
+
+
+def search_key(row: dict) -> tuple[str, str]:
+    return (row["date"], row["id"])
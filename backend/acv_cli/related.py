@@ -0,0 +1,346 @@
+"""Related knowledge items: a sparse k-nearest-neighbour graph kept in SQLite.
+
+Items are compared on three feature groups: tags, source sessions (from
+``item_sources``) and title/summary terms. Each group is an IDF-weighted,
+L2-normalised sparse vector scaled by the square root of its weight, so the
+dot product of two items is the weighted sum of the per-group cosines.
+
+Scores are computed from an inverted index (feature -> items), so only
+pairs sharing a feature are ever touched; with numpy a block of rows is
+scored at once with ``bincount`` and ranked with ``argpartition``. Features
+in more than ``max_df`` of all items are dropped as noise (they would also
+dominate the cost, since every pair of items sharing one gets scored).
+"""
+
+import heapq
+import logging
+import math
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+
+from . import metrics
+
+try:
+    import numpy as np
+except ImportError:  # the pure-Python path gives the same graph, only slower
+    np = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WEIGHTS = {"tags": 0.3, "sessions": 0.3, "text": 0.4}
+# Score matrix cells per numpy block (float64: 32 MB).
+_BLOCK_CELLS = 4_000_000
+
+_WORD = re.compile(r"[a-z0-9_]{2,}")
+_CJK = re.compile(r"[\u4e00-\u9fff]+")
+
+
+def _terms(text: str) -> list[str]:
+    """Lowercase word tokens; CJK runs are split into character bigrams."""
+    text = text.lower()
+    terms = _WORD.findall(text)
+    for run in _CJK.findall(text):
+        if len(run) == 1:
+            terms.append(run)
+        else:
+            terms.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return terms
+
+
+class _Model:
+    """Weighted sparse feature vectors of the items, with their inverted index.
+
+    Items can be appended: a new item is weighted with the document
+    frequencies as of its addition, earlier vectors are left as they were.
+    """
+
+    def __init__(self, weights: dict[str, float], max_df: float):
+        self.weights = weights
+        self.max_df = max_df
+        self.ids: list[str] = []
+        self.position: dict[str, int] = {}
+        self.df: Counter = Counter()
+        self.columns: dict[tuple, int] = {}
+        self.vectors: list[list[tuple[int, float]]] = []
+        # Inverted index: Python lists without numpy, CSC arrays (col_ptr/col_rows/col_data) with it.
+        self.postings: list[list[tuple[int, float]]] = []
+        if np is not None:
+            self.indptr = np.zeros(1, dtype=np.int64)
+            self.indices = np.zeros(0, dtype=np.int64)
+            self.data = np.zeros(0, dtype=np.float64)
+
+    @staticmethod
+    def _features(row: tuple) -> dict[str, dict[tuple, float]]:
+        _, title, summary, tags, sessions = row
+        return {
+            "tags": {("tags", t): 1.0 for t in tags},
+            "sessions": {("sessions", s): 1.0 for s in sessions},
+            "text": {
+                ("text", t): 1.0 + math.log(c)
+                for t, c in Counter(_terms(f"{title} {summary or ''}")).items()
+            },
+        }
+
+    def add(self, rows: list[tuple]) -> list[int]:
+        """Append items given as ``(id, title, summary, tags, sessions)``; returns their row numbers."""
+        raw = [self._features(row) for row in rows]
+        for groups in raw:
+            for group in groups.values():
+                self.df.update(group.keys())
+
+        first = len(self.ids)
+        n = first + len(rows)
+        text_limit = max(2, self.max_df * n)
+        for row, groups in zip(rows, raw):
+            i = len(self.ids)
+            self.position[row[0]] = i
+            self.ids.append(row[0])
+            vector = []
+            for name, group in groups.items():
+                # tf * idf, with idf = ln((1 + n) / (1 + df)) + 1
+                weighted = {
+                    feature: tf * (math.log((1 + n) / (1 + self.df[feature])) + 1)
+                    for feature, tf in group.items()
+                    if name != "text" or self.df[feature] <= text_limit
+                }
+                if not weighted or not self.weights.get(name):
+                    continue
+                scale = math.sqrt(self.weights[name] / sum(w * w for w in weighted.values()))
+                for feature, w in weighted.items():
+                    col = self.columns.setdefault(feature, len(self.columns))
+                    vector.append((col, w * scale))
+                    if np is None:
+                        if col == len(self.postings):
+                            self.postings.append([])
+                        self.postings[col].append((i, w * scale))
+            self.vectors.append(vector)
+
+        if np is not None:
+            added = self.vectors[first:]
+            lengths = np.fromiter((len(v) for v in added), np.int64, len(added))
+            self.indptr = np.concatenate([self.indptr, self.indptr[-1] + np.cumsum(lengths)])
+            count = int(lengths.sum())
+            self.indices = np.concatenate([self.indices, np.fromiter((c for v in added for c, _ in v), np.int64, count)])
+            self.data = np.concatenate([self.data, np.fromiter((w for v in added for _, w in v), np.float64, count)])
+            # Inverted index (CSC) from the CSR arrays.
+            order = np.argsort(self.indices, kind="stable")
+            entry_rows = np.repeat(np.arange(len(self.ids)), np.diff(self.indptr))
+            self.col_rows = entry_rows[order]
+            self.col_data = self.data[order]
+            self.col_ptr = np.zeros(len(self.columns) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(self.indices, minlength=len(self.columns)), out=self.col_ptr[1:])
+        return list(range(first, len(self.ids)))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def score_rows(self, rows: list[int]):
+        """Scores of ``rows`` against every item (``len(rows) x n``), self-pairs zeroed."""
+        n = len(self)
+        if np is None:
+            block = []
+            for i in rows:
+                acc: dict[int, float] = defaultdict(float)
+                for col, w in self.vectors[i]:
+                    for j, u in self.postings[col]:
+                        acc[j] += w * u
+                acc.pop(i, None)
+                block.append(acc)
+            return block
+
+        rows_arr = np.asarray(rows, dtype=np.int64)
+        # Entries of the block rows, then the postings of each entry's feature.
+        local, entries = _expand(self.indptr[rows_arr], self.indptr[rows_arr + 1])
+        features = self.indices[entries]
+        pair_entry, pair_pos = _expand(self.col_ptr[features], self.col_ptr[features + 1])
+        weights = self.data[entries][pair_entry] * self.col_data[pair_pos]
+        cells = local[pair_entry] * n + self.col_rows[pair_pos]
+        scores = np.bincount(cells, weights=weights, minlength=len(rows) * n).reshape(len(rows), n)
+        scores[np.arange(len(rows)), rows_arr] = 0.0
+        return scores
+
+    def top_k(self, scores, k: int, min_score: float) -> list[list[tuple[int, float]]]:
+        """The ``k`` best neighbours above ``min_score`` of each scored row, best first."""
+        if np is None:
+            return [
+                heapq.nlargest(k, ((j, s) for j, s in acc.items() if s > min_score), key=lambda p: p[1])
+                for acc in scores
+            ]
+        kk = min(k, scores.shape[1])
+        if kk <= 0:
+            return [[] for _ in range(scores.shape[0])]
+        top = np.argpartition(-scores, kk - 1, axis=1)[:, :kk]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        result = []
+        for cols, vals in zip(top.tolist(), top_scores.tolist()):
+            pairs = sorted(((j, s) for j, s in zip(cols, vals) if s > min_score), key=lambda p: -p[1])
+            result.append(pairs)
+        return result
+
+    def blocks(self, rows: list[int]):
+        size = max(1, _BLOCK_CELLS // max(len(self), 1)) if np is not None else 256
+        for start in range(0, len(rows), size):
+            yield rows[start:start + size]
+
+
+def _expand(starts, ends):
+    """Concatenate ``range(start, end)`` for each pair; returns (pair index, position)."""
+    lengths = ends - starts
+    total = int(lengths.sum())
+    owner = np.repeat(np.arange(len(starts)), lengths)
+    offsets = np.zeros(len(starts), dtype=np.int64)
+    np.cumsum(lengths[:-1], out=offsets[1:])
+    return owner, np.arange(total, dtype=np.int64) - offsets[owner] + starts[owner]
+
+
+class RelatedGraph:
+    """The related-items graph of one index database.
+
+    ``rebuild`` recomputes every item's neighbours; ``update`` only adds the
+    items not in the graph yet: their own neighbour lists are computed and
+    existing lists they now belong to are patched, so adding an item costs
+    one row of scores instead of a rebuild. IDF weights drift as items are
+    added incrementally; a rebuild happens when more than ``rebuild_ratio``
+    of the items are new. The feature model is kept between updates, so an
+    incremental update only reads and weighs the new items.
+    """
+
+    def __init__(
+        self,
+        db,
+        k: int = 10,
+        weights: dict[str, float] | None = None,
+        min_score: float = 0.05,
+        max_df: float = 0.1,
+        rebuild_ratio: float = 0.2,
+    ):
+        self.db = db
+        self.k = k
+        self.weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        self.min_score = min_score
+        self.max_df = max_df
+        self.rebuild_ratio = rebuild_ratio
+        self._lock = threading.Lock()
+        self._model: _Model | None = None
+
+    @classmethod
+    def from_settings(cls, db, settings: dict) -> "RelatedGraph":
+        return cls(
+            db,
+            k=settings.get("k", 10),
+            weights={
+                "tags": settings.get("tag_weight", DEFAULT_WEIGHTS["tags"]),
+                "sessions": settings.get("session_weight", DEFAULT_WEIGHTS["sessions"]),
+                "text": settings.get("text_weight", DEFAULT_WEIGHTS["text"]),
+            },
+            min_score=settings.get("min_score", 0.05),
+            max_df=settings.get("max_df", 0.1),
+            rebuild_ratio=settings.get("rebuild_ratio", 0.2),
+        )
+
+    @metrics.timed("related", "rebuild")
+    def rebuild(self) -> dict:
+        with self._lock:
+            t0 = time.perf_counter()
+            model = self._model = _Model(self.weights, self.max_df)
+            model.add(self.db.knowledge_features())
+            lists = {}
+            for rows in model.blocks(list(range(len(model)))):
+                for i, neighbours in zip(rows, model.top_k(model.score_rows(rows), self.k, self.min_score)):
+                    lists[model.ids[i]] = [(model.ids[j], s) for j, s in neighbours]
+            self.db.write_related(lists, replace_all=True)
+            return {"mode": "rebuild", "items": len(model), "seconds": time.perf_counter() - t0}
+
+    @metrics.timed("related", "update")
+    def update(self) -> dict:
+        """Bring the graph up to date with the indexed items (incrementally when possible)."""
+        pending = self.db.items_without_related()
+        nodes = self.db.related_nodes()
+        if not pending:
+            return {"mode": "none", "items": 0, "seconds": 0.0}
+        if not nodes or len(pending) > self.rebuild_ratio * (len(nodes) + len(pending)):
+            return self.rebuild()
+
+        with self._lock:
+            t0 = time.perf_counter()
+            model = self._model
+            if model is None or len(model) != len(nodes):
+                # First update in this process, or the graph was changed by another process:
+                # the items already in the graph form the model, the pending ones are added below.
+                model = self._model = _Model(self.weights, self.max_df)
+                model.add(self.db.knowledge_features(exclude=pending))
+            new_rows = model.add(self.db.knowledge_features(pending))
+            new = set(new_rows)
+            lists: dict[str, list[tuple[str, float]]] = {}
+            # Existing items each new item would enter the neighbour list of: item -> [(new item, score)]
+            offers: dict[int, list[tuple[int, float]]] = defaultdict(list)
+
+            for rows in model.blocks(new_rows):
+                scores = model.score_rows(rows)
+                for i, neighbours in zip(rows, model.top_k(scores, self.k, self.min_score)):
+                    lists[model.ids[i]] = [(model.ids[j], s) for j, s in neighbours]
+                for r, i in enumerate(rows):
+                    candidates = scores[r].items() if np is None else _nonzero(scores[r], self.min_score)
+                    for j, s in candidates:
+                        if j in new or s <= self.min_score:
+                            continue
+                        degree, weakest = nodes.get(model.ids[j], (0, 0.0))
+                        if degree < self.k or s > weakest:
+                            offers[j].append((i, s))
+
+            current = self.db.related_neighbours([model.ids[j] for j in offers])
+            for j, offered in offers.items():
+                item_id = model.ids[j]
+                merged = dict(current.get(item_id, []))
+                merged.update((model.ids[i], s) for i, s in offered)
+                lists[item_id] = heapq.nlargest(self.k, merged.items(), key=lambda p: p[1])
+            self.db.write_related(lists)
+            return {
+                "mode": "incremental",
+                "items": len(new_rows),
+                "patched": len(offers),
+                "seconds": time.perf_counter() - t0,
+            }
+
+
+def _nonzero(row, min_score: float):
+    cols = np.flatnonzero(row > min_score)
+    return zip(cols.tolist(), row[cols].tolist())
+
+
+class RelatedUpdater:
+    """Background thread keeping the graph current.
+
+    Woken by ``notify`` after items are indexed, and every ``interval``
+    seconds to pick up items written by other processes (CLI, imports).
+    """
+
+    def __init__(self, graph: RelatedGraph, interval: float = 30):
+        self.graph = graph
+        self.interval = interval
+        self._wake = threading.Event()
+        self._stop = False
+        self._thread = threading.Thread(target=self._run, name="acv-related", daemon=True)
+
+    def start(self) -> "RelatedUpdater":
+        self._thread.start()
+        return self
+
+    def notify(self) -> None:
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stop:
+            try:
+                self.graph.update()
+            except Exception:
+                logger.exception("Related items update failed")
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def close(self) -> None:
+        self._stop = True
+        self._wake.set()
+        self._thread.join()
@@ -0,0 +1,197 @@
+"""Sidecar offset index for random access into session JSON files.
+
+``<session_id>.idx`` sits next to ``<session_id>.json`` and records the
+byte span of every message, so a page of messages is decoded straight
+from an mmap of the session file instead of parsing everything before it.
+
+Layout (little endian): a header with a magic string, the size and
+mtime_ns of the JSON file it describes, the message count and the span
+of the ``messages`` array, then one ``(offset, length)`` pair per message.
+An index whose recorded size/mtime do not match the JSON file is stale
+and ignored.
+"""
+
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Any, BinaryIO
+
+MAGIC = b"ACVIDX1\n"
+_HEADER = struct.Struct("<8sqqqqq")  # magic, json size, json mtime_ns, count, messages start, end
+_ENTRY = struct.Struct("<qq")  # offset, length
+
+
+def index_path(json_path: Path) -> Path:
+    return json_path.with_suffix(".idx")
+
+
+# indent=2 output is produced by the pure-Python encoder; the compact one is C-accelerated.
+_encode_scalar = json.JSONEncoder(ensure_ascii=False).encode
+
+
+def _indent(text: str, width: int) -> str:
+    # JSON escapes newlines inside strings, so every "\n" here is structural.
+    return text.replace("\n", "\n" + " " * width)
+
+
+def _encode(value: Any, width: int) -> bytes:
+    """``json.dumps(value, ensure_ascii=False, indent=2)`` nested ``width`` spaces deep."""
+    # Messages are almost always flat objects of strings; lay those out directly.
+    if (
+        isinstance(value, dict)
+        and value
+        and all(type(k) is str and (not isinstance(v, (dict, list)) or not v) for k, v in value.items())
+    ):
+        pad = "\n" + " " * (width + 2)
+        body = ("," + pad).join(f"{_encode_scalar(k)}: {_encode_scalar(v)}" for k, v in value.items())
+        return f"{{{pad}{body}\n{' ' * width}}}".encode("utf-8")
+    return _indent(json.dumps(value, ensure_ascii=False, indent=2), width).encode("utf-8")
+
+
+def dump_indexed(data: dict, f: BinaryIO) -> tuple[list[tuple[int, int]], tuple[int, int]]:
+    """Write ``data`` byte-for-byte as ``json.dump(data, f, ensure_ascii=False, indent=2)``.
+
+    Returns the ``(offset, length)`` of each message and the span of the
+    ``messages`` array.
+    """
+    spans: list[tuple[int, int]] = []
+    messages_span = (0, 0)
+    position = 0
+
+    def write(chunk: bytes) -> None:
+        nonlocal position
+        f.write(chunk)
+        position += len(chunk)
+
+    if not data:
+        write(b"{}")
+        return spans, messages_span
+
+    write(b"{\n")
+    for i, (key, value) in enumerate(data.items()):
+        if i:
+            write(b",\n")
+        write(b"  " + json.dumps(key, ensure_ascii=False).encode("utf-8") + b": ")
+        if key != "messages" or not isinstance(value, list):
+            write(_encode(value, 2))
+            continue
+        start = position
+        if not value:
+            write(b"[]")
+        else:
+            write(b"[\n")
+            for j, msg in enumerate(value):
+                if j:
+                    write(b",\n")
+                write(b"    ")
+                chunk = _encode(msg, 4)
+                spans.append((position, len(chunk)))
+                write(chunk)
+            write(b"\n  ]")
+        messages_span = (start, position)
+    write(b"\n}")
+    return spans, messages_span
+
+
+def write_index(json_path: Path, spans: list[tuple[int, int]], messages_span: tuple[int, int]) -> None:
+    """Write the sidecar for ``json_path`` (call after the JSON file is closed)."""
+    st = json_path.stat()
+    path = index_path(json_path)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, st.st_size, st.st_mtime_ns, len(spans), *messages_span))
+        for span in spans:
+            f.write(_ENTRY.pack(*span))
+    os.replace(tmp, path)
+
+
+def build_index(json_path: Path) -> bool:
+    """Index a session file written before sidecars existed.
+
+    Only done when re-serializing the file reproduces it exactly, so the
+    recorded spans are guaranteed to match; the JSON file is never rewritten.
+    """
+    raw = json_path.read_bytes()
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        return False
+    if not isinstance(data, dict):
+        return False
+
+    class _Compare:
+        matches = True
+        position = 0
+
+        def write(self, chunk: bytes) -> None:
+            if self.matches and raw[self.position:self.position + len(chunk)] != chunk:
+                self.matches = False
+            self.position += len(chunk)
+
+    out = _Compare()
+    spans, messages_span = dump_indexed(data, out)
+    if not out.matches or out.position != len(raw):
+        return False
+    write_index(json_path, spans, messages_span)
+    return True
+
+
+class SessionIndex:
+    """Sidecar of one session file; reads message pages through an mmap."""
+
+    def __init__(self, json_path: Path, header: tuple):
+        self.json_path = json_path
+        self._header = header
+        self.count = header[3]
+
+    @classmethod
+    def open(cls, json_path: Path) -> "SessionIndex | None":
+        """The index of ``json_path``, or None if it is missing or stale."""
+        try:
+            with open(index_path(json_path), "rb") as f:
+                header = cls._read_header(f)
+            st = json_path.stat()
+        except FileNotFoundError:
+            return None
+        if header is None or header[1:3] != (st.st_size, st.st_mtime_ns):
+            return None
+        return cls(json_path, header)
+
+    @staticmethod
+    def _read_header(f: BinaryIO) -> tuple | None:
+        data = f.read(_HEADER.size)
+        if len(data) != _HEADER.size:
+            return None
+        header = _HEADER.unpack(data)
+        return header if header[0] == MAGIC else None
+
+    def read(self, start: int, stop: int | None = None) -> dict | None:
+        """The session with only messages ``start:stop`` decoded, or None if it changed meanwhile.
+
+        Both files are replaced atomically on save, so validating the open
+        handles against the header guarantees the spans match the bytes read.
+        """
+        stop = self.count if stop is None else min(stop, self.count)
+        start = max(start, 0)
+        try:
+            index_file = open(index_path(self.json_path), "rb")
+            f = open(self.json_path, "rb")
+        except FileNotFoundError:
+            return None
+        with index_file, f:
+            header = self._read_header(index_file)
+            st = os.fstat(f.fileno())
+            if header != self._header or header[1:3] != (st.st_size, st.st_mtime_ns):
+                return None
+            spans = []
+            if start < stop:
+                index_file.seek(_HEADER.size + start * _ENTRY.size)
+                spans = list(_ENTRY.iter_unpack(index_file.read((stop - start) * _ENTRY.size)))
+            begin, end = header[4:6]
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # Metadata is parsed with the messages array cut out.
+                session = json.loads(mm[:begin] + b"[]" + mm[end:]) if end else json.loads(mm[:])
+                session["messages"] = [json.loads(mm[offset:offset + length]) for offset, length in spans]
+        return session
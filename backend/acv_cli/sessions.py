@@ -1,16 +1,70 @@
 import json
+import os
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
+from . import metrics
+from .archive import SessionArchive, cutoff_day
+from .blobs import REF_KEY, BlobStore
+from .compact import CompactSession
 from .config import get_config
+from .jsonstream import JsonStream
+from .oplog import SESSION, OpLog, get_oplog
+from .session_index import SessionIndex, build_index, dump_indexed, write_index
+
+# Keys shown in session listings; the recorder writes them before "messages".
+_LISTING_KEYS = ("session_id", "created_at", "model_source", "project", "tags")
+
+# Messages decoded per mmap read when iterating an indexed session.
+_INDEX_PAGE = 256
 
 class SessionManager:
-    def __init__(self):
+    def __init__(self, data_paths: dict[str, str] | None = None):
+        """``data_paths`` overrides ``[data_paths]``, to work on another vault (sync)."""
         self.config = get_config()
-        self.sessions_dir = Path(self.config.data_paths["sessions_dir"])
+        self.data_paths = data_paths or self.config.data_paths
+        self.sessions_dir = Path(self.data_paths["sessions_dir"])
         self.sessions_dir.mkdir(parents=True, exist_ok=True)
+        storage = self.config.storage
+        base_dir = Path(self.data_paths.get("base_dir", "./data"))
+        # Always available for reading, so sessions stay loadable if the store is disabled later.
+        self.blobs = BlobStore(base_dir / "blobs")
+        self.blob_min_size = storage.get("blob_min_size", 4096) if storage.get("blob_store") else None
+        # Cold tier: sessions moved out of sessions_dir by archive_sessions().
+        self.archive = SessionArchive(Path(self.data_paths.get("archive_dir", base_dir / "archive")))
+
+    @property
+    def oplog(self) -> OpLog:
+        return get_oplog(Path(self.data_paths.get("db_path", "./data/index.db")))
+
+    def _externalize(self, session_data: dict) -> dict:
+        """Copy of the session with large message bodies moved to the blob store."""
+        min_size = self.blob_min_size
+        messages = []
+        for msg in session_data.get("messages", []):
+            content = msg.get("content")
+            if isinstance(content, str) and len(content) >= min_size:
+                digest = self.blobs.put(content)
+                msg = {
+                    (REF_KEY if key == "content" else key): (digest if key == "content" else value)
+                    for key, value in msg.items()
+                }
+            messages.append(msg)
+        return {**session_data, "messages": messages}
 
+    def _resolve(self, msg: dict) -> dict:
+        digest = msg.get(REF_KEY)
+        if digest is None:
+            return msg
+        content = self.blobs.get(digest)
+        return {
+            ("content" if key == REF_KEY else key): (content if key == REF_KEY else value)
+            for key, value in msg.items()
+        }
+
+    @metrics.timed("sessions", "save_session")
     def save_session(self, session_data: dict) -> str:
         """Save session to JSON and generate markdown transcript."""
         session_id = session_data["session_id"]
@@ -18,56 +72,298 @@ class SessionManager:
         month_dir = self.sessions_dir / date_str
         month_dir.mkdir(parents=True, exist_ok=True)
 
-        # Save JSON
+        # Save JSON plus its message offset index. Replaced atomically, since
+        # readers may have the previous version mmapped.
         json_path = month_dir / f"{session_id}.json"
-        with open(json_path, "w", encoding="utf-8") as f:
-            json.dump(session_data, f, ensure_ascii=False, indent=2)
+        stored = self._externalize(session_data) if self.blob_min_size is not None else session_data
+        tmp_path = json_path.with_name(f"{json_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            spans, messages_span = dump_indexed(stored, f)
+            if metrics.is_enabled():
+                metrics.observe_bytes("sessions", "save_session", f.tell(), "written")
+        os.replace(tmp_path, json_path)
+        write_index(json_path, spans, messages_span)
 
         # Generate markdown transcript
         md_path = month_dir / f"{session_id}.md"
         self._generate_markdown(session_data, md_path)
 
+        logged = self.oplog.record(SESSION, session_id)
+        if logged is not None:
+            logged.result()
         return str(json_path)
 
-    def load_session(self, session_id: str) -> dict | None:
-        """Load session by ID."""
-        date_str = session_id[:10]
-        month_dir = self.sessions_dir / date_str
-        json_path = month_dir / f"{session_id}.json"
+    def _session_path(self, session_id: str) -> Path:
+        return self.sessions_dir / session_id[:10] / f"{session_id}.json"
+
+    def session_exists(self, session_id: str) -> bool:
+        return self._session_path(session_id).exists() or self.archive.contains(session_id)
+
+    @metrics.timed("sessions", "load_archived")
+    def _load_archived(self, session_id: str) -> dict | None:
+        """A session from the cold tier, with its stored (unresolved) messages."""
+        return self.archive.load(session_id)
+
+    @metrics.timed("sessions", "load_session")
+    def load_session(self, session_id: str, resolve: bool = True) -> dict | None:
+        """Load session by ID (from the archive if it was archived).
+
+        With ``resolve=False`` messages stored in the blob store keep their
+        reference instead of their content.
+        """
+        json_path = self._session_path(session_id)
 
         if json_path.exists():
             with open(json_path, encoding="utf-8") as f:
-                return json.load(f)
-        return None
+                session = json.load(f)
+                if metrics.is_enabled():
+                    metrics.observe_bytes("sessions", "load_session", f.tell(), "read")
+        else:
+            session = self._load_archived(session_id)
+            if session is None:
+                return None
+        if resolve:
+            session["messages"] = [self._resolve(msg) for msg in session.get("messages", [])]
+        return session
 
-    def list_sessions(self, limit: int = 50, model_source: str | None = None) -> list[dict]:
-        """List recent sessions."""
-        sessions = []
-        sessions_dir = Path(self.config.data_paths["sessions_dir"])
+    @metrics.timed("sessions", "load_session_compact")
+    def load_session_compact(self, session_id: str) -> CompactSession | None:
+        """Load a session into the compact columnar form, for holding many at once.
 
-        if not sessions_dir.exists():
-            return []
+        Only one session's message dicts exist at a time, while it is converted.
+        """
+        json_path = self._session_path(session_id)
+        if json_path.exists():
+            with open(json_path, encoding="utf-8") as f:
+                session = json.load(f)
+                if metrics.is_enabled():
+                    metrics.observe_bytes("sessions", "load_session_compact", f.tell(), "read")
+        else:
+            session = self._load_archived(session_id)
+            if session is None:
+                return None
+        return CompactSession(session, map(self._resolve, session.get("messages", [])))
 
-        for month_dir in sorted(sessions_dir.iterdir(), reverse=True):
-            if not month_dir.is_dir():
-                continue
-            for json_file in sorted(month_dir.glob("*.json"), reverse=True):
-                with open(json_file, encoding="utf-8") as f:
-                    data = json.load(f)
+    @metrics.timed("sessions", "load_session_range")
+    def load_session_range(
+        self,
+        session_id: str,
+        offset: int = 0,
+        limit: int | None = None,
+    ) -> dict | None:
+        """Load session metadata plus a slice of its messages.
+
+        With an offset index only the requested messages are decoded, from an
+        mmap of the file; otherwise the file is streamed. Either way only the
+        requested messages are held in memory. ``message_count`` reports the
+        total number of messages in the session. Archived sessions are
+        decoded whole, then sliced.
+        """
+        json_path = self._session_path(session_id)
+        if not json_path.exists():
+            session = self._load_archived(session_id)
+            if session is None:
+                return None
+            messages = session.get("messages", [])
+            stop = None if limit is None else offset + limit
+            session["messages"] = [self._resolve(msg) for msg in messages[offset:stop]]
+            session["message_count"] = len(messages)
+            session["message_offset"] = offset
+            return session
+
+        index = self._open_index(json_path)
+        if index is not None:
+            stop = None if limit is None else offset + limit
+            session = index.read(offset, stop)
+            if session is not None:
+                session["messages"] = [self._resolve(msg) for msg in session["messages"]]
+                session["message_count"] = index.count
+                session["message_offset"] = offset
+                return session
+
+        session: dict[str, Any] = {}
+        with open(json_path, encoding="utf-8") as f:
+            for key, value in JsonStream(f).iter_object(frozenset({"messages"})):
+                if key != "messages":
+                    session[key] = value
+                    continue
+                stop = None if limit is None else offset + limit
+                messages = []
+                count = 0
+                for index, msg in enumerate(value):
+                    if index >= offset and (stop is None or index < stop):
+                        messages.append(self._resolve(msg))
+                    count = index + 1
+                session["messages"] = messages
+                session["message_count"] = count
+        session.setdefault("messages", [])
+        session.setdefault("message_count", 0)
+        session["message_offset"] = offset
+        return session
+
+    def iter_messages(
+        self,
+        session_id: str,
+        offset: int = 0,
+        limit: int | None = None,
+    ) -> Iterator[dict]:
+        """Stream messages of a session without loading the whole file."""
+        json_path = self._session_path(session_id)
+        stop = None if limit is None else offset + limit
+        if not json_path.exists():
+            session = self._load_archived(session_id)
+            if session is not None:
+                yield from map(self._resolve, islice(session.get("messages", []), offset, stop))
+            return
+        index = self._open_index(json_path)
+        if index is not None:
+            end = index.count if stop is None else min(stop, index.count)
+            for page_start in range(offset, end, _INDEX_PAGE):
+                page = index.read(page_start, min(page_start + _INDEX_PAGE, end))
+                if page is None:
+                    # Rewritten meanwhile: continue from the new file.
+                    yield from self.iter_messages(session_id, page_start, None if stop is None else stop - page_start)
+                    return
+                yield from map(self._resolve, page["messages"])
+            return
+        with open(json_path, encoding="utf-8") as f:
+            for key, value in JsonStream(f).iter_object(frozenset({"messages"})):
+                if key == "messages":
+                    yield from map(self._resolve, islice(value, offset, stop))
+                    return
+
+    def _open_index(self, json_path: Path) -> SessionIndex | None:
+        """The offset index of a session file, building it for files saved before indexes existed."""
+        index = SessionIndex.open(json_path)
+        if index is None and build_index(json_path):
+            index = SessionIndex.open(json_path)
+        return index
+
+    def _read_listing(self, json_file: Path) -> dict:
+        """Read the listing keys of a session file, stopping before its messages."""
+        data: dict[str, Any] = {}
+        with open(json_file, encoding="utf-8") as f:
+            for key, value in JsonStream(f).iter_object(frozenset({"messages"})):
+                if key == "messages":
+                    if all(k in data for k in _LISTING_KEYS):
+                        break
+                    continue
+                data[key] = value
+        return data
+
+    def iter_sessions(
+        self, model_source: str | None = None, after: str | None = None, include_archived: bool = False
+    ) -> Iterator[dict]:
+        """Yield session listings, newest first.
+
+        ``after`` resumes a listing after that session ID. Files are named by
+        ID under per-day directories, so earlier pages are skipped by name
+        without being read. Archived sessions are only listed with
+        ``include_archived``, after all hot ones (they are older).
+        """
+        if not self.sessions_dir.exists():
+            return
+
+        scanned = 0
+        try:
+            for month_dir in sorted(self.sessions_dir.iterdir(), reverse=True):
+                if not month_dir.is_dir():
+                    continue
+                if after and month_dir.name > after[:10]:
+                    continue
+                for json_file in sorted(month_dir.glob("*.json"), reverse=True):
+                    if after and json_file.stem >= after:
+                        continue
+                    scanned += 1
+                    data = self._read_listing(json_file)
                     if model_source and data.get("model_source") != model_source:
                         continue
-                    sessions.append({
+                    yield {
                         "session_id": data["session_id"],
                         "created_at": data["created_at"],
                         "model_source": data["model_source"],
                         "project": data.get("project"),
                         "tags": data.get("tags", []),
-                    })
-                    if len(sessions) >= limit:
-                        return sessions
+                    }
+        finally:
+            metrics.observe_items("sessions", "iter_sessions", scanned, "files")
+
+        if not include_archived:
+            return
+        for listing in self.archive.iter_listings(after):
+            if model_source and listing["model_source"] != model_source:
+                continue
+            # Re-saved after archiving: the hot copy was listed above.
+            if self._session_path(listing["session_id"]).exists():
+                continue
+            yield listing
+
+    def listing_fingerprint(self) -> tuple[int, int, int]:
+        """``(file count, newest mtime_ns, total size)`` of all session JSON files.
+
+        Only stats the files, so it is far cheaper than building the listing and
+        changes whenever a session is added, removed or rewritten.
+        """
+        count = newest = total = 0
+        if not self.sessions_dir.exists():
+            return count, newest, total
+        for day_dir in os.scandir(self.sessions_dir):
+            if not day_dir.is_dir():
+                continue
+            for entry in os.scandir(day_dir.path):
+                if entry.name.endswith(".json"):
+                    st = entry.stat()
+                    count += 1
+                    newest = max(newest, st.st_mtime_ns)
+                    total += st.st_size
+        return count, newest, total
+
+    @metrics.timed("sessions", "list_sessions")
+    def list_sessions(
+        self,
+        limit: int = 50,
+        model_source: str | None = None,
+        after: str | None = None,
+        include_archived: bool = False,
+    ) -> list[dict]:
+        """List recent sessions, starting after session ``after`` if given."""
+        return list(islice(self.iter_sessions(model_source, after, include_archived), limit))
 
-        return sessions[:limit]
+    @metrics.timed("sessions", "archive_sessions")
+    def archive_sessions(self, older_than_days: float, dry_run: bool = False) -> dict:
+        """Move sessions of days older than ``older_than_days`` to the per-month archives.
+
+        Each month is written to its archive in one transaction before any of
+        its hot files are removed, so an interrupted run loses nothing and is
+        simply repeated. Offset indexes and emptied day directories are
+        removed along with the session files.
+        """
+        cutoff = cutoff_day(older_than_days)
+        months: dict[str, list[tuple[Path, dict]]] = {}
+        for day_dir in sorted(self.sessions_dir.iterdir()):
+            if not day_dir.is_dir() or day_dir.name >= cutoff:
+                continue
+            for json_file in sorted(day_dir.glob("*.json")):
+                months.setdefault(day_dir.name[:7], []).append((json_file, self._read_listing(json_file)))
+
+        result = {"cutoff": cutoff, "months": len(months), "sessions": 0, "bytes": 0}
+        for month, files in months.items():
+            result["sessions"] += len(files)
+            result["bytes"] += sum(path.stat().st_size for path, _ in files)
+            if dry_run:
+                continue
+            self.archive.add(month, files)
+            for json_file, _ in files:
+                for suffix in (".json", ".md", ".idx"):
+                    json_file.with_suffix(suffix).unlink(missing_ok=True)
+            for day_dir in {json_file.parent for json_file, _ in files}:
+                try:
+                    day_dir.rmdir()
+                except OSError:  # not empty: something else was saved there meanwhile
+                    pass
+        return result
 
+    @metrics.timed("sessions", "generate_markdown")
     def _generate_markdown(self, session_data: dict, md_path: Path) -> None:
         """Generate readable markdown transcript."""
         session_id = session_data["session_id"]
@@ -97,7 +393,8 @@ class SessionManager:
 
         for msg in session_data.get("messages", []):
             role = msg.get("role", "unknown")
-            content = msg.get("content", "")
+            # Sessions saved in their stored form (sync) reference blobs.
+            content = msg["content"] if "content" in msg else self._resolve(msg).get("content", "")
             timestamp = msg.get("timestamp", "")
 
             if role == "system":
@@ -0,0 +1,244 @@
+import atexit
+import itertools
+import json
+import os
+import queue
+import select
+import shlex
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+WORKER_SCRIPT = Path(__file__).with_name("skill_worker.py")
+
+
+class SkillError(RuntimeError):
+    """A skill run failed: the skill raised, hit a limit or its worker died."""
+
+
+class SkillTimeout(SkillError):
+    pass
+
+
+class _Worker:
+    """One warm ``skill_worker.py`` process speaking JSON lines over pipes."""
+
+    def __init__(self, memory_mb: int):
+        self.proc = subprocess.Popen(
+            [sys.executable, str(WORKER_SCRIPT), "--memory-mb", str(memory_mb)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            bufsize=0,
+        )
+        self.runs = 0
+        self._buffer = b""
+
+    def call(self, request: dict, timeout: float) -> dict:
+        try:
+            self.proc.stdin.write(json.dumps(request, ensure_ascii=False, default=str).encode("utf-8") + b"\n")
+        except (BrokenPipeError, OSError):
+            raise SkillError(self._exit_reason()) from None
+        self.runs += 1
+
+        fd = self.proc.stdout.fileno()
+        deadline = time.monotonic() + timeout
+        while b"\n" not in self._buffer:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise SkillTimeout(f"Skill timed out after {timeout:g}s")
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if ready:
+                chunk = os.read(fd, 1 << 16)
+                if not chunk:
+                    raise SkillError(self._exit_reason())
+                self._buffer += chunk
+        line, _, self._buffer = self._buffer.partition(b"\n")
+        return json.loads(line)
+
+    def _exit_reason(self) -> str:
+        try:
+            code = self.proc.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            return "Skill worker stopped responding"
+        if code == -getattr(signal, "SIGXCPU", -1):
+            return "Skill exceeded its CPU time limit"
+        return f"Skill worker exited with code {code}"
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def close(self) -> None:
+        if self.alive():
+            self.proc.stdin.close()
+            try:
+                self.proc.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                self.kill()
+
+    def kill(self) -> None:
+        self.proc.kill()
+        self.proc.wait()
+
+
+class SkillPool:
+    """Pool of warm skill workers.
+
+    At most ``workers`` runs execute at once; further callers block until a
+    worker is free. Each run has a wall-clock ``timeout`` and a CPU time cap
+    (``cpu_seconds``), and every worker an address-space cap (``memory_mb``).
+    A worker that times out, hits a limit or crashes is killed and replaced
+    on demand; workers are also recycled after ``max_runs`` runs to bound
+    leaks in skill code.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        timeout: float = 60,
+        memory_mb: int = 2048,
+        cpu_seconds: float = 60,
+        max_runs: int = 200,
+    ):
+        self.size = max(workers, 1)
+        self.timeout = timeout
+        self.memory_mb = memory_mb
+        self.cpu_seconds = cpu_seconds
+        self.max_runs = max_runs
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._idle: queue.LifoQueue[_Worker] = queue.LifoQueue()
+        self._ids = itertools.count()
+        self._closed = False
+
+    def warm(self, count: int | None = None) -> None:
+        """Start workers ahead of the first runs."""
+        for _ in range(min(count or self.size, self.size) - self._idle.qsize()):
+            self._idle.put(_Worker(self.memory_mb))
+
+    def _checkout(self) -> _Worker:
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                return _Worker(self.memory_mb)
+            if worker.alive():
+                return worker
+
+    def run(
+        self,
+        script: Path,
+        input: Any,
+        params: dict | None = None,
+        function: str = "run",
+        timeout: float | None = None,
+    ) -> Any:
+        """Call ``function(input, **params)`` from ``script`` in a worker and return its result."""
+        if self._closed:
+            raise SkillError("Skill pool is closed")
+        request = {
+            "id": next(self._ids),
+            "script": str(Path(script).resolve()),
+            "function": function,
+            "input": input,
+            "params": params or {},
+            "cpu_seconds": self.cpu_seconds,
+        }
+        with self._slots:
+            worker = self._checkout()
+            try:
+                response = worker.call(request, timeout or self.timeout)
+            except BaseException:
+                worker.kill()
+                raise
+            if worker.runs >= self.max_runs or self._closed:
+                worker.close()
+            else:
+                self._idle.put(worker)
+        if not response.get("ok"):
+            raise SkillError(response.get("error", "Skill failed"))
+        return response.get("result")
+
+    def close(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+def run_command(
+    command: str,
+    skill_dir: Path,
+    input: Any,
+    params: dict | None = None,
+    timeout: float = 60,
+    memory_mb: int = 2048,
+    cpu_seconds: float = 60,
+) -> Any:
+    """Run a skill's ``command`` once in a fresh process (skills without an entrypoint).
+
+    The input is written to a temporary JSON file whose path is appended to
+    the command, followed by ``--key value`` for each parameter; the command
+    must print its result as JSON. Memory and CPU limits are set by
+    ``skill_worker.py --exec``, which then execs the command.
+    """
+    argv = shlex.split(command)
+    if argv and argv[0] in ("python", "python3"):
+        argv[0] = sys.executable
+    # Script paths in commands are relative to the skill directory.
+    argv = [str(skill_dir / arg) if (skill_dir / arg).is_file() else arg for arg in argv]
+
+    with tempfile.NamedTemporaryFile("w", suffix=".json", encoding="utf-8", delete=False) as f:
+        json.dump(input, f, ensure_ascii=False, default=str)
+    try:
+        argv.append(f.name)
+        for key, value in (params or {}).items():
+            argv += [f"--{key.replace('_', '-')}", str(value)]
+        if resource is not None:
+            argv = [
+                sys.executable, str(WORKER_SCRIPT),
+                "--memory-mb", str(memory_mb), "--cpu-seconds", str(cpu_seconds), "--exec", *argv,
+            ]
+        try:
+            completed = subprocess.run(argv, capture_output=True, text=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            raise SkillTimeout(f"Skill timed out after {timeout:g}s") from None
+    finally:
+        os.unlink(f.name)
+    if completed.returncode != 0:
+        detail = (completed.stderr or completed.stdout).strip().splitlines()
+        raise SkillError(f"Skill exited with code {completed.returncode}: {detail[-1] if detail else ''}")
+    try:
+        return json.loads(completed.stdout)
+    except ValueError:
+        raise SkillError("Skill did not print a JSON result") from None
+
+
+_pool: SkillPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_pool(settings: dict) -> SkillPool:
+    """The process-wide pool, configured from the ``[skills]`` settings."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = SkillPool(
+                workers=settings.get("workers", 2),
+                timeout=settings.get("timeout", 60),
+                memory_mb=settings.get("memory_mb", 2048),
+                cpu_seconds=settings.get("cpu_seconds", 60),
+                max_runs=settings.get("max_runs_per_worker", 200),
+            )
+            atexit.register(_pool.close)
+        return _pool
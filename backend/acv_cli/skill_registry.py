@@ -0,0 +1,153 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Callable
+
+from . import metrics
+from .models import Skill
+
+INDEX_VERSION = 2
+
+
+class SkillRegistry:
+    """Parsed skills of one skills directory, kept in sync by stat checks.
+
+    The manifest maps each skill to the ``(mtime_ns, size)`` of its
+    ``SKILL.md``. ``refresh`` stats every ``SKILL.md`` (no reads) and parses
+    only the new or changed ones, so hot-reloading an edited skill costs one
+    parse. Parsed metadata is persisted to ``index_path``; a cold start takes
+    every unchanged skill from there without parsing any markdown.
+    """
+
+    def __init__(self, skills_dir: Path, index_path: Path | None, parse: Callable[[str, Path], Skill | None]):
+        self.skills_dir = Path(skills_dir)
+        self.index_path = Path(index_path) if index_path else None
+        self._parse = parse
+        self._manifest: dict[str, tuple[int, int]] = {}
+        self._skills: dict[str, Skill] = {}
+        self._lock = threading.Lock()
+        self.generation = 0
+        self.parsed = 0
+        self._load_index()
+
+    def _load_index(self) -> None:
+        if self.index_path is None or not self.index_path.exists():
+            return
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("version") != INDEX_VERSION or index.get("skills_dir") != str(self.skills_dir.resolve()):
+                return
+            for skill_id, entry in index["skills"].items():
+                self._skills[skill_id] = Skill.model_validate(entry["skill"])
+                self._manifest[skill_id] = tuple(entry["stat"])
+        except (OSError, ValueError, KeyError, TypeError):
+            # A corrupt or foreign index only costs a full parse.
+            self._skills.clear()
+            self._manifest.clear()
+
+    def _save_index(self) -> None:
+        if self.index_path is None:
+            return
+        index = {
+            "version": INDEX_VERSION,
+            "skills_dir": str(self.skills_dir.resolve()),
+            "skills": {
+                skill_id: {"stat": list(self._manifest[skill_id]), "skill": skill.model_dump(mode="json")}
+                for skill_id, skill in self._skills.items()
+                if skill_id in self._manifest  # invalidated skills are re-parsed on the next start
+            },
+        }
+        tmp = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}.tmp")
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(index, f, ensure_ascii=False, indent=2)
+            os.replace(tmp, self.index_path)
+        except OSError:
+            pass  # The index only speeds up cold starts.
+
+    def _stat(self, skill_id: str) -> tuple[int, int] | None:
+        try:
+            st = os.stat(self.skills_dir / skill_id / "SKILL.md")
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _sync(self, skill_id: str, stat: tuple[int, int] | None) -> bool:
+        """Bring one skill in line with its ``SKILL.md``; True if anything changed."""
+        if stat is None:
+            if skill_id not in self._manifest:
+                return False
+            del self._manifest[skill_id]
+            self._skills.pop(skill_id, None)
+            return True
+        if self._manifest.get(skill_id) == stat:
+            return False
+        skill = self._parse(skill_id, self.skills_dir / skill_id / "SKILL.md")
+        self.parsed += 1
+        self._manifest[skill_id] = stat
+        if skill is None:
+            self._skills.pop(skill_id, None)
+        else:
+            self._skills[skill_id] = skill
+        return True
+
+    @metrics.timed("skills", "registry_refresh")
+    def refresh(self) -> bool:
+        """Re-check every skill; True if any was added, changed or removed."""
+        with self._lock:
+            present = {}
+            if self.skills_dir.exists():
+                for entry in os.scandir(self.skills_dir):
+                    if entry.is_dir():
+                        present[entry.name] = self._stat(entry.name)
+            changed = False
+            for skill_id in set(self._manifest) | set(present):
+                changed |= self._sync(skill_id, present.get(skill_id))
+            metrics.observe_items("skills", "registry_refresh", len(present), "files")
+            if changed:
+                self.generation += 1
+                self._save_index()
+            return changed
+
+    def skills(self) -> list[Skill]:
+        """All skills, sorted by ID, after a refresh."""
+        self.refresh()
+        with self._lock:
+            return sorted(self._skills.values(), key=lambda skill: skill.skill_id)
+
+    def get(self, skill_id: str) -> Skill | None:
+        """One skill, re-parsed only if its ``SKILL.md`` changed since it was last seen."""
+        if not skill_id or "/" in skill_id or "\\" in skill_id or skill_id.startswith("."):
+            return None
+        with self._lock:
+            if self._sync(skill_id, self._stat(skill_id)):
+                self.generation += 1
+                self._save_index()
+            return self._skills.get(skill_id)
+
+    def invalidate(self, skill_id: str | None = None) -> None:
+        """Forget cached state so the next access re-parses (e.g. after writing a skill)."""
+        with self._lock:
+            if skill_id is None:
+                self._manifest.clear()
+            else:
+                self._manifest.pop(skill_id, None)
+
+
+_registries: dict[Path, SkillRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_registry(
+    skills_dir: Path, index_path: Path | None, parse: Callable[[str, Path], Skill | None]
+) -> SkillRegistry:
+    """The process-wide registry of ``skills_dir``."""
+    key = Path(skills_dir).resolve()
+    with _registries_lock:
+        registry = _registries.get(key)
+        if registry is None:
+            registry = _registries[key] = SkillRegistry(skills_dir, index_path, parse)
+        return registry
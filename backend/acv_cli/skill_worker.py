@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Warm worker process for skill runs, started by ``acv_cli.skill_pool``.
+
+Reads one JSON request per line on stdin and answers each with one JSON
+line on stdout. Skill scripts are imported once and reused until they
+change on disk, so a run costs a function call instead of an interpreter
+start. Uses only the standard library (and no acv_cli imports) so workers
+start fast.
+
+Request:  {"id", "script", "function", "input", "params", "cpu_seconds"}
+Response: {"id", "ok", "result" | "error", "seconds"}
+
+With ``--exec COMMAND...`` it instead sets its memory and CPU limits and
+execs the command, so one-off skill commands get rlimits without a
+``preexec_fn`` in the (threaded) parent.
+"""
+
+import argparse
+import importlib.util
+import json
+import math
+import os
+import sys
+import time
+import traceback
+
+try:
+    import resource
+except ImportError:  # not available on Windows: runs are only bounded by the wall-clock timeout
+    resource = None
+
+_modules: dict[str, tuple[int, object]] = {}
+
+
+def _load(script: str):
+    mtime = os.stat(script).st_mtime_ns
+    cached = _modules.get(script)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    script_dir = os.path.dirname(script)
+    if script_dir not in sys.path:
+        sys.path.insert(0, script_dir)
+    spec = importlib.util.spec_from_file_location(f"acv_skill_{len(_modules)}", script)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    _modules[script] = (mtime, module)
+    return module
+
+
+def _limit_memory(memory_mb: int) -> None:
+    if resource is None or not memory_mb:
+        return
+    limit = memory_mb * 1024 * 1024
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _limit_cpu(seconds: float | None) -> None:
+    """Arm RLIMIT_CPU for the next run; the limit counts the worker's total CPU time."""
+    if resource is None or not seconds:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    limit = math.ceil(usage.ru_utime + usage.ru_stime + seconds)
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    # Exceeding it raises SIGXCPU, which terminates the worker; the pool replaces it.
+    resource.setrlimit(resource.RLIMIT_CPU, (limit, hard))
+
+
+def _handle(request: dict) -> dict:
+    _limit_cpu(request.get("cpu_seconds"))
+    start = time.perf_counter()
+    try:
+        module = _load(request["script"])
+        function = getattr(module, request.get("function") or "run")
+        result = function(request.get("input"), **(request.get("params") or {}))
+        response = {"ok": True, "result": result}
+    except MemoryError:
+        response = {"ok": False, "error": "MemoryError: skill exceeded its memory limit"}
+    except Exception as e:
+        response = {"ok": False, "error": f"{type(e).__name__}: {e}", "traceback": traceback.format_exc()}
+    response["id"] = request.get("id")
+    response["seconds"] = time.perf_counter() - start
+    return response
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--memory-mb", type=int, default=0)
+    parser.add_argument("--cpu-seconds", type=float, default=0)
+    parser.add_argument("--exec", nargs=argparse.REMAINDER, dest="command")
+    args = parser.parse_args()
+
+    if args.command:
+        _limit_memory(args.memory_mb)
+        _limit_cpu(args.cpu_seconds)
+        os.execvp(args.command[0], args.command)
+
+    # Responses get their own copy of stdout; fd 1 is pointed at stderr so
+    # anything a skill prints cannot corrupt the protocol.
+    out = os.fdopen(os.dup(1), "w", encoding="utf-8")
+    os.dup2(2, 1)
+    _limit_memory(args.memory_mb)
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            response = {"id": None, "ok": False, "error": f"Invalid request: {e}"}
+        else:
+            response = _handle(request)
+        try:
+            encoded = json.dumps(response, ensure_ascii=False, default=str)
+        except (TypeError, ValueError) as e:
+            encoded = json.dumps({"id": response["id"], "ok": False, "error": f"Result is not JSON: {e}"})
+        out.write(encoded + "\n")
+        out.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,40 +3,43 @@ from pathlib import Path
 from typing import Any, Optional
 from datetime import datetime
 
+from . import metrics
 from .config import get_config
 from .models import Skill
+from .skill_pool import SkillError, get_pool, run_command
+from .skill_registry import get_registry
 
 class SkillManager:
     def __init__(self):
         self.config = get_config()
         self.skills_dir = Path(self.config.data_paths["skills_dir"])
         self.skills_dir.mkdir(parents=True, exist_ok=True)
+        index_path = Path(self.config.data_paths.get("base_dir", "./data")) / "skills_index.json"
+        self.registry = get_registry(self.skills_dir, index_path, self._parse_skill)
 
+    @metrics.timed("skills", "list_skills")
     def list_skills(self) -> list[dict]:
         """List all skills in the skills directory."""
-        skills = []
-        if not self.skills_dir.exists():
-            return []
-
-        for skill_dir in self.skills_dir.iterdir():
-            if not skill_dir.is_dir():
-                continue
-            skill = self.load_skill(skill_dir.name)
-            if skill:
-                skills.append({
-                    "skill_id": skill.skill_id,
-                    "name": skill.name,
-                    "description": skill.description,
-                    "command": skill.command,
-                    "created_at": skill.created_at.isoformat(),
-                })
-        return skills
-
+        return [
+            {
+                "skill_id": skill.skill_id,
+                "name": skill.name,
+                "description": skill.description,
+                "command": skill.command,
+                "created_at": skill.created_at.isoformat(),
+            }
+            for skill in self.registry.skills()
+        ]
+
+    @metrics.timed("skills", "load_skill")
     def load_skill(self, skill_id: str) -> Skill | None:
-        """Load a skill by ID."""
-        skill_dir = self.skills_dir / skill_id
-        skill_md = skill_dir / "SKILL.md"
+        """Load a skill by ID (cached; re-parsed only when its SKILL.md changes)."""
+        return self.registry.get(skill_id)
 
+    @staticmethod
+    @metrics.timed("skills", "parse_skill")
+    def _parse_skill(skill_id: str, skill_md: Path) -> Skill | None:
+        """Parse a SKILL.md file."""
         if not skill_md.exists():
             return None
 
@@ -52,6 +55,9 @@ class SkillManager:
             else:
                 frontmatter = ""
                 body = content
+        elif "\n---\n" in content:
+            # Frontmatter without the opening fence, as in the bundled skills
+            frontmatter, body = content.split("\n---\n", 1)
         else:
             frontmatter = ""
             body = content
@@ -74,7 +80,8 @@ class SkillManager:
             skill_id=data.get("skill_id", skill_id),
             name=data.get("name", skill_id),
             description=description,
-            command=data.get("command"),
+            command=data.get("command") or None,
+            entrypoint=data.get("entrypoint") or None,
             parameters=json.loads(data.get("parameters", "{}")),
             created_at=datetime.fromisoformat(data.get("created_at", datetime.now().isoformat())),
         )
@@ -84,6 +91,7 @@ class SkillManager:
         skill = self.load_skill(skill_id)
         return skill.command if skill else None
 
+    @metrics.timed("skills", "validate_skill")
     def validate_skill(self, skill_id: str) -> dict:
         """Validate a skill structure."""
         skill_dir = self.skills_dir / skill_id
@@ -115,6 +123,13 @@ class SkillManager:
             if not filepath.exists():
                 result["warnings"].append(f"Optional file missing: {filename}")
 
+        skill = self.load_skill(skill_id)
+        if skill and skill.entrypoint:
+            script = skill.entrypoint.partition(":")[0]
+            if not (skill_dir / script).exists():
+                result["valid"] = False
+                result["errors"].append(f"Entrypoint script missing: {script}")
+
         return result
 
     def create_skill_template(
@@ -159,25 +174,51 @@ Describe how to use this skill.
         skill_md = skill_dir / "SKILL.md"
         with open(skill_md, "w", encoding="utf-8") as f:
             f.write(skill_md_content)
+        # Same-size rewrites within the mtime granularity would otherwise go unnoticed.
+        self.registry.invalidate(skill_id)
 
         return skill_dir
 
+    @metrics.timed("skills", "run_skill")
     def run_skill(
         self,
         skill_id: str,
         session_data: dict,
         **kwargs,
     ) -> dict:
-        """Run a skill on session data."""
+        """Run a skill on session data.
+
+        Skills with an ``entrypoint`` (``script.py:function``) are called in
+        the warm worker pool; others fall back to spawning their ``command``.
+        Both are bounded by the ``[skills]`` timeout and resource limits.
+        """
         skill = self.load_skill(skill_id)
         if not skill:
             return {"error": f"Skill not found: {skill_id}"}
 
-        # Skill execution logic would go here
-        # This is a placeholder - actual implementation depends on skill type
+        settings = self.config.skills
+        skill_dir = self.skills_dir / skill_id
+        try:
+            if skill.entrypoint:
+                script, _, function = skill.entrypoint.partition(":")
+                result = get_pool(settings).run(skill_dir / script, session_data, kwargs, function or "run")
+            elif skill.command:
+                result = run_command(
+                    skill.command,
+                    skill_dir,
+                    session_data,
+                    kwargs,
+                    timeout=settings.get("timeout", 60),
+                    memory_mb=settings.get("memory_mb", 2048),
+                    cpu_seconds=settings.get("cpu_seconds", 60),
+                )
+            else:
+                return {"error": f"Skill has no entrypoint or command: {skill_id}"}
+        except SkillError as e:
+            return {"error": str(e)}
 
         return {
             "skill_id": skill_id,
             "session_id": session_data.get("session_id"),
-            "result": "Skill execution placeholder",
+            "result": result,
         }
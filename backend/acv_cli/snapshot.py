@@ -0,0 +1,319 @@
+"""Consistent, incremental snapshots of the vault (``data/``).
+
+Layout under the snapshot directory::
+
+    objects/<2 hex>/<sha256>        file contents, stored once (read-only)
+    <id>/manifest.json              path -> sha256, size, mtime_ns of every file
+    <id>/tree/...                   the vault as hard links into objects/
+
+SQLite databases (``index.db``, session archives) are copied with the
+online backup API, so each is a consistent image even while the API or
+``acv`` write to it. The index is copied first: every file it refers to
+was written before that, so the snapshot may contain files written later
+that the index does not know of yet, but never index rows without their
+files.
+
+A snapshot only reads files whose size or mtime differ from the previous
+snapshot, and only stores contents not stored before: an unchanged vault
+costs a walk, a manifest and hard links. A snapshot becomes visible when
+its manifest is written, so an interrupted one leaves no partial state
+behind except unreferenced objects, which ``prune`` removes.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from pathlib import Path
+
+MANIFEST = "manifest.json"
+_CHUNK = 1 << 20
+_SQLITE_MAGIC = b"SQLite format 3\x00"
+_SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlar")
+# Rebuilt from the main file, or in flight: never part of a snapshot.
+_SKIP_SUFFIXES = (".tmp", "-journal", "-wal", "-shm")
+
+
+class SnapshotError(RuntimeError):
+    pass
+
+
+def _is_sqlite(path: Path) -> bool:
+    if not path.name.endswith(_SQLITE_SUFFIXES):
+        return False
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(_SQLITE_MAGIC)) == _SQLITE_MAGIC
+    except OSError:
+        return False
+
+
+def _backup_sqlite(source: Path, target: Path) -> None:
+    src = sqlite3.connect(f"file:{source}?mode=ro", uri=True)
+    dst = sqlite3.connect(target)
+    try:
+        src.backup(dst)
+    finally:
+        dst.close()
+        src.close()
+
+
+class SnapshotStore:
+    """Snapshots of ``data_dir`` kept under ``root``."""
+
+    def __init__(self, root: Path, data_dir: Path, db_path: Path | None = None, workers: int = 4):
+        self.root = Path(root)
+        self.data_dir = Path(data_dir)
+        self.db_path = Path(db_path) if db_path else None
+        self.workers = max(workers, 1)
+        self.objects = self.root / "objects"
+
+    def _object(self, digest: str) -> Path:
+        return self.objects / digest[:2] / digest
+
+    def snapshots(self) -> list[dict]:
+        """Complete snapshots, oldest first (manifest headers, without the file lists)."""
+        if not self.root.exists():
+            return []
+        snapshots = []
+        for entry in sorted(os.scandir(self.root), key=lambda e: e.name):
+            manifest = Path(entry.path) / MANIFEST
+            if entry.name != "objects" and manifest.exists():
+                data = self.manifest(entry.name)
+                data.pop("files")
+                snapshots.append(data)
+        return snapshots
+
+    def manifest(self, snapshot_id: str) -> dict:
+        path = self.root / snapshot_id / MANIFEST
+        if not path.exists():
+            raise SnapshotError(f"Snapshot not found: {snapshot_id}")
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def _walk(self) -> list[Path]:
+        files = []
+        for dirpath, dirnames, filenames in os.walk(self.data_dir):
+            dirnames.sort()
+            for name in sorted(filenames):
+                if not name.endswith(_SKIP_SUFFIXES):
+                    files.append(Path(dirpath) / name)
+        return files
+
+    def _ingest(self, path: Path) -> tuple[dict, bool]:
+        """Copy ``path`` into the object store, hashing it on the way.
+
+        Hashing the bytes that are copied (rather than hashing, then copying)
+        keeps object names right even if the file is replaced meanwhile.
+        Returns the manifest entry and whether the contents were new.
+        """
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp = tempfile.mkstemp(suffix=".tmp", dir=self.objects)
+        try:
+            with open(path, "rb") as src, os.fdopen(fd, "wb") as dst:
+                st = os.fstat(src.fileno())
+                while chunk := src.read(_CHUNK):
+                    digest.update(chunk)
+                    dst.write(chunk)
+                    size += len(chunk)
+            # A file still being appended to (live sessions) is taken as far as it was read.
+            entry = {"sha256": digest.hexdigest(), "size": size, "mtime_ns": st.st_mtime_ns}
+            target = self._object(entry["sha256"])
+            if target.exists():
+                os.unlink(tmp)
+                return entry, False
+            target.parent.mkdir(exist_ok=True)
+            os.chmod(tmp, 0o444)
+            os.replace(tmp, target)
+            return entry, True
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    def create(self) -> dict:
+        """Take a snapshot; returns its manifest header and copy statistics."""
+        if self.root.resolve().is_relative_to(self.data_dir.resolve()):
+            raise SnapshotError(f"Snapshot directory {self.root} must be outside {self.data_dir}")
+        t0 = time.perf_counter()
+        created = datetime.now(timezone.utc)
+        snapshot_id = created.strftime("%Y%m%dT%H%M%S%fZ")
+        snapshots = self.snapshots()
+        base = self.manifest(snapshots[-1]["id"])["files"] if snapshots else {}
+
+        snapshot_dir = self.root / snapshot_id
+        tree = snapshot_dir / "tree"
+        tree.mkdir(parents=True)
+        self.objects.mkdir(parents=True, exist_ok=True)
+
+        with tempfile.TemporaryDirectory(dir=self.root) as staging:
+            # Databases first (the index before anything else), from consistent backup images.
+            walked = self._walk()
+            databases = [p for p in walked if _is_sqlite(p)]
+            if self.db_path and self.db_path.exists():
+                databases.sort(key=lambda p: p.resolve() != self.db_path.resolve())
+            sources: dict[str, Path] = {}
+            for path in databases:
+                image = Path(staging) / f"{len(sources)}.db"
+                _backup_sqlite(path, image)
+                sources[path.relative_to(self.data_dir).as_posix()] = image
+            for path in walked:
+                sources.setdefault(path.relative_to(self.data_dir).as_posix(), path)
+
+            def snapshot_file(item: tuple[str, Path]) -> tuple[str, dict, bool, bool]:
+                rel, source = item
+                st = source.stat()
+                previous = base.get(rel)
+                reused = (
+                    previous is not None
+                    and source.is_relative_to(self.data_dir)
+                    and previous["size"] == st.st_size
+                    and previous["mtime_ns"] == st.st_mtime_ns
+                    and self._object(previous["sha256"]).exists()
+                )
+                entry, stored = (previous, False) if reused else self._ingest(source)
+                link = tree / rel
+                link.parent.mkdir(parents=True, exist_ok=True)
+                try:
+                    os.link(self._object(entry["sha256"]), link)
+                except OSError:  # no hard links here (other filesystem, Windows share): copy
+                    shutil.copyfile(self._object(entry["sha256"]), link)
+                return rel, entry, reused, stored
+
+            with ThreadPoolExecutor(self.workers) as executor:
+                results = list(executor.map(snapshot_file, sorted(sources.items())))
+
+        files = {rel: entry for rel, entry, _, _ in results}
+        stored = [rel for rel, _, _, was_stored in results if was_stored]
+        header = {
+            "id": snapshot_id,
+            "created_at": created.isoformat(),
+            "base": snapshots[-1]["id"] if snapshots else None,
+            "data_dir": str(self.data_dir.resolve()),
+            "files_count": len(files),
+            "bytes": sum(entry["size"] for entry in files.values()),
+            "databases": sorted(rel for rel, source in sources.items() if not source.is_relative_to(self.data_dir)),
+        }
+        manifest_tmp = snapshot_dir / f"{MANIFEST}.tmp"
+        manifest_tmp.write_text(json.dumps({**header, "files": files}, indent=1), encoding="utf-8")
+        os.replace(manifest_tmp, snapshot_dir / MANIFEST)
+        return {
+            **header,
+            "hashed": sum(1 for _, _, reused, _ in results if not reused),
+            "stored": len(stored),
+            "stored_bytes": sum(files[rel]["size"] for rel in stored),
+            "seconds": time.perf_counter() - t0,
+        }
+
+    def _check(self, digest: str, size: int, target: Path | None = None) -> bool:
+        """Hash an object (copying it to ``target`` on the way); True if it is intact."""
+        h = hashlib.sha256()
+        length = 0
+        try:
+            with open(self._object(digest), "rb") as src, (open(target, "wb") if target else nullcontext()) as dst:
+                while chunk := src.read(_CHUNK):
+                    h.update(chunk)
+                    length += len(chunk)
+                    if dst:
+                        dst.write(chunk)
+        except FileNotFoundError:
+            return False
+        return length == size and h.hexdigest() == digest
+
+    def verify(self, snapshot_id: str) -> list[str]:
+        """Paths of a snapshot whose stored contents are missing or corrupt."""
+        files = self.manifest(snapshot_id)["files"]
+        with ThreadPoolExecutor(self.workers) as executor:
+            ok = executor.map(lambda e: self._check(e["sha256"], e["size"]), files.values())
+            return [rel for rel, good in zip(files, ok) if not good]
+
+    def restore(self, snapshot_id: str, target: Path | None = None) -> dict:
+        """Restore a snapshot into ``target`` (the vault by default).
+
+        Files are copied (never linked, so the vault cannot alter the
+        snapshot) and hashed in parallel into a staging directory next to
+        the target. Only if every file verifies is the current directory
+        moved aside to ``<target>.pre-restore-<time>`` and the staging
+        directory renamed into place.
+        """
+        t0 = time.perf_counter()
+        manifest = self.manifest(snapshot_id)
+        target = Path(target or self.data_dir)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=f".{target.name}.restore-", dir=target.parent))
+        files = manifest["files"]
+
+        def restore_file(item: tuple[str, dict]) -> str | None:
+            rel, entry = item
+            path = staging / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if not self._check(entry["sha256"], entry["size"], path):
+                return rel
+            os.utime(path, ns=(entry["mtime_ns"], entry["mtime_ns"]))
+            return None
+
+        try:
+            with ThreadPoolExecutor(self.workers) as executor:
+                corrupt = [rel for rel in executor.map(restore_file, files.items()) if rel]
+            if corrupt:
+                raise SnapshotError(f"{len(corrupt)} files failed verification, e.g. {corrupt[0]}")
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        previous = None
+        if target.exists():
+            previous = target.with_name(f"{target.name}.pre-restore-{time.strftime('%Y%m%d%H%M%S')}")
+            os.replace(target, previous)
+        os.replace(staging, target)
+        return {
+            "id": snapshot_id,
+            "target": str(target),
+            "files": len(files),
+            "bytes": sum(entry["size"] for entry in files.values()),
+            "previous": str(previous) if previous else None,
+            "seconds": time.perf_counter() - t0,
+        }
+
+    def prune(self, keep: int, grace_seconds: float = 3600) -> dict:
+        """Delete all but the newest ``keep`` snapshots and the objects only they used.
+
+        Objects and incomplete snapshots newer than ``grace_seconds`` are
+        kept, since they may belong to a snapshot being taken right now.
+        """
+        snapshots = [s["id"] for s in self.snapshots()]
+        removed = snapshots[:-keep] if keep > 0 else []
+        for snapshot_id in removed:
+            shutil.rmtree(self.root / snapshot_id)
+        cutoff = time.time() - grace_seconds
+        # Incomplete snapshots (no manifest) are leftovers of interrupted runs.
+        for entry in os.scandir(self.root) if self.root.exists() else ():
+            if (
+                entry.is_dir()
+                and entry.name != "objects"
+                and not (Path(entry.path) / MANIFEST).exists()
+                and entry.stat().st_mtime < cutoff
+            ):
+                shutil.rmtree(entry.path)
+
+        live = {
+            entry["sha256"]
+            for snapshot_id in snapshots[len(removed):]
+            for entry in self.manifest(snapshot_id)["files"].values()
+        }
+        objects = freed = 0
+        if self.objects.exists():
+            for shard in os.scandir(self.objects):
+                for entry in os.scandir(shard.path):
+                    stat = entry.stat()
+                    if entry.name not in live and stat.st_mtime < cutoff:
+                        freed += stat.st_size
+                        os.unlink(entry.path)
+                        objects += 1
+        return {"snapshots": len(removed), "objects": objects, "freed_bytes": freed}
@@ -6,6 +6,7 @@ from datetime import datetime
 from typing import Callable, Any
 from pathlib import Path
 
+from . import metrics
 from .config import get_config
 
 class SubprocessWrapper:
@@ -54,6 +55,7 @@ class SubprocessWrapper:
                 if not line and proc.poll() is not None:
                     break
 
+                metrics.record_subprocess_output(agent, line)
                 timestamp = datetime.now()
                 content = line.rstrip("\n")
 
@@ -64,11 +66,12 @@ class SubprocessWrapper:
                     "timestamp": timestamp.isoformat(),
                 }
                 messages.append(msg)
-                self.on_message({
-                    "type": "message",
-                    "session_id": session_id,
-                    "message": msg,
-                })
+                with metrics.stage("subprocess", "on_message"):
+                    self.on_message({
+                        "type": "message",
+                        "session_id": session_id,
+                        "message": msg,
+                    })
 
                 # Also print to stdout for visibility
                 print(content)
@@ -94,11 +97,12 @@ class SubprocessWrapper:
             "summaries": {},
         }
 
-        self.on_message({
-            "type": "session_end",
-            "session_id": session_id,
-            "data": session_data,
-        })
+        with metrics.stage("subprocess", "session_end"):
+            self.on_message({
+                "type": "session_end",
+                "session_id": session_id,
+                "data": session_data,
+            })
 
         return session_data
 
@@ -139,6 +143,7 @@ class SubprocessWrapper:
                 if not line and proc.poll() is not None:
                     break
 
+                metrics.record_subprocess_output(agent, line)
                 timestamp = datetime.now()
                 content = line.rstrip("\n")
 
@@ -148,11 +153,12 @@ class SubprocessWrapper:
                     "timestamp": timestamp.isoformat(),
                 }
                 messages.append(msg)
-                self.on_message({
-                    "type": "message",
-                    "session_id": session_id,
-                    "message": msg,
-                })
+                with metrics.stage("subprocess", "on_message"):
+                    self.on_message({
+                        "type": "message",
+                        "session_id": session_id,
+                        "message": msg,
+                    })
                 print(content)
 
                 # Send user input if available
@@ -189,10 +195,11 @@ class SubprocessWrapper:
             "summaries": {},
         }
 
-        self.on_message({
-            "type": "session_end",
-            "session_id": session_id,
-            "data": session_data,
-        })
+        with metrics.stage("subprocess", "session_end"):
+            self.on_message({
+                "type": "session_end",
+                "session_id": session_id,
+                "data": session_data,
+            })
 
         return session_data
@@ -0,0 +1,238 @@
+import heapq
+import json
+import re
+import threading
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from itertools import islice
+from operator import itemgetter
+
+# A title is also reachable from its first few inner words ("cache" -> "SQLite cache tuning").
+MAX_WORD_STARTS = 4
+MAX_LIMIT = 25
+# Ranked candidates kept per chunk / per query (> MAX_LIMIT to absorb duplicates).
+CANDIDATES = 2 * MAX_LIMIT
+# Sorted keys are stored in chunks of CHUNK_SIZE..2*CHUNK_SIZE entries.
+CHUNK_SIZE = 256
+
+_WORD_START = re.compile(r"\b\w")
+_WHITESPACE = re.compile(r"\s+")
+
+# Ranking tiers: title matched from its start > tag > title matched mid-way.
+_TIER_TITLE = 2
+_TIER_TAG = 1
+_TIER_TITLE_INNER = 0
+
+_score = itemgetter(0)
+
+
+def _normalize(text: str) -> str:
+    return _WHITESPACE.sub(" ", text).strip().lower()
+
+
+class SuggestIndex:
+    """Prefix completion over knowledge item titles and tags.
+
+    Entries are kept sorted by key in fixed-size chunks, each caching its own
+    best-ranked records. A lookup bisects to the matching key range, ranks the
+    two partial edge chunks directly and lazily merges the cached heads of the
+    chunks in between, so short prefixes with huge ranges stay cheap.
+
+    ``refresh`` follows the index generation counter and applies only rows
+    written since the last refresh (``INSERT OR REPLACE`` gives replaced rows a
+    new rowid, except for the newest row, which keeps it and is therefore
+    always re-read). It falls back to a full rebuild when rows disappear.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._chunk_keys: list[list[str]] = []
+        self._chunk_records: list[list[tuple]] = []
+        self._chunk_top: list[list[tuple] | None] = []
+        self._chunk_first: list[str] = []
+        self._item_entries: dict[str, list[tuple[str, tuple]]] = {}
+        self._item_tags: dict[str, list[str]] = {}
+        self._tag_counts: Counter = Counter()
+        self._generation: int | None = None
+        self._max_rowid = 0
+
+    def __len__(self) -> int:
+        return sum(len(keys) for keys in self._chunk_keys)
+
+    # -- storage --------------------------------------------------------
+
+    def _load_sorted(self, entries: list[tuple[str, tuple]]) -> None:
+        entries.sort(key=itemgetter(0))
+        for start in range(0, len(entries), CHUNK_SIZE):
+            chunk = entries[start:start + CHUNK_SIZE]
+            self._chunk_keys.append([key for key, _ in chunk])
+            records = [record for _, record in chunk]
+            self._chunk_records.append(records)
+            self._chunk_top.append(heapq.nlargest(CANDIDATES, records, key=_score))
+            self._chunk_first.append(chunk[0][0])
+
+    def _insert(self, key: str, record: tuple) -> None:
+        if not self._chunk_keys:
+            self._load_sorted([(key, record)])
+            return
+        c = max(bisect_right(self._chunk_first, key) - 1, 0)
+        keys = self._chunk_keys[c]
+        i = bisect_right(keys, key)
+        keys.insert(i, key)
+        self._chunk_records[c].insert(i, record)
+        self._chunk_top[c] = None
+        self._chunk_first[c] = keys[0]
+        if len(keys) > 2 * CHUNK_SIZE:
+            records = self._chunk_records[c]
+            self._chunk_keys[c:c + 1] = [keys[:CHUNK_SIZE], keys[CHUNK_SIZE:]]
+            self._chunk_records[c:c + 1] = [records[:CHUNK_SIZE], records[CHUNK_SIZE:]]
+            self._chunk_top[c:c + 1] = [None, None]
+            self._chunk_first[c:c + 1] = [keys[0], keys[CHUNK_SIZE]]
+
+    def _remove(self, key: str, record: tuple) -> None:
+        c = max(bisect_left(self._chunk_first, key) - 1, 0)
+        while c < len(self._chunk_keys) and self._chunk_first[c] <= key:
+            keys = self._chunk_keys[c]
+            for i in range(bisect_left(keys, key), bisect_right(keys, key)):
+                if self._chunk_records[c][i] == record:
+                    del keys[i]
+                    del self._chunk_records[c][i]
+                    self._chunk_top[c] = None
+                    if keys:
+                        self._chunk_first[c] = keys[0]
+                    else:
+                        del self._chunk_keys[c]
+                        del self._chunk_records[c]
+                        del self._chunk_top[c]
+                        del self._chunk_first[c]
+                    return
+            c += 1
+
+    def _top(self, c: int) -> list[tuple]:
+        top = self._chunk_top[c]
+        if top is None:
+            top = self._chunk_top[c] = heapq.nlargest(CANDIDATES, self._chunk_records[c], key=_score)
+        return top
+
+    # -- items ----------------------------------------------------------
+
+    def _title_entries(self, item_id: str, title: str, date: str) -> list[tuple[str, tuple]]:
+        lowered = _normalize(title)
+        entries = []
+        for n, match in enumerate(_WORD_START.finditer(lowered)):
+            if n > MAX_WORD_STARTS:
+                break
+            tier = _TIER_TITLE if match.start() == 0 else _TIER_TITLE_INNER
+            entries.append((lowered[match.start():], ((tier, date), "title", item_id, title)))
+        if not entries and lowered:
+            entries.append((lowered, ((_TIER_TITLE, date), "title", item_id, title)))
+        return entries
+
+    @staticmethod
+    def _tag_entry(tag: str, count: int) -> tuple[str, tuple]:
+        return _normalize(tag), ((_TIER_TAG, count), "tag", tag, tag)
+
+    def _set_tag_count(self, tag: str, delta: int) -> None:
+        old = self._tag_counts[tag]
+        if old:
+            self._remove(*self._tag_entry(tag, old))
+        new = old + delta
+        if new > 0:
+            self._tag_counts[tag] = new
+            self._insert(*self._tag_entry(tag, new))
+        else:
+            del self._tag_counts[tag]
+
+    def _remove_item(self, item_id: str) -> None:
+        for key, record in self._item_entries.pop(item_id, []):
+            self._remove(key, record)
+        for tag in self._item_tags.pop(item_id, []):
+            self._set_tag_count(tag, -1)
+
+    def _add_item(self, item_id: str, title: str, tags: list[str], date: str) -> None:
+        self._remove_item(item_id)
+        entries = self._title_entries(item_id, title, date)
+        for key, record in entries:
+            self._insert(key, record)
+        self._item_entries[item_id] = entries
+        unique_tags = list(dict.fromkeys(t for t in tags if t))
+        for tag in unique_tags:
+            self._set_tag_count(tag, 1)
+        self._item_tags[item_id] = unique_tags
+
+    def _rebuild(self, rows: list[tuple]) -> None:
+        self._reset()
+        entries = []
+        for rowid, item_id, title, tags, date in rows:
+            item_entries = self._title_entries(item_id, title, date)
+            entries.extend(item_entries)
+            self._item_entries[item_id] = item_entries
+            unique_tags = list(dict.fromkeys(t for t in json.loads(tags or "[]") if t))
+            self._item_tags[item_id] = unique_tags
+            self._tag_counts.update(unique_tags)
+            self._max_rowid = max(self._max_rowid, rowid)
+        entries.extend(self._tag_entry(tag, count) for tag, count in self._tag_counts.items())
+        self._load_sorted(entries)
+
+    def refresh(self, db) -> None:
+        """Catch up with writes made (by any process) since the last refresh."""
+        generation = db.get_generation()
+        if generation == self._generation:
+            return
+        with self._lock:
+            if generation == self._generation:
+                return
+            if self._generation is None:
+                rows, total = db.knowledge_rows_since(0)
+                self._rebuild(rows)
+            else:
+                rows, total = db.knowledge_rows_since(self._max_rowid - 1)
+                for rowid, item_id, title, tags, date in rows:
+                    self._add_item(item_id, title, json.loads(tags or "[]"), date)
+                    self._max_rowid = max(self._max_rowid, rowid)
+            if len(self._item_entries) != total:
+                self._rebuild(db.knowledge_rows_since(0)[0])
+            self._generation = generation
+
+    # -- queries --------------------------------------------------------
+
+    def _candidates(self, prefix: str) -> list[tuple]:
+        end = prefix + "\U0010ffff"
+        first = max(bisect_left(self._chunk_first, prefix) - 1, 0)
+        last = bisect_left(self._chunk_first, end)
+        ranked = []
+        for c in range(first, last):
+            keys = self._chunk_keys[c]
+            if keys[0] >= prefix and keys[-1] < end:
+                ranked.append(self._top(c))
+            else:
+                lo = bisect_left(keys, prefix)
+                hi = bisect_left(keys, end, lo)
+                if lo < hi:
+                    ranked.append(heapq.nlargest(CANDIDATES, self._chunk_records[c][lo:hi], key=_score))
+        return list(islice(heapq.merge(*ranked, key=_score, reverse=True), CANDIDATES))
+
+    def suggest(self, prefix: str, limit: int = 10) -> list[dict]:
+        """Ranked completions for ``prefix``; each item or tag appears once."""
+        prefix = _normalize(prefix)
+        if not prefix:
+            return []
+        with self._lock:
+            candidates = self._candidates(prefix)
+
+        results = []
+        seen = set()
+        for (_, weight), kind, ref, text in candidates:
+            if (kind, ref) in seen:
+                continue
+            seen.add((kind, ref))
+            if kind == "tag":
+                results.append({"text": text, "kind": kind, "count": weight})
+            else:
+                results.append({"text": text, "kind": kind, "id": ref})
+            if len(results) >= min(limit, MAX_LIMIT):
+                break
+        return results
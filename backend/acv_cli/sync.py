@@ -0,0 +1,132 @@
+"""Two-way sync of vaults through their op logs (see oplog.py).
+
+``sync(a, b)`` sends each vault the ops it is missing, found by comparing
+version vectors, in Lamport order and in batches. For every key whose
+incoming op is newer than anything the receiving vault has logged for it,
+the sender's current state is copied: session files (plus the blobs they
+reference), knowledge item files and their index rows. Each batch's index
+rows and ops are committed in one transaction, after its files are
+written, so an interrupted sync simply resumes, and re-running a finished
+one transfers nothing.
+"""
+
+import os
+from itertools import islice
+from pathlib import Path
+
+from .blobs import REF_KEY
+from .config import Config
+from .db import Database
+from .knowledge import KnowledgeManager
+from .oplog import INDEX_KNOWLEDGE, INDEX_SESSION, KNOWLEDGE, SESSION, Op, replaying
+from .sessions import SessionManager
+
+# Default layout of a data directory, relative to it.
+_LAYOUT = {
+    "sessions_dir": "sessions",
+    "knowledge_dir": "knowledge",
+    "db_path": "index.db",
+    "archive_dir": "archive",
+    "history_path": "history.db",
+}
+
+
+class Vault:
+    """The sessions, knowledge items, index and op log of one vault."""
+
+    def __init__(self, data_paths: dict[str, str]):
+        self.data_paths = data_paths
+        self.db = Database(data_paths["db_path"])
+        self.sessions = SessionManager(data_paths)
+        self.knowledge = KnowledgeManager(data_paths)
+        self.oplog = self.db.oplog
+
+    @classmethod
+    def open(cls, path: Path) -> "Vault":
+        """A vault given by its root (with a config.toml) or by its data directory."""
+        path = Path(path)
+        config_file = path / "config.toml"
+        if config_file.exists():
+            paths = Config(str(config_file)).data_paths
+            return cls({key: str(path / value) for key, value in paths.items()})
+        return cls({"base_dir": str(path), **{key: str(path / value) for key, value in _LAYOUT.items()}})
+
+
+def _newest(ops: list[Op], kind: str, known: dict[str, tuple[int, str]]) -> list[str]:
+    """Keys of ``kind`` whose newest op in ``ops`` beats the receiver's newest logged op."""
+    newest: dict[str, Op] = {}
+    for op in ops:
+        if op.kind == kind and (op.key not in newest or op.order() > newest[op.key].order()):
+            newest[op.key] = op
+    return [key for key, op in newest.items() if op.order() > known.get(key, (-1, ""))]
+
+
+def _copy_file(source: Path, target: Path) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(source.read_bytes())
+    os.replace(tmp, target)
+
+
+def _apply(src: Vault, dst: Vault, ops: list[Op]) -> dict:
+    stats = {"ops": len(ops), "sessions": 0, "items": 0, "blobs": 0}
+    latest = {
+        kind: dst.oplog.latest(kind, list({op.key for op in ops if op.kind == kind}))
+        for kind in (SESSION, KNOWLEDGE, INDEX_SESSION, INDEX_KNOWLEDGE)
+    }
+
+    with replaying():
+        for session_id in _newest(ops, SESSION, latest[SESSION]):
+            session = src.sessions.load_session(session_id, resolve=False)
+            if session is None:
+                continue
+            for msg in session.get("messages", []):
+                digest = msg.get(REF_KEY)
+                if digest and not dst.sessions.blobs._path(digest).exists():
+                    dst.sessions.blobs.put(src.sessions.blobs.get(digest))
+                    stats["blobs"] += 1
+            dst.sessions.save_session(session)
+            stats["sessions"] += 1
+
+        for item_id in _newest(ops, KNOWLEDGE, latest[KNOWLEDGE]):
+            source = src.knowledge.find_item_path(item_id)
+            if source is None:
+                continue
+            _copy_file(source, dst.knowledge.knowledge_dir / Path(*source.parts[-3:]))
+            stats["items"] += 1
+
+    sessions = src.db.session_rows(_newest(ops, INDEX_SESSION, latest[INDEX_SESSION]))
+    items = [
+        # Index paths are re-rooted in the receiving vault: <category>/<year>/<id>.md
+        (item, str(dst.knowledge.knowledge_dir / Path(*Path(path).parts[-3:])))
+        for item, path in src.db.knowledge_items(_newest(ops, INDEX_KNOWLEDGE, latest[INDEX_KNOWLEDGE]))
+    ]
+    dst.db.apply_remote(sessions, items, ops)
+    return stats
+
+
+def transfer(src: Vault, dst: Vault, batch: int = 500, dry_run: bool = False) -> dict:
+    """Apply to ``dst`` the ops of ``src`` it is missing."""
+    total = {"ops": 0, "sessions": 0, "items": 0, "blobs": 0}
+    missing = src.oplog.missing(dst.oplog.vector())
+    while ops := list(islice(missing, batch)):
+        if dry_run:
+            total["ops"] += len(ops)
+            continue
+        for key, value in _apply(src, dst, ops).items():
+            total[key] += value
+    return total
+
+
+def sync(local: Vault, remote: Vault, batch: int = 500, dry_run: bool = False) -> dict:
+    """Exchange missing ops between two vaults; returns what each side received."""
+    if local.oplog.origin == remote.oplog.origin:
+        raise ValueError("Both paths are the same vault (or copies of it with the same origin)")
+    logged = {"local": 0, "remote": 0}
+    if not dry_run:
+        logged = {"local": local.db.log_unlogged(), "remote": remote.db.log_unlogged()}
+    return {
+        "logged": logged,
+        "pulled": transfer(remote, local, batch, dry_run),
+        "pushed": transfer(local, remote, batch, dry_run),
+    }
@@ -0,0 +1,182 @@
+import atexit
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable
+
+from . import metrics
+
+# A write: called with the writer's cursor inside a transaction.
+Write = Callable[[sqlite3.Cursor], Any]
+
+_STOP = object()
+
+
+class WriteQueue:
+    """Single writer thread that applies index writes in group commits.
+
+    Callers ``submit`` a write and get a ``Future`` that resolves once the
+    transaction containing it is committed (``asyncio.wrap_future`` makes it
+    awaitable). The writer takes every write queued at that moment, waiting
+    up to ``max_delay`` seconds for more, and commits them together, at most
+    ``max_batch`` per transaction: one fsync is shared by everything that
+    arrived during the previous commit. The delay only applies while writes
+    are actually concurrent (the previous commit held more than one), so a
+    lone caller is never held back. Each write runs in its own savepoint,
+    so a failing write only fails its own future.
+    """
+
+    def __init__(self, db_path: Path, max_batch: int = 256, max_delay: float = 0.001, busy_timeout: float = 30):
+        self.db_path = Path(db_path)
+        self.max_batch = max(max_batch, 1)
+        self.max_delay = max_delay
+        self.busy_timeout = busy_timeout
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self.commits = 0
+        self.writes = 0
+        self._last_batch = 0
+        self._thread = threading.Thread(target=self._run, name=f"acv-writer:{self.db_path.name}", daemon=True)
+        self._thread.start()
+
+    def submit(self, write: Write) -> Future:
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Write queue is closed")
+            self._queue.put((write, future))
+        return future
+
+    def _collect(self, first) -> tuple[list, bool]:
+        batch = [first]
+        deadline = time.monotonic() + (self.max_delay if self._last_batch > 1 else 0)
+        while len(batch) < self.max_batch:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout, isolation_level=None)
+        cursor = conn.cursor()
+        stop = False
+        while not stop:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            batch, stop = self._collect(first)
+            self._commit(cursor, batch)
+        conn.close()
+
+    @metrics.timed("db", "group_commit")
+    def _commit(self, cursor: sqlite3.Cursor, batch: list) -> None:
+        results = []
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            for write, future in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                cursor.execute("SAVEPOINT write")
+                try:
+                    result = write(cursor)
+                except BaseException as e:
+                    cursor.execute("ROLLBACK TO write")
+                    cursor.execute("RELEASE write")
+                    future.set_exception(e)
+                else:
+                    cursor.execute("RELEASE write")
+                    results.append((future, result))
+            cursor.execute("COMMIT")
+        except BaseException as e:
+            if cursor.connection.in_transaction:
+                cursor.execute("ROLLBACK")
+            for future, _ in results:
+                future.set_exception(e)
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        self.commits += 1
+        self.writes += len(batch)
+        self._last_batch = len(batch)
+        metrics.observe_items("db", "group_commit", len(batch), "writes")
+        # Callers only learn about their write once it is durable.
+        for future, result in results:
+            future.set_result(result)
+
+    def close(self) -> None:
+        """Commit everything queued so far and stop the writer."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        if threading.current_thread() is not self._thread:
+            self._thread.join()
+
+
+_queues: dict[Path, WriteQueue] = {}
+_queues_lock = threading.Lock()
+
+
+def get_write_queue(db_path: Path, settings: dict | None = None) -> WriteQueue:
+    """The process-wide write queue of ``db_path``, configured from ``[storage]``."""
+    key = Path(db_path).resolve()
+    with _queues_lock:
+        write_queue = _queues.get(key)
+        if write_queue is None or write_queue._closed:
+            settings = settings or {}
+            write_queue = _queues[key] = WriteQueue(
+                db_path,
+                max_batch=settings.get("commit_batch", 256),
+                max_delay=settings.get("commit_delay", 0.001),
+            )
+            atexit.register(write_queue.close)
+        return write_queue
+
+
+def submit_write(db_path: Path, write: Write, settings: dict | None = None) -> Future:
+    """Queue ``write`` for the next group commit of ``db_path``; the future resolves once it is committed.
+
+    With ``group_commit = false`` in ``settings`` (``[storage]``) the write
+    is committed on its own connection before returning.
+    """
+    settings = settings or {}
+    if settings.get("group_commit", True):
+        return get_write_queue(db_path, settings).submit(write)
+    future: Future = Future()
+    # Autocommit mode with an explicit BEGIN IMMEDIATE, as in WriteQueue._commit:
+    # writes that read before they insert (op sequence numbers) need the write
+    # lock from their first statement, or two processes can read the same state.
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    cursor = conn.cursor()
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            result = write(cursor)
+            cursor.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                cursor.execute("ROLLBACK")
+            raise
+    except Exception as e:
+        future.set_exception(e)
+    else:
+        future.set_result(result)
+    finally:
+        conn.close()
+    return future
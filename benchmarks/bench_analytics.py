@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Benchmark dashboard aggregations: session JSON loop vs. the columnar export.
+
+Usage: python benchmarks/bench_analytics.py [--sessions 3000] [--messages 8] [--formats parquet arrow csv]
+
+Builds a synthetic vault (benchmarks/corpus.py) and computes per-month,
+per-model message counts, session lengths and mean response times the
+straightforward way, loading every session. Then the vault is exported in
+each format (``acv export``) and the same figures come from
+``Analytics.aggregate``, timed on the first call (reading the files) and
+on repeated calls (columns cached), and checked against the loop.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent / "backend"))
+sys.path.insert(0, str(HERE))
+
+from corpus import build_vault  # noqa: E402
+
+
+def _loop(session_mgr) -> dict:
+    """The figures of ``Analytics.aggregate("model_source", "month")``, from session JSON."""
+    groups = defaultdict(lambda: {"sessions": 0, "messages": 0, "lengths": [], "responses": []})
+    for listing in session_mgr.iter_sessions(include_archived=True):
+        session = session_mgr.load_session(listing["session_id"])
+        model = session["model_source"]
+        group = groups[(session["created_at"][:7], model)]
+        group["sessions"] += 1
+        group["lengths"].append(len(session["messages"]))
+        previous = None
+        for msg in session["messages"]:
+            groups[(msg["timestamp"][:7], model)]["messages"] += 1
+            if msg["role"] == "assistant" and previous and previous["role"] == "user":
+                delta = datetime.fromisoformat(msg["timestamp"]) - datetime.fromisoformat(previous["timestamp"])
+                groups[(msg["timestamp"][:7], model)]["responses"].append(delta.total_seconds())
+            previous = msg
+    return groups
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=3000)
+    parser.add_argument("--messages", type=int, default=8)
+    parser.add_argument("--formats", nargs="+", default=["parquet", "arrow", "csv"])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        build_vault(args.sessions, args.messages, items=0, seed=args.seed)
+
+        from acv_cli import analytics
+        from acv_cli.config import get_config
+        from acv_cli.db import Database
+        from acv_cli.sessions import SessionManager
+
+        session_mgr = SessionManager()
+        db = Database(get_config().data_paths["db_path"])
+
+        t0 = time.perf_counter()
+        expected = _loop(session_mgr)
+        loop_seconds = time.perf_counter() - t0
+
+        results = []
+        for fmt in args.formats:
+            manifest = analytics.export(Path(tmp) / fmt, fmt, session_mgr, db)
+            engine = analytics.Analytics(Path(tmp) / fmt)
+            t0 = time.perf_counter()
+            series = engine.aggregate("model_source", "month")
+            first = time.perf_counter() - t0
+            samples = []
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                engine.aggregate("model_source", "month")
+                samples.append(time.perf_counter() - t0)
+
+            for row in series:
+                group = expected[(row["period"], row["model_source"])]
+                assert row["sessions"] == group["sessions"] and row["messages"] == group["messages"], row
+                if group["lengths"]:
+                    assert abs(row["avg_session_messages"] - statistics.mean(group["lengths"])) < 1e-3, row
+                if group["responses"]:
+                    assert abs(row["avg_response_seconds"] - statistics.mean(group["responses"])) < 1e-3, row
+
+            results.append({
+                "format": manifest["format"],
+                "export_seconds": manifest["seconds"],
+                "bytes": sum(table["bytes"] for table in manifest["tables"].values()),
+                "aggregate_first_ms": first * 1000,
+                "aggregate_cached_ms": statistics.median(samples) * 1000,
+            })
+
+    print(json.dumps({
+        "sessions": args.sessions,
+        "messages": manifest["tables"]["messages"]["rows"],
+        "numpy": analytics.np is not None,
+        "json_loop_seconds": loop_seconds,
+        "results": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
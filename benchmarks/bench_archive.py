@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Benchmark session listings as history grows, with and without archiving.
+
+Usage: python benchmarks/bench_archive.py [--history 500 2000 8000] [--hot-days 30]
+
+For each history size a vault of synthetic sessions (benchmarks/corpus.py,
+one every 7 hours) is written, and the hot-path operations behind
+GET /api/sessions are timed: the first listing page and the listing
+fingerprint used for its ETag. Then everything older than ``--hot-days``
+before the newest session is archived and the same operations are timed
+again, along with loading an archived session by ID.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent / "backend"))
+sys.path.insert(0, str(HERE))
+
+from corpus import CorpusGenerator  # noqa: E402
+
+
+def _median_ms(call, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1000
+
+
+def _hot_path(mgr, repeat: int) -> dict:
+    return {
+        "list_first_page_ms": _median_ms(lambda: mgr.list_sessions(limit=50), repeat),
+        "listing_fingerprint_ms": _median_ms(mgr.listing_fingerprint, repeat),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--history", type=int, nargs="+", default=[500, 2000, 8000])
+    parser.add_argument("--messages", type=int, default=4)
+    parser.add_argument("--hot-days", type=float, default=30)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    results = []
+    for history in args.history:
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            from acv_cli.sessions import SessionManager
+
+            mgr = SessionManager()
+            gen = CorpusGenerator(args.seed)
+            ids = []
+            for i in range(history):
+                session = gen.session(i, args.messages)
+                mgr.save_session(session)
+                ids.append(session["session_id"])
+
+            row = {"sessions": history, "before": _hot_path(mgr, args.repeat)}
+
+            # Keep --hot-days before the newest session (synthetic dates may lie in the future).
+            newest = datetime.fromisoformat(ids[-1][:10])
+            keep_from = newest - timedelta(days=args.hot_days)
+            days = (datetime.now() - keep_from).total_seconds() / 86400
+            t0 = time.perf_counter()
+            archived = mgr.archive_sessions(days)
+            row["archive_seconds"] = time.perf_counter() - t0
+            row["archived"] = archived["sessions"]
+            row["archives"] = archived["months"]
+
+            row["after"] = _hot_path(mgr, args.repeat)
+            old = ids[len(ids) // 2]
+            assert mgr.load_session(old)["session_id"] == old
+            row["after"]["load_archived_ms"] = _median_ms(lambda: mgr.load_session(old), args.repeat)
+            row["after"]["load_hot_ms"] = _median_ms(lambda: mgr.load_session(ids[-1]), args.repeat)
+            full = mgr.list_sessions(limit=history + 1, include_archived=True)
+            assert [s["session_id"] for s in full] == ids[::-1]
+            results.append(row)
+
+    print(json.dumps({"hot_days": args.hot_days, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Benchmark the content-addressed blob store on agent-style sessions.
+
+Usage: python benchmarks/bench_blobs.py [--sessions 300] [--messages 60] [--min-size 4096]
+
+Sessions repeat a shared system prompt, re-read files from a small project
+and echo large tool outputs, like real agent transcripts. The same sessions
+are saved with the blob store disabled and enabled.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent / "backend"
+
+
+def _make_sessions(n_sessions: int, n_messages: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    words = "def class return import self cache index query session 数据 缓存 error test".split()
+
+    def text(n_words: int) -> str:
+        return " ".join(rng.choices(words, k=n_words))
+
+    system_prompt = text(3000)
+    project_files = [text(rng.randint(800, 6000)) for _ in range(40)]
+    tool_outputs = [text(rng.randint(1000, 4000)) for _ in range(30)]
+
+    sessions = []
+    for i in range(n_sessions):
+        messages = [{"role": "system", "content": system_prompt, "timestamp": ""}]
+        for j in range(n_messages):
+            kind = rng.random()
+            if kind < 0.25:
+                content = rng.choice(project_files)
+            elif kind < 0.4:
+                content = rng.choice(tool_outputs)
+            else:
+                content = text(rng.randint(20, 300))
+            messages.append({"role": ("user", "assistant")[j % 2], "content": content, "timestamp": ""})
+        sessions.append({
+            "session_id": f"2026-01-{i % 28 + 1:02d}T00-00-{i:05d}-claude",
+            "created_at": f"2026-01-{i % 28 + 1:02d}T00:00:00",
+            "model_source": "claude",
+            "project": None,
+            "tags": [],
+            "messages": messages,
+            "summaries": {},
+        })
+    return sessions
+
+
+def _dir_bytes(path: Path, suffix: str = "") -> int:
+    return sum(p.stat().st_size for p in path.rglob(f"*{suffix}") if p.is_file())
+
+
+def _run(session_mgr, sessions: list[dict], min_size: int | None) -> dict:
+    session_mgr.blob_min_size = min_size
+    t0 = time.perf_counter()
+    for session in sessions:
+        session_mgr.save_session(session)
+    save_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for session in sessions:
+        loaded = session_mgr.load_session(session["session_id"])
+        assert loaded["messages"] == session["messages"]
+    load_s = time.perf_counter() - t0
+    return {
+        "session_json_bytes": _dir_bytes(session_mgr.sessions_dir, ".json"),
+        "blob_bytes": _dir_bytes(session_mgr.blobs.root) if session_mgr.blobs.root.exists() else 0,
+        "save_seconds": save_s,
+        "load_seconds": load_s,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=300)
+    parser.add_argument("--messages", type=int, default=60)
+    parser.add_argument("--min-size", type=int, default=4096)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    sessions = _make_sessions(args.sessions, args.messages, args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        sys.path.insert(0, str(BACKEND))
+        from acv_cli.blobs import BlobStore
+        from acv_cli.sessions import SessionManager
+
+        results = {}
+        for label, min_size in (("inline", None), ("blob_store", args.min_size)):
+            session_mgr = SessionManager()
+            session_mgr.sessions_dir = Path(tmp) / label / "sessions"
+            session_mgr.blobs = BlobStore(Path(tmp) / label / "blobs")
+            results[label] = _run(session_mgr, sessions, min_size)
+            results[label]["total_bytes"] = results[label]["session_json_bytes"] + results[label]["blob_bytes"]
+        results["blob_store"].update(session_mgr.blobs.stats(session_mgr.sessions_dir))
+
+    inline, stored = results["inline"]["total_bytes"], results["blob_store"]["total_bytes"]
+    print(json.dumps({
+        "sessions": args.sessions,
+        "messages_per_session": args.messages + 1,
+        **results,
+        "storage_saved_pct": 100 * (1 - stored / inline),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
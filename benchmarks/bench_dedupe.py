@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Benchmark MinHash/LSH near-duplicate detection on synthetic knowledge notes.
+
+Usage: python benchmarks/bench_dedupe.py [--notes 100000] [--dup-rate 0.05]
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from acv_cli.db import Database  # noqa: E402
+from acv_cli.dedupe import estimate_similarity, minhash_signature  # noqa: E402
+from acv_cli.models import Category, KnowledgeItem  # noqa: E402
+
+VOCAB = (
+    "sqlite index query cache session vector latency python function error fix "
+    "implement design api token summary async thread lock queue buffer stream "
+    "parser schema migration commit rollback shard replica cluster deploy config "
+    "索引 数据库 查询 缓存 会话 知识 模型 向量"
+).split()
+
+
+def _note(rng: random.Random) -> str:
+    return " ".join(rng.choices(VOCAB, k=rng.randint(60, 200)))
+
+
+def _mutate(rng: random.Random, text: str) -> str:
+    words = text.split()
+    for _ in range(max(1, len(words) // 50)):
+        words[rng.randrange(len(words))] = rng.choice(VOCAB)
+    return " ".join(words)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--notes", type=int, default=100_000)
+    parser.add_argument("--dup-rate", type=float, default=0.05)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    texts: list[str] = []
+    planted: list[tuple[int, int]] = []
+    for i in range(args.notes):
+        if texts and rng.random() < args.dup_rate:
+            original = rng.randrange(len(texts))
+            texts.append(_mutate(rng, texts[original]))
+            planted.append((original, i))
+        else:
+            texts.append(_note(rng))
+
+    t0 = time.perf_counter()
+    signatures = [minhash_signature(text) for text in texts]
+    signature_s = time.perf_counter() - t0
+
+    items = [
+        (
+            KnowledgeItem(
+                id=f"note-{i:06d}",
+                title=f"Note {i}",
+                category=Category.TECH_NOTES,
+                minhash=sig,
+            ),
+            f"note-{i:06d}.md",
+        )
+        for i, sig in enumerate(signatures)
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(str(Path(tmp) / "index.db"))
+        t0 = time.perf_counter()
+        db.add_knowledge_items(items)
+        index_s = time.perf_counter() - t0
+
+        query_ids = [dup for _, dup in rng.sample(planted, min(args.queries, len(planted)))]
+        t0 = time.perf_counter()
+        hits = 0
+        for i in query_ids:
+            matches = db.find_near_duplicates(signatures[i], exclude_id=f"note-{i:06d}")
+            hits += bool(matches)
+        lsh_query_ms = (time.perf_counter() - t0) * 1000 / max(len(query_ids), 1)
+
+        t0 = time.perf_counter()
+        for sig in signatures:
+            estimate_similarity(signatures[query_ids[0]], sig)
+        brute_query_ms = (time.perf_counter() - t0) * 1000
+
+        t0 = time.perf_counter()
+        clusters = db.near_duplicate_clusters()
+        report_s = time.perf_counter() - t0
+
+    results = {
+        "notes": args.notes,
+        "planted_duplicates": len(planted),
+        "signature_per_note_ms": signature_s * 1000 / args.notes,
+        "index_seconds": index_s,
+        "lsh_query_ms": lsh_query_ms,
+        "brute_force_query_ms": brute_query_ms,
+        "query_recall": hits / max(len(query_ids), 1),
+        "report_seconds": report_s,
+        "clusters": len(clusters),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
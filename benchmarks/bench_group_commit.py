@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Benchmark index writes: one commit per call vs the group-commit write queue.
+
+Usage: python benchmarks/bench_group_commit.py [--writes 2000] [--threads 1 4 16]
+
+Every configuration indexes the same synthetic sessions (benchmarks/corpus.py)
+from ``--threads`` concurrent callers into a fresh database. ``per_call``
+is the previous behaviour (a connection and a COMMIT per write);
+``group_commit`` is ``Database.add_session`` through the write queue.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent / "backend"))
+sys.path.insert(0, str(HERE))
+
+from corpus import CorpusGenerator  # noqa: E402
+
+
+def _per_call(db, session: dict) -> None:
+    conn = sqlite3.connect(db.db_path)
+    db._write_session(conn.cursor(), session)
+    conn.commit()
+    conn.close()
+
+
+def _run(write, sessions: list[dict], threads: int) -> dict:
+    latencies = []
+    errors = 0
+
+    def timed(session):
+        nonlocal errors
+        t0 = time.perf_counter()
+        try:
+            write(session)
+        except sqlite3.OperationalError:  # "database is locked"
+            errors += 1
+        latencies.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(threads) as executor:
+        list(executor.map(timed, sessions))
+    seconds = time.perf_counter() - t0
+    latencies.sort()
+    return {
+        "writes_per_second": len(sessions) / seconds,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "errors": errors,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writes", type=int, default=2000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--delay", type=float, default=None, help="commit_delay (default: [storage] setting)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    gen = CorpusGenerator(args.seed)
+    sessions = [gen.session(i, 2) for i in range(args.writes)]
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        from acv_cli.db import Database
+        from acv_cli.write_queue import get_write_queue
+
+        for threads in args.threads:
+            row = {"threads": threads}
+            for mode in ("per_call", "group_commit"):
+                db = Database(str(Path(tmp) / f"{mode}-{threads}.db"))
+                if mode == "group_commit" and args.delay is not None:
+                    get_write_queue(db.db_path, {"commit_delay": args.delay})
+                write = (lambda s, db=db: _per_call(db, s)) if mode == "per_call" else db.add_session
+                row[mode] = _run(write, sessions, threads)
+                assert db.get_stats()["sessions"] == args.writes - row[mode]["errors"]
+                if mode == "group_commit":
+                    queue = get_write_queue(db.db_path)
+                    row[mode]["writes_per_commit"] = queue.writes / queue.commits
+                    queue.close()
+            row["speedup"] = row["group_commit"]["writes_per_second"] / row["per_call"]["writes_per_second"]
+            results.append(row)
+
+    print(json.dumps({"writes": args.writes, "commit_delay": args.delay, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
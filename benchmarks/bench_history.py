@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Benchmark knowledge item history: storage size and version reconstruction.
+
+Usage: python benchmarks/bench_history.py [--items 100] [--revisions 60] [--checkpoint-every 1 8 16 64]
+
+Synthetic items (benchmarks/corpus.py) are revised ``--revisions`` times
+each with typical note edits: a sentence rewritten, a paragraph added or
+removed. For every checkpoint interval the revisions are recorded in a fresh
+history database, and its size is compared with keeping every revision as a
+full copy (raw, and zlib-compressed on its own). Reconstruction of random
+versions is timed, and every rebuilt version is checked against the
+original text. ``--checkpoint-every 1`` stores full copies only.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import zlib
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent / "backend"))
+sys.path.insert(0, str(HERE))
+
+from corpus import CorpusGenerator  # noqa: E402
+
+
+def _revise(gen: CorpusGenerator, text: str) -> str:
+    paragraphs = text.split("\n\n")
+    i = gen.rng.randrange(len(paragraphs))
+    roll = gen.rng.random()
+    if roll < 0.6:
+        sentences = paragraphs[i].split(" ")
+        j = gen.rng.randrange(len(sentences))
+        sentences[j:j + 3] = gen.text(1).split(" ")
+        paragraphs[i] = " ".join(sentences)
+    elif roll < 0.9 or len(paragraphs) < 3:
+        paragraphs.insert(i + 1, gen.text(gen.rng.randint(1, 4)))
+    else:
+        del paragraphs[i]
+    return "\n\n".join(paragraphs)
+
+
+def _revisions(seed: int, items: int, revisions: int) -> dict[str, list[str]]:
+    gen = CorpusGenerator(seed)
+    history = {}
+    for n in range(items):
+        spec = gen.knowledge_item()
+        frontmatter = f'---\nid: "item-{n}"\ntitle: "{spec["title"]}"\ntags: {json.dumps(spec["tags"])}\n---\n\n'
+        text = spec["content"]
+        versions = [frontmatter + text]
+        for _ in range(revisions - 1):
+            text = _revise(gen, text)
+            versions.append(frontmatter + text)
+        history[f"item-{n}"] = versions
+    return history
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--revisions", type=int, default=60)
+    parser.add_argument("--checkpoint-every", type=int, nargs="+", default=[1, 8, 16, 64])
+    parser.add_argument("--lookups", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    from acv_cli.history import ItemHistory
+
+    corpus = _revisions(args.seed, args.items, args.revisions)
+    raw = sum(len(text.encode("utf-8")) for versions in corpus.values() for text in versions)
+    compressed = sum(len(zlib.compress(text.encode("utf-8"))) for versions in corpus.values() for text in versions)
+
+    gen = CorpusGenerator(args.seed + 1)
+    lookups = [
+        (item_id, gen.rng.randint(1, args.revisions))
+        for item_id in gen.rng.choices(list(corpus), k=args.lookups)
+    ]
+
+    results = []
+    for every in args.checkpoint_every:
+        with tempfile.TemporaryDirectory() as tmp:
+            history = ItemHistory(Path(tmp) / "history.db", checkpoint_every=every)
+            t0 = time.perf_counter()
+            for item_id, versions in corpus.items():
+                for text in versions:
+                    history.record(item_id, text, "update")
+            record_seconds = time.perf_counter() - t0
+
+            samples = []
+            for item_id, version in lookups:
+                t0 = time.perf_counter()
+                text = history.get(item_id, version)
+                samples.append(time.perf_counter() - t0)
+                assert text == corpus[item_id][version - 1], (item_id, version)
+            samples.sort()
+
+            stats = history.stats()
+            results.append({
+                "checkpoint_every": every,
+                "stored_bytes": stats["stored_bytes"],
+                "db_bytes": os.path.getsize(Path(tmp) / "history.db"),
+                "vs_raw": stats["stored_bytes"] / raw,
+                "vs_compressed": stats["stored_bytes"] / compressed,
+                "checkpoints": stats["checkpoints"],
+                "record_ms": record_seconds / stats["revisions"] * 1000,
+                "get_median_ms": statistics.median(samples) * 1000,
+                "get_p95_ms": samples[int(len(samples) * 0.95)] * 1000,
+                "get_max_ms": samples[-1] * 1000,
+            })
+
+    print(json.dumps({
+        "items": args.items,
+        "revisions": args.revisions,
+        "raw_bytes": raw,
+        "compressed_bytes": compressed,
+        "results": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Benchmark conditional GETs and compression for a polling dashboard client.
+
+Usage: python benchmarks/bench_http_cache.py [--items 2000] [--sessions 500] [--polls 50]
+
+A throwaway vault is created in a temporary directory. The dashboard polls
+/api/knowledge, /api/knowledge/{id}, /api/sessions and /stats while nothing
+changes, first as a plain client and then revalidating with If-None-Match
+and accepting gzip.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent / "backend"
+
+
+def _populate(items: int, sessions: int, seed: int) -> str:
+    from acv_cli.config import get_config
+    from acv_cli.db import Database
+    from acv_cli.knowledge import KnowledgeManager
+    from acv_cli.models import Category
+    from acv_cli.sessions import SessionManager
+
+    rng = random.Random(seed)
+    words = "sqlite cache index session latency 索引 缓存 会话 python api design".split()
+    db = Database(get_config().data_paths["db_path"])
+    knowledge_mgr = KnowledgeManager()
+    indexed = []
+    for i in range(items):
+        item, path = knowledge_mgr.create_knowledge_item(
+            title=f"Note {i} " + " ".join(rng.choices(words, k=4)),
+            content=" ".join(rng.choices(words, k=rng.randint(50, 400))),
+            category=rng.choice(list(Category)),
+            source_sessions=[],
+            model_sources=[rng.choice(["claude", "gemini", "codex"])],
+            tags=rng.sample(words, 2),
+        )
+        indexed.append((item, path))
+    db.add_knowledge_items(indexed)
+
+    session_mgr = SessionManager()
+    for i in range(sessions):
+        session = {
+            "session_id": f"2026-01-{i % 28 + 1:02d}T00-00-{i:05d}-claude",
+            "created_at": f"2026-01-{i % 28 + 1:02d}T00:00:00",
+            "model_source": "claude",
+            "project": None,
+            "tags": [],
+            "messages": [
+                {"role": "assistant", "content": " ".join(rng.choices(words, k=20)), "timestamp": ""}
+                for _ in range(rng.randint(5, 50))
+            ],
+            "summaries": {},
+        }
+        session_mgr.save_session(session)
+        db.add_session(session)
+    return indexed[0][0].id
+
+
+def _poll(client, urls: list[str], polls: int, conditional: bool, encoding: str) -> dict:
+    etags: dict[str, str] = {}
+    downloaded = 0
+    not_modified = 0
+    cpu = time.process_time()
+    wall = time.perf_counter()
+    for _ in range(polls):
+        for url in urls:
+            headers = {"Accept-Encoding": encoding}
+            if conditional and url in etags:
+                headers["If-None-Match"] = etags[url]
+            r = client.get(url, headers=headers)
+            downloaded += r.num_bytes_downloaded
+            not_modified += r.status_code == 304
+            if "etag" in r.headers:
+                etags[url] = r.headers["etag"]
+    return {
+        "bytes": downloaded,
+        "not_modified": not_modified,
+        "cpu_seconds": time.process_time() - cpu,
+        "wall_seconds": time.perf_counter() - wall,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--polls", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        sys.path.insert(0, str(BACKEND))
+        first_id = _populate(args.items, args.sessions, args.seed)
+
+        from fastapi.testclient import TestClient
+        from acv_api.app import app
+
+        urls = ["/api/knowledge", f"/api/knowledge/{first_id}", "/api/sessions", "/stats"]
+        with TestClient(app) as client:
+            results = {
+                "plain": _poll(client, urls, args.polls, conditional=False, encoding="identity"),
+                "gzip": _poll(client, urls, args.polls, conditional=False, encoding="gzip"),
+                "conditional+gzip": _poll(client, urls, args.polls, conditional=True, encoding="gzip"),
+            }
+
+    base = results["plain"]
+    for name, r in results.items():
+        r["bytes_saved_pct"] = 100 * (1 - r["bytes"] / base["bytes"])
+        r["cpu_saved_pct"] = 100 * (1 - r["cpu_seconds"] / base["cpu_seconds"])
+    print(json.dumps({"requests_per_mode": args.polls * len(urls), **results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Benchmark memory held by loaded sessions: dicts vs pydantic models vs CompactSession.
+
+Usage: python benchmarks/bench_memory.py [--sessions 200] [--messages 80]
+
+A synthetic vault (benchmarks/corpus.py) is loaded three ways and the memory
+still allocated once every session is held is measured with tracemalloc.
+The scan columns time one pass over all message contents.
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent / "backend"))
+sys.path.insert(0, str(HERE))
+
+from corpus import build_vault  # noqa: E402
+
+
+def _held(load) -> tuple[list, int, int, float]:
+    """Load everything with ``load``; returns (objects, retained bytes, peak bytes, seconds).
+
+    Timed on a separate untraced pass, since tracemalloc slows every allocation.
+    """
+    gc.collect()
+    t0 = time.perf_counter()
+    load()
+    seconds = time.perf_counter() - t0
+    gc.collect()
+    tracemalloc.start()
+    loaded = load()
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return loaded, retained, peak, seconds
+
+
+def _scan(contents) -> float:
+    t0 = time.perf_counter()
+    total = sum(len(c) for c in contents)
+    assert total > 0
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--messages", type=int, default=80)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        manifest = build_vault(args.sessions, args.messages, items=0, seed=args.seed)
+
+        from acv_cli.models import Session
+        from acv_cli.sessions import SessionManager
+
+        session_mgr = SessionManager()
+        ids = manifest["session_ids"]
+
+        dicts, dict_bytes, dict_peak, dict_s = _held(lambda: [session_mgr.load_session(i) for i in ids])
+        dict_scan = _scan(m["content"] for s in dicts for m in s["messages"])
+        del dicts
+
+        models, model_bytes, model_peak, model_s = _held(
+            lambda: [Session.model_validate(session_mgr.load_session(i)) for i in ids]
+        )
+        model_scan = _scan(m.content for s in models for m in s.messages)
+        del models
+
+        compact, compact_bytes, compact_peak, compact_s = _held(
+            lambda: [session_mgr.load_session_compact(i) for i in ids]
+        )
+        compact_scan = _scan(c for s in compact for c in s.contents())
+        assert all(s.to_dict() == session_mgr.load_session(i) for s, i in zip(compact, ids))
+        column_bytes = sum(s.nbytes() for s in compact)
+
+    messages = manifest["total_messages"]
+
+    def row(retained: int, peak: int, load_s: float, scan_s: float) -> dict:
+        return {
+            "retained_bytes": retained,
+            "bytes_per_message": retained / messages,
+            "peak_bytes": peak,
+            "load_seconds": load_s,
+            "scan_seconds": scan_s,
+        }
+
+    print(json.dumps({
+        "sessions": args.sessions,
+        "messages": messages,
+        "vault_bytes": manifest["bytes"],
+        "dict": row(dict_bytes, dict_peak, dict_s, dict_scan),
+        "pydantic": row(model_bytes, model_peak, model_s, model_scan),
+        "compact": {**row(compact_bytes, compact_peak, compact_s, compact_scan), "column_bytes": column_bytes},
+        "compact_vs_dict": dict_bytes / compact_bytes,
+        "compact_vs_pydantic": model_bytes / compact_bytes,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Benchmark the related-items graph: full rebuild, incremental updates and lookups.
+
+Usage: python benchmarks/bench_related.py [--items 5000] [--sessions 300] [--added 20]
+
+Builds a synthetic vault (benchmarks/corpus.py) with all but ``--added``
+items, rebuilds the graph, then indexes the remaining items one at a time,
+each followed by ``RelatedGraph.update``. The incremental neighbour lists
+are compared with a final rebuild (overlap of the new items' lists), and
+``Database.related_items`` lookups are timed.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent / "backend"))
+sys.path.insert(0, str(HERE))
+
+from corpus import CorpusGenerator, build_vault  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--sessions", type=int, default=300)
+    parser.add_argument("--added", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        manifest = build_vault(args.sessions, 2, items=args.items - args.added, seed=args.seed)
+
+        from acv_cli.config import get_config
+        from acv_cli.db import Database
+        from acv_cli.knowledge import KnowledgeManager
+        from acv_cli.models import Category
+        from acv_cli.related import RelatedGraph
+
+        db = Database(get_config().data_paths["db_path"])
+        knowledge_mgr = KnowledgeManager()
+        graph = RelatedGraph.from_settings(db, get_config().related)
+        rebuild = graph.rebuild()
+
+        gen = CorpusGenerator(args.seed + 1)
+        added, updates = [], []
+        for _ in range(args.added):
+            spec = gen.knowledge_item()
+            item = knowledge_mgr.create_knowledge_item(
+                title=spec["title"],
+                content=spec["content"],
+                category=Category(spec["category"]),
+                source_sessions=[gen.rng.choice(manifest["session_ids"])],
+                model_sources=spec["model_sources"],
+                tags=spec["tags"],
+            )
+            db.add_knowledge_items([item])
+            added.append(item[0].id)
+            updates.append(graph.update()["seconds"])
+
+        incremental = {i: {r["id"] for r in db.related_items(i, graph.k)} for i in added}
+        final = graph.rebuild()
+        overlap = [
+            len(incremental[i] & {r["id"] for r in db.related_items(i, graph.k)}) / max(len(incremental[i]), 1)
+            for i in added
+        ]
+
+        ids = manifest["item_ids"][:: max(1, len(manifest["item_ids"]) // 500)]
+        lookups = []
+        for item_id in ids:
+            t0 = time.perf_counter()
+            db.related_items(item_id, 10)
+            lookups.append(time.perf_counter() - t0)
+
+    print(json.dumps({
+        "items": args.items,
+        "rebuild_seconds": rebuild["seconds"],
+        "final_rebuild_seconds": final["seconds"],
+        "incremental_update_ms": {
+            "first": updates[0] * 1000,
+            "median": statistics.median(updates) * 1000,
+            "max": max(updates) * 1000,
+        },
+        "incremental_vs_rebuild_overlap": statistics.mean(overlap),
+        "lookup_p50_ms": statistics.median(lookups) * 1000,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
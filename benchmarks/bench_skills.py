@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Benchmark skill execution: a subprocess per call vs the warm worker pool.
+
+Usage: python benchmarks/bench_skills.py [--sessions 40] [--messages 40] [--runs 200] [--workers 2]
+
+Runs the bundled summarize-session skill over synthetic sessions
+(benchmarks/corpus.py) the way SkillManager.run_skill does: once by spawning
+the skill's command for every call, once through SkillPool. Each mode is
+driven by ``--workers`` client threads and reports runs/s and latency.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import cycle
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+SKILL_DIR = HERE.parent / "skills" / "summarize-session"
+sys.path.insert(0, str(HERE.parent / "backend"))
+sys.path.insert(0, str(HERE))
+
+from corpus import build_vault  # noqa: E402
+
+
+def _measure(call, inputs: list, runs: int, threads: int) -> dict:
+    def timed(session):
+        t0 = time.perf_counter()
+        call(session)
+        return time.perf_counter() - t0
+
+    work = [s for s, _ in zip(cycle(inputs), range(runs))]
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(threads) as executor:
+        latencies = sorted(executor.map(timed, work))
+    seconds = time.perf_counter() - t0
+    return {
+        "runs": runs,
+        "seconds": seconds,
+        "runs_per_second": runs / seconds,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=40)
+    parser.add_argument("--messages", type=int, default=40)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--mode", choices=["heuristic", "extractive"], default="heuristic")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        manifest = build_vault(args.sessions, args.messages, items=0, seed=args.seed)
+
+        from acv_cli.sessions import SessionManager
+        from acv_cli.skill_pool import SkillPool, run_command
+
+        session_mgr = SessionManager()
+        sessions = [session_mgr.load_session(i) for i in manifest["session_ids"]]
+        params = {"mode": args.mode}
+        script = SKILL_DIR / "scripts" / "summarize_session.py"
+
+        spawn = _measure(
+            lambda s: run_command("python scripts/summarize_session.py", SKILL_DIR, s, params),
+            sessions, args.runs, args.workers,
+        )
+
+        pool = SkillPool(workers=args.workers)
+        t0 = time.perf_counter()
+        pool.warm()
+        pool.run(script, sessions[0], params)  # imports the skill in one worker
+        warm_seconds = time.perf_counter() - t0
+        pooled = _measure(lambda s: pool.run(script, s, params), sessions, args.runs, args.workers)
+        assert pool.run(script, sessions[0], params) == run_command(
+            "python scripts/summarize_session.py", SKILL_DIR, sessions[0], params
+        )
+        pool.close()
+
+    print(json.dumps({
+        "sessions": args.sessions,
+        "messages_per_session": args.messages,
+        "workers": args.workers,
+        "mode": args.mode,
+        "spawn_per_call": spawn,
+        "pool": {**pooled, "warm_up_seconds": warm_seconds},
+        "speedup": pooled["runs_per_second"] / spawn["runs_per_second"],
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
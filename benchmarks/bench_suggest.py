@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Benchmark prefix suggestions over synthetic knowledge item titles and tags.
+
+Usage: python benchmarks/bench_suggest.py [--items 100000] [--queries 2000]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from acv_cli.db import Database  # noqa: E402
+from acv_cli.models import Category, KnowledgeItem  # noqa: E402
+from acv_cli.suggest import SuggestIndex  # noqa: E402
+
+WORDS = (
+    "sqlite index query cache session vector latency python function error fix "
+    "implement design api token summary async thread lock queue buffer stream "
+    "parser schema migration commit rollback shard replica cluster deploy config "
+    "索引 数据库 查询 缓存 会话 知识 模型 向量"
+).split()
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    return sorted(values)[min(len(values) - 1, int(len(values) * pct))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    start = datetime(2024, 1, 1)
+    items = [
+        (
+            KnowledgeItem(
+                id=f"note-{i:06d}",
+                title=" ".join(rng.choices(WORDS, k=rng.randint(2, 7))),
+                date=start + timedelta(minutes=i),
+                category=Category.TECH_NOTES,
+                tags=rng.sample(WORDS, rng.randint(0, 3)),
+            ),
+            f"note-{i:06d}.md",
+        )
+        for i in range(args.items)
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(str(Path(tmp) / "index.db"))
+        db.add_knowledge_items(items)
+
+        index = SuggestIndex()
+        t0 = time.perf_counter()
+        index.refresh(db)
+        build_s = time.perf_counter() - t0
+
+        prefixes = []
+        for _ in range(args.queries):
+            title = rng.choice(items)[0].title.lower()
+            prefixes.append(title[: rng.randint(1, min(8, len(title)))])
+
+        def run(label: str) -> dict:
+            latencies = []
+            for prefix in prefixes:
+                t = time.perf_counter()
+                index.refresh(db)
+                index.suggest(prefix)
+                latencies.append((time.perf_counter() - t) * 1000)
+            return {
+                f"{label}_p50_ms": statistics.median(latencies),
+                f"{label}_p99_ms": _percentile(latencies, 0.99),
+                f"{label}_max_ms": max(latencies),
+            }
+
+        cold = run("first_pass")
+        warm = run("warm")
+
+        new_item = KnowledgeItem(
+            id="note-new", title="sqlite cache warmup", category=Category.TECH_NOTES, tags=["cache"]
+        )
+        db.add_knowledge_item(new_item, "note-new.md")
+        t0 = time.perf_counter()
+        index.refresh(db)
+        incremental_ms = (time.perf_counter() - t0) * 1000
+        found = any(s.get("id") == "note-new" for s in index.suggest("sqlite cache w"))
+
+    print(json.dumps({
+        "items": args.items,
+        "entries": len(index),
+        "build_seconds": build_s,
+        **cold,
+        **warm,
+        "incremental_refresh_ms": incremental_ms,
+        "new_item_suggested": found,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
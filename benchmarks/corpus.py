@@ -0,0 +1,157 @@
+"""Deterministic synthetic vault for the benchmark suite.
+
+Text mixes English and Chinese sentences with Zipf-distributed word
+frequencies; message and note lengths are log-normal, so most are short and
+a few are very long, as in real agent transcripts. The same seed and sizes
+always produce the same sessions, notes and queries (knowledge item IDs are
+assigned by KnowledgeManager and still differ between vaults).
+"""
+
+import random
+from datetime import datetime, timedelta
+from itertools import accumulate
+from pathlib import Path
+
+EN_WORDS = (
+    "the a to of and in is for it that on with this be as you we can use function "
+    "error file test data index query cache session model code return value type "
+    "class import python sqlite api request response server client config path "
+    "thread async lock queue buffer stream parser schema migration commit deploy "
+    "latency memory vector token summary search result item list string number "
+    "update delete insert select table column key hash batch worker process "
+    "performance benchmark profile optimize refactor implement design review fix"
+).split()
+CJK_WORDS = (
+    "我们 这个 可以 需要 数据 索引 查询 缓存 会话 模型 函数 错误 文件 测试 "
+    "性能 优化 实现 设计 知识 向量 检索 配置 服务 请求 响应 线程 并发 内存 "
+    "结果 列表 更新 删除 插入 事务 提交 部署 延迟 基准 分析 总结 问题 方法"
+).split()
+TAGS = "python sqlite cache search api design performance 数据库 前端 部署 测试 架构".split()
+MODELS = ("claude", "gemini", "codex")
+PROJECTS = (None, "self-ai-knowledge", "web-client", "data-pipeline")
+QUERIES = ("cache", "index", "session", "数据", "性能 优化", "python", "query", "sqlite", "缓存", "latency")
+CATEGORIES = ("trusted_sources", "thinking", "tech_notes", "skills_derived")
+
+
+def _zipf_weights(n: int, s: float = 1.1) -> list[float]:
+    return list(accumulate(1 / (rank + 1) ** s for rank in range(n)))
+
+
+class CorpusGenerator:
+    """Seeded source of sessions, knowledge items and queries."""
+
+    def __init__(self, seed: int = 42, cjk_ratio: float = 0.3):
+        self.rng = random.Random(seed)
+        self.cjk_ratio = cjk_ratio
+        self._en_cum = _zipf_weights(len(EN_WORDS))
+        self._cjk_cum = _zipf_weights(len(CJK_WORDS))
+        self.start = datetime(2025, 1, 1)
+
+    def _sentence(self) -> str:
+        n = max(3, int(self.rng.lognormvariate(2.3, 0.5)))
+        if self.rng.random() < self.cjk_ratio:
+            return "".join(self.rng.choices(CJK_WORDS, cum_weights=self._cjk_cum, k=n)) + "。"
+        words = self.rng.choices(EN_WORDS, cum_weights=self._en_cum, k=n)
+        return " ".join(words).capitalize() + self.rng.choice(".?!.")
+
+    def text(self, n_sentences: int) -> str:
+        paragraphs = []
+        while n_sentences > 0:
+            k = min(n_sentences, self.rng.randint(2, 6))
+            paragraphs.append(" ".join(self._sentence() for _ in range(k)))
+            n_sentences -= k
+        return "\n\n".join(paragraphs)
+
+    def message_sentences(self) -> int:
+        # Median ~5 sentences with a long tail (pasted files, tool output).
+        return max(1, min(2000, int(self.rng.lognormvariate(1.6, 1.2))))
+
+    def session(self, i: int, n_messages: int) -> dict:
+        created = self.start + timedelta(hours=7 * i, minutes=self.rng.randint(0, 59))
+        model = self.rng.choice(MODELS)
+        count = max(2, int(self.rng.lognormvariate(0, 0.5) * n_messages))
+        messages = []
+        for j in range(count):
+            role = "user" if j % 2 == 0 else "assistant"
+            sentences = self.message_sentences() if role == "assistant" else max(1, self.message_sentences() // 3)
+            messages.append({
+                "role": role,
+                "content": self.text(sentences),
+                "timestamp": (created + timedelta(seconds=20 * j)).isoformat(),
+            })
+        return {
+            "session_id": created.strftime("%Y-%m-%dT%H-%M-%S") + f"-{model}",
+            "created_at": created.isoformat(),
+            "model_source": model,
+            "model_variant": None,
+            "project": self.rng.choice(PROJECTS),
+            "tags": self.rng.sample(TAGS, self.rng.randint(0, 3)),
+            "messages": messages,
+            "summaries": {},
+        }
+
+    def knowledge_item(self) -> dict:
+        return {
+            "title": self._sentence().rstrip(".?!。")[:80],
+            "content": self.text(max(2, int(self.rng.lognormvariate(2.5, 0.9)))),
+            "category": self.rng.choice(CATEGORIES),
+            "tags": self.rng.sample(TAGS, self.rng.randint(0, 4)),
+            "model_sources": [self.rng.choice(MODELS)],
+        }
+
+
+def build_vault(sessions: int, messages: int, items: int, seed: int = 42) -> dict:
+    """Populate the vault of the current working directory; returns a manifest.
+
+    Must be called after changing into the vault directory, since the data
+    paths in the default configuration are relative.
+    """
+    from acv_cli.config import get_config
+    from acv_cli.db import Database
+    from acv_cli.knowledge import KnowledgeManager
+    from acv_cli.models import Category
+    from acv_cli.sessions import SessionManager
+
+    gen = CorpusGenerator(seed)
+    db = Database(get_config().data_paths["db_path"])
+    session_mgr = SessionManager()
+    knowledge_mgr = KnowledgeManager()
+
+    session_ids = []
+    message_count = 0
+    for i in range(sessions):
+        session = gen.session(i, messages)
+        session_mgr.save_session(session)
+        db.add_session(session)
+        session_ids.append(session["session_id"])
+        message_count += len(session["messages"])
+
+    indexed = []
+    for _ in range(items):
+        spec = gen.knowledge_item()
+        indexed.append(knowledge_mgr.create_knowledge_item(
+            title=spec["title"],
+            content=spec["content"],
+            category=Category(spec["category"]),
+            source_sessions=[gen.rng.choice(session_ids)] if session_ids else [],
+            model_sources=spec["model_sources"],
+            tags=spec["tags"],
+        ))
+    db.add_knowledge_items(indexed)
+
+    return {
+        "seed": seed,
+        "sessions": sessions,
+        "messages_per_session": messages,
+        "items": items,
+        "total_messages": message_count,
+        "bytes": sum(
+            p.stat().st_size
+            for root in (session_mgr.sessions_dir, knowledge_mgr.knowledge_dir)
+            for p in Path(root).rglob("*")
+            if p.is_file()
+        ),
+        "session_ids": session_ids,
+        "item_ids": [item.id for item, _ in indexed],
+        "queries": list(QUERIES),
+    }
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""Benchmark suite over a deterministic synthetic vault.
+
+Usage:
+  python benchmarks/suite.py [--sessions 300] [--messages 40] [--items 3000] [-o results.json]
+  python benchmarks/suite.py --filter search --filter api
+  python benchmarks/suite.py --compare base.json new.json [--threshold 0.1]
+
+A vault is generated by benchmarks/corpus.py (in a temporary directory, or
+in --workdir, where it is reused while the corpus parameters match). Every
+scenario is timed in-process; API scenarios go through the ASGI app with
+Starlette's TestClient, lifespan included. Results are written as JSON with
+the commit they were measured on, so two runs can be compared with
+--compare, which exits non-zero when a scenario's median regressed by more
+than --threshold.
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from itertools import cycle
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable
+
+REPO = Path(__file__).resolve().parent.parent
+BACKEND = REPO / "backend"
+SUMMARIZER = REPO / "skills" / "summarize-session" / "scripts" / "summarize_session.py"
+SCHEMA_VERSION = 1
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from corpus import CorpusGenerator, build_vault  # noqa: E402
+
+# name -> factory(ctx) returning the operation to time, or None to skip.
+SCENARIOS: dict[str, Callable] = {}
+
+
+def scenario(name: str):
+    def register(factory: Callable) -> Callable:
+        SCENARIOS[name] = factory
+        return factory
+    return register
+
+
+def _sample(values: list, n: int = 50) -> list:
+    return values[:: max(1, len(values) // n)] or values
+
+
+@scenario("listing.sessions_files")
+def _listing_sessions_files(ctx):
+    return lambda: ctx.session_mgr.list_sessions(limit=50)
+
+
+@scenario("listing.sessions_db")
+def _listing_sessions_db(ctx):
+    return lambda: ctx.db.list_sessions(limit=50)
+
+
+@scenario("listing.knowledge")
+def _listing_knowledge(ctx):
+    return lambda: ctx.knowledge_mgr.list_knowledge_items(limit=50)
+
+
+@scenario("search.like")
+def _search_like(ctx):
+    queries = cycle(ctx.manifest["queries"])
+    return lambda: ctx.db.search(next(queries), limit=20)
+
+
+@scenario("search.fts")
+def _search_fts(ctx):
+    queries = cycle(ctx.manifest["queries"])
+    return lambda: ctx.db.search_fts(next(queries), limit=20)
+
+
+@scenario("search.suggest")
+def _search_suggest(ctx):
+    from acv_cli.suggest import SuggestIndex
+
+    index = SuggestIndex()
+    index.refresh(ctx.db)
+    prefixes = cycle(q[:3] for q in ctx.manifest["queries"])
+    return lambda: index.suggest(next(prefixes))
+
+
+@scenario("lookup.session_db")
+def _lookup_session_db(ctx):
+    ids = cycle(_sample(ctx.manifest["session_ids"]))
+    return lambda: ctx.db.get_session(next(ids))
+
+
+@scenario("lookup.session_file")
+def _lookup_session_file(ctx):
+    ids = cycle(_sample(ctx.manifest["session_ids"]))
+    return lambda: ctx.session_mgr.load_session(next(ids))
+
+
+@scenario("lookup.session_range")
+def _lookup_session_range(ctx):
+    ids = cycle(_sample(ctx.manifest["session_ids"]))
+    return lambda: ctx.session_mgr.load_session_range(next(ids), offset=0, limit=20)
+
+
+@scenario("lookup.knowledge")
+def _lookup_knowledge(ctx):
+    ids = cycle(_sample(ctx.manifest["item_ids"]))
+    return lambda: ctx.knowledge_mgr.load_knowledge_item(next(ids))
+
+
+@scenario("write.save_session")
+def _write_save_session(ctx):
+    from acv_cli.sessions import SessionManager
+
+    # Written to a scratch directory so a reused vault does not grow.
+    session_mgr = SessionManager()
+    session_mgr.sessions_dir = ctx.workdir / "scratch-sessions"
+    gen = CorpusGenerator(seed=ctx.args.seed + 1)
+    sessions = cycle([gen.session(i, ctx.args.messages) for i in range(20)])
+    return lambda: session_mgr.save_session(next(sessions))
+
+
+def _load_summarizer():
+    spec = importlib.util.spec_from_file_location("summarize_session", SUMMARIZER)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _summarize(ctx, mode: str):
+    summarizer = _load_summarizer()
+    if mode == "extractive" and summarizer.np is None:
+        return None
+    sessions = cycle([ctx.session_mgr.load_session(sid) for sid in _sample(ctx.manifest["session_ids"], 10)])
+    return lambda: summarizer.summarize_session(next(sessions), mode=mode)
+
+
+@scenario("summarize.heuristic")
+def _summarize_heuristic(ctx):
+    return _summarize(ctx, "heuristic")
+
+
+@scenario("summarize.extractive")
+def _summarize_extractive(ctx):
+    return _summarize(ctx, "extractive")
+
+
+def _api_get(ctx, paths: list[str]):
+    paths = cycle(paths)
+    return lambda: ctx.client.get(next(paths)).raise_for_status()
+
+
+@scenario("api.sessions_list")
+def _api_sessions_list(ctx):
+    return _api_get(ctx, ["/api/sessions?limit=50"])
+
+
+@scenario("api.session_detail")
+def _api_session_detail(ctx):
+    return _api_get(ctx, [f"/api/sessions/{sid}" for sid in _sample(ctx.manifest["session_ids"])])
+
+
+@scenario("api.knowledge_list")
+def _api_knowledge_list(ctx):
+    return _api_get(ctx, ["/api/knowledge?limit=50"])
+
+
+@scenario("api.knowledge_detail")
+def _api_knowledge_detail(ctx):
+    return _api_get(ctx, [f"/api/knowledge/{item_id}" for item_id in _sample(ctx.manifest["item_ids"])])
+
+
+@scenario("api.search")
+def _api_search(ctx):
+    # Query strings are varied per call by a counter so results are not served from cache.
+    counter = iter(range(sys.maxsize))
+    queries = cycle(ctx.manifest["queries"])
+    return lambda: ctx.client.get(
+        "/api/search", params={"q": next(queries), "limit": 20 + next(counter) % 1000}
+    ).raise_for_status()
+
+
+@scenario("api.stats")
+def _api_stats(ctx):
+    return _api_get(ctx, ["/stats"])
+
+
+def _measure(op: Callable, repeat: int, warmup: int, max_time: float) -> dict:
+    for _ in range(warmup):
+        op()
+    samples = []
+    deadline = time.perf_counter() + max_time
+    while len(samples) < repeat and (len(samples) < 5 or time.perf_counter() < deadline):
+        t0 = time.perf_counter()
+        op()
+        samples.append((time.perf_counter() - t0) * 1000)
+    ordered = sorted(samples)
+    return {
+        "n": len(samples),
+        "median_ms": statistics.median(ordered),
+        "mean_ms": statistics.fmean(ordered),
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "min_ms": ordered[0],
+        "stdev_ms": statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+    }
+
+
+def _git(*args: str) -> str | None:
+    try:
+        result = subprocess.run(["git", *args], cwd=REPO, capture_output=True, text=True, timeout=30)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def _metadata() -> dict:
+    status = _git("status", "--porcelain", "--untracked-files=no")
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    return {
+        "schema": SCHEMA_VERSION,
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(status) if status is not None else None,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": numpy_version,
+    }
+
+
+def _prepare_vault(workdir: Path, args) -> dict:
+    params = {"seed": args.seed, "sessions": args.sessions, "messages_per_session": args.messages, "items": args.items}
+    manifest_path = workdir / "corpus.json"
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        if all(manifest.get(key) == value for key, value in params.items()):
+            return manifest
+        raise SystemExit(f"{workdir} holds a corpus with different parameters; use another --workdir")
+    t0 = time.perf_counter()
+    manifest = build_vault(args.sessions, args.messages, args.items, seed=args.seed)
+    manifest["build_seconds"] = time.perf_counter() - t0
+    manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+    return manifest
+
+
+def run(args) -> dict:
+    if args.workdir:
+        workdir = Path(args.workdir).resolve()
+        workdir.mkdir(parents=True, exist_ok=True)
+        return _run_in(workdir, args)
+    with tempfile.TemporaryDirectory(prefix="acv-bench-") as tmp:
+        try:
+            return _run_in(Path(tmp), args)
+        finally:
+            os.chdir(REPO)
+
+
+def _run_in(workdir: Path, args) -> dict:
+    os.chdir(workdir)
+    sys.path.insert(0, str(BACKEND))
+
+    from fastapi.testclient import TestClient
+    from acv_api.app import app
+    from acv_cli.config import get_config
+    from acv_cli.db import Database
+    from acv_cli.knowledge import KnowledgeManager
+    from acv_cli.sessions import SessionManager
+
+    manifest = _prepare_vault(workdir, args)
+    selected = [
+        name for name in SCENARIOS
+        if not args.filter or any(pattern in name for pattern in args.filter)
+    ]
+
+    results = {}
+    with TestClient(app) as client:
+        ctx = SimpleNamespace(
+            args=args,
+            workdir=workdir,
+            manifest=manifest,
+            client=client,
+            db=Database(get_config().data_paths["db_path"]),
+            session_mgr=SessionManager(),
+            knowledge_mgr=KnowledgeManager(),
+        )
+        for name in selected:
+            op = SCENARIOS[name](ctx)
+            if op is None:
+                results[name] = {"skipped": True}
+                print(f"{name:28} skipped", file=sys.stderr)
+                continue
+            results[name] = _measure(op, args.repeat, args.warmup, args.max_time)
+            r = results[name]
+            print(f"{name:28} {r['median_ms']:10.3f} ms  (p95 {r['p95_ms']:.3f}, n={r['n']})", file=sys.stderr)
+
+    corpus = {key: value for key, value in manifest.items() if key not in ("session_ids", "item_ids")}
+    return {"meta": _metadata(), "corpus": corpus, "results": results}
+
+
+def compare(base_path: Path, new_path: Path, threshold: float) -> int:
+    base = json.loads(base_path.read_text(encoding="utf-8"))
+    new = json.loads(new_path.read_text(encoding="utf-8"))
+    if base.get("corpus", {}).get("sessions") != new.get("corpus", {}).get("sessions") or \
+            base.get("corpus", {}).get("items") != new.get("corpus", {}).get("items"):
+        print("⚠️  The two runs used different corpus sizes", file=sys.stderr)
+
+    print(f"{'scenario':28} {'base ms':>10} {'new ms':>10} {'change':>8}")
+    print("-" * 60)
+    regressions = 0
+    for name in sorted(set(base["results"]) | set(new["results"])):
+        old_r, new_r = base["results"].get(name), new["results"].get(name)
+        if not old_r or not new_r or "median_ms" not in old_r or "median_ms" not in new_r:
+            print(f"{name:28} {'-':>10} {'-':>10} {'n/a':>8}")
+            continue
+        change = new_r["median_ms"] / old_r["median_ms"] - 1
+        flag = ""
+        if change > threshold:
+            regressions += 1
+            flag = "  ⚠️"
+        print(f"{name:28} {old_r['median_ms']:10.3f} {new_r['median_ms']:10.3f} {change:+8.1%}{flag}")
+    print("-" * 60)
+    print(f"{(base['meta'].get('commit') or '?')[:10]} -> {(new['meta'].get('commit') or '?')[:10]}: "
+          f"{regressions} regression(s) over {threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=300)
+    parser.add_argument("--messages", type=int, default=40, help="Mean messages per session")
+    parser.add_argument("--items", type=int, default=3000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=50, help="Timed calls per scenario")
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--max-time", type=float, default=3.0, help="Seconds per scenario (at least 5 calls)")
+    parser.add_argument("--filter", action="append", help="Only scenarios whose name contains this")
+    parser.add_argument("--workdir", help="Directory to generate (or reuse) the vault in")
+    parser.add_argument("-o", "--output", type=Path, help="Write results here instead of stdout")
+    parser.add_argument("--compare", nargs=2, type=Path, metavar=("BASE", "NEW"))
+    parser.add_argument("--threshold", type=float, default=0.1, help="Regression threshold for --compare")
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(compare(*args.compare, args.threshold))
+
+    output = json.dumps(run(args), indent=2)
+    if args.output:
+        args.output.write_text(output + "\n", encoding="utf-8")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
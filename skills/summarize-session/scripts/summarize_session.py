@@ -5,14 +5,64 @@ Summarize Session Skill
 Extract summaries, action items, and knowledge candidates from AI conversation sessions.
 """
 
+import argparse
 import json
+import re
 import sys
+from collections import Counter
 from pathlib import Path
 from datetime import datetime
 
+try:
+    import numpy as np
+except ImportError:  # only needed for the extractive mode
+    np = None
 
-def summarize_session(session_data: dict) -> dict:
-    """Summarize a session and extract knowledge candidates."""
+DEFAULT_IDF_PATH = Path("data") / "summarize_idf.json"
+
+SHORT_SENTENCES = 2
+DETAILED_SENTENCES = 8
+MIN_SENTENCE_CHARS = 20
+MMR_LAMBDA = 0.7
+MMR_POOL_SIZE = 64
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?。！？])\s+|\n+")
+_WORD = re.compile(r"[a-z0-9_]{2,}")
+_CJK = re.compile(r"[\u4e00-\u9fff]+")
+_STOPWORDS = frozenset(
+    "the and for that this with you are was were have has had not but can will "
+    "its it's from they them then than there their what when which who how all "
+    "any our your into out about just also been being would could should".split()
+)
+
+
+_idf_cache: dict[Path, tuple[int, dict]] = {}
+
+
+def run(session_data: dict, mode: str = "heuristic", idf: str | None = None) -> dict:
+    """Skill entrypoint for warm workers: the IDF table is loaded once per change on disk."""
+    idf_table = None
+    if mode == "extractive":
+        path = Path(idf) if idf else DEFAULT_IDF_PATH
+        if path.exists():
+            mtime = path.stat().st_mtime_ns
+            cached = _idf_cache.get(path)
+            if cached is None or cached[0] != mtime:
+                cached = _idf_cache[path] = (mtime, load_idf_table(path))
+            idf_table = cached[1]
+    return summarize_session(session_data, mode=mode, idf_table=idf_table)
+
+
+def summarize_session(
+    session_data: dict,
+    mode: str = "heuristic",
+    idf_table: dict | None = None,
+) -> dict:
+    """Summarize a session and extract knowledge candidates.
+
+    ``mode="extractive"`` replaces the paragraph heuristics for the short and
+    detailed summaries with TF-IDF centroid scoring and MMR sentence selection.
+    """
     
     messages = session_data.get("messages", [])
     content_parts = []
@@ -24,8 +74,11 @@ def summarize_session(session_data: dict) -> dict:
     full_content = "\n\n".join(content_parts)
     
     # Simple extraction - in production, this would call an LLM
-    short_summary = _extract_short_summary(full_content)
-    detailed_summary = _extract_detailed_summary(full_content)
+    if mode == "extractive":
+        short_summary, detailed_summary = _extractive_summaries(messages, idf_table)
+    else:
+        short_summary = _extract_short_summary(full_content)
+        detailed_summary = _extract_detailed_summary(full_content)
     action_items = _extract_action_items(full_content)
     knowledge_candidates = _extract_knowledge_candidates(full_content, session_data)
     
@@ -56,6 +109,158 @@ def _extract_detailed_summary(content: str) -> str:
     return "\n\n".join(paragraphs[:3])
 
 
+def _tokenize(text: str) -> list[str]:
+    """Lowercase word tokens; CJK runs are split into character bigrams."""
+    text = text.lower()
+    tokens = [w for w in _WORD.findall(text) if w not in _STOPWORDS]
+    for run in _CJK.findall(text):
+        if len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+def _split_sentences(messages: list[dict]) -> list[str]:
+    """Split user/assistant messages into unique candidate sentences."""
+    sentences: dict[str, None] = {}
+    for msg in messages:
+        if msg.get("role") not in ("user", "assistant"):
+            continue
+        for sentence in _SENTENCE_SPLIT.split(msg.get("content", "")):
+            sentence = sentence.strip()
+            if len(sentence) >= MIN_SENTENCE_CHARS:
+                sentences.setdefault(sentence)
+    return list(sentences)
+
+
+def _tfidf_matrix(docs: list[list[str]], idf_table: dict | None = None):
+    """Build an L2-normalised sparse TF-IDF matrix in CSR form.
+
+    Returns ``(indptr, indices, data, n_terms)``. Without a corpus IDF table the
+    document frequencies are taken from the sentences themselves.
+    """
+    vocab: dict[str, int] = {}
+    term_ids = np.fromiter(
+        (vocab.setdefault(t, len(vocab)) for tokens in docs for t in tokens), dtype=np.int64
+    )
+    n_docs = len(docs)
+    n_terms = len(vocab)
+    doc_ids = np.repeat(np.arange(n_docs), [len(tokens) for tokens in docs])
+
+    # Unique (doc, term) pairs come back sorted by doc, i.e. already in CSR order.
+    keys, counts = np.unique(doc_ids * n_terms + term_ids, return_counts=True)
+    row_ids = keys // n_terms
+    indices_arr = keys % n_terms
+    indptr_arr = np.zeros(n_docs + 1, dtype=np.int64)
+    np.cumsum(np.bincount(row_ids, minlength=n_docs), out=indptr_arr[1:])
+
+    if idf_table:
+        corpus_docs = idf_table.get("n_docs", 0)
+        corpus_df = idf_table.get("df", {})
+        df = np.fromiter((corpus_df.get(t, 0) for t in vocab), dtype=np.float64, count=n_terms)
+        idf = np.log((1.0 + corpus_docs) / (1.0 + df)) + 1.0
+    else:
+        df = np.bincount(indices_arr, minlength=n_terms)
+        idf = np.log((1.0 + n_docs) / (1.0 + df)) + 1.0
+
+    data = (1.0 + np.log(counts.astype(np.float64))) * idf[indices_arr]
+    norms = np.sqrt(np.bincount(row_ids, weights=data * data, minlength=n_docs))
+    data /= norms[row_ids]
+    return indptr_arr, indices_arr, data, n_terms
+
+
+def _centroid_scores(indptr, indices, data, n_terms: int):
+    """Cosine similarity of every sentence to the document centroid."""
+    n_docs = len(indptr) - 1
+    centroid = np.bincount(indices, weights=data, minlength=n_terms)
+    norm = np.linalg.norm(centroid)
+    if norm:
+        centroid /= norm
+    row_ids = np.repeat(np.arange(n_docs), np.diff(indptr))
+    return np.bincount(row_ids, weights=data * centroid[indices], minlength=n_docs)
+
+
+def _mmr_select(indptr, indices, data, scores, k: int) -> list[int]:
+    """Pick ``k`` sentences by maximal marginal relevance, in document order."""
+    pool = np.argsort(-scores, kind="stable")[:max(MMR_POOL_SIZE, k)]
+    spans = [slice(indptr[i], indptr[i + 1]) for i in pool]
+    cols = np.unique(np.concatenate([indices[s] for s in spans]))
+    dense = np.zeros((len(pool), len(cols)))
+    for row, span in enumerate(spans):
+        dense[row, np.searchsorted(cols, indices[span])] = data[span]
+    similarity = dense @ dense.T
+    relevance = scores[pool]
+
+    selected: list[int] = []
+    remaining = list(range(len(pool)))
+    while remaining and len(selected) < k:
+        if selected:
+            redundancy = similarity[np.ix_(remaining, selected)].max(axis=1)
+        else:
+            redundancy = np.zeros(len(remaining))
+        mmr = MMR_LAMBDA * relevance[remaining] - (1 - MMR_LAMBDA) * redundancy
+        best = remaining.pop(int(np.argmax(mmr)))
+        selected.append(best)
+    return sorted(int(pool[i]) for i in selected)
+
+
+def _extractive_summaries(messages: list[dict], idf_table: dict | None = None) -> tuple[str, str]:
+    """Short and detailed summaries built from the most central sentences."""
+    if np is None:
+        raise RuntimeError("Extractive mode requires numpy (pip install numpy)")
+
+    sentences = []
+    docs = []
+    for sentence in _split_sentences(messages):
+        tokens = _tokenize(sentence)
+        if tokens:
+            sentences.append(sentence)
+            docs.append(tokens)
+    if not sentences:
+        return "Session content extracted.", ""
+
+    indptr, indices, data, n_terms = _tfidf_matrix(docs, idf_table)
+    scores = _centroid_scores(indptr, indices, data, n_terms)
+    short = _mmr_select(indptr, indices, data, scores, SHORT_SENTENCES)
+    detailed = _mmr_select(indptr, indices, data, scores, DETAILED_SENTENCES)
+    return " ".join(sentences[i] for i in short), "\n\n".join(sentences[i] for i in detailed)
+
+
+def build_idf_table(sessions_dir: Path) -> dict:
+    """Count per-session document frequencies over every recorded session."""
+    df: Counter = Counter()
+    n_docs = 0
+    # Large message bodies may live in the vault's content-addressed blob store.
+    blobs_dir = sessions_dir.parent / "blobs"
+    for json_file in sorted(sessions_dir.glob("*/*.json")):
+        with open(json_file, encoding="utf-8") as f:
+            session_data = json.load(f)
+        messages = session_data.get("messages", [])
+        for msg in messages:
+            if "content_ref" in msg:
+                blob = blobs_dir / msg["content_ref"][:2] / msg["content_ref"]
+                msg["content"] = blob.read_text(encoding="utf-8") if blob.exists() else ""
+        terms = set()
+        for sentence in _split_sentences(messages):
+            terms.update(_tokenize(sentence))
+        df.update(terms)
+        n_docs += 1
+    return {
+        "n_docs": n_docs,
+        "built_at": datetime.now().isoformat(),
+        "df": dict(df),
+    }
+
+
+def load_idf_table(path: Path) -> dict | None:
+    """Load a cached corpus IDF table, if one has been built."""
+    if not path.exists():
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
 def _extract_action_items(content: str) -> list[str]:
     """Extract action items from content."""
     # Look for common patterns
@@ -114,11 +319,41 @@ def _extract_knowledge_candidates(content: str, session_data: dict) -> list[dict
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: summarize_session.py <session_json_path>")
+    parser = argparse.ArgumentParser(description="Summarize a recorded session.")
+    parser.add_argument("session_path", nargs="?", type=Path, help="Session JSON file")
+    parser.add_argument(
+        "--mode",
+        choices=["heuristic", "extractive"],
+        default="heuristic",
+        help="Summary strategy (extractive = TF-IDF + MMR sentence selection)",
+    )
+    parser.add_argument(
+        "--idf",
+        type=Path,
+        default=DEFAULT_IDF_PATH,
+        help=f"Corpus IDF table (default: {DEFAULT_IDF_PATH})",
+    )
+    parser.add_argument(
+        "--build-idf",
+        type=Path,
+        metavar="SESSIONS_DIR",
+        help="Rebuild the corpus IDF table from a sessions directory and exit",
+    )
+    args = parser.parse_args()
+
+    if args.build_idf:
+        table = build_idf_table(args.build_idf)
+        args.idf.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.idf, "w", encoding="utf-8") as f:
+            json.dump(table, f, ensure_ascii=False)
+        print(f"IDF table written: {args.idf} ({table['n_docs']} sessions, {len(table['df'])} terms)")
+        return
+
+    if args.session_path is None:
+        parser.print_usage()
         sys.exit(1)
-    
-    session_path = Path(sys.argv[1])
+
+    session_path = args.session_path
     if not session_path.exists():
         print(f"Error: Session file not found: {session_path}")
         sys.exit(1)
@@ -126,7 +361,8 @@ def main():
     with open(session_path, encoding="utf-8") as f:
         session_data = json.load(f)
     
-    result = summarize_session(session_data)
+    idf_table = load_idf_table(args.idf) if args.mode == "extractive" else None
+    result = summarize_session(session_data, mode=args.mode, idf_table=idf_table)
     
     # Output as JSON for machine reading
     print(json.dumps(result, ensure_ascii=False, indent=2))
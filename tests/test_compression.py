@@ -0,0 +1,45 @@
+"""Response compression must leave event and NDJSON streams alone."""
+
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from acv_api.caching import CompressionMiddleware
+
+BODY = "line\n" * 1000
+
+app = FastAPI()
+app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+
+@app.get("/text")
+def text():
+    return PlainTextResponse(BODY)
+
+
+@app.get("/stream/{media_type:path}")
+def stream(media_type: str):
+    return StreamingResponse(iter([BODY[:2000], BODY[2000:]]), media_type=media_type)
+
+
+def test_gzip_compresses_large_bodies():
+    response = TestClient(app).get("/text", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text == BODY
+
+
+@pytest.mark.parametrize("media_type", ["text/event-stream", "application/x-ndjson"])
+@pytest.mark.parametrize("encoding", ["gzip", "br"])
+def test_streams_are_not_compressed(media_type, encoding):
+    response = TestClient(app).get(f"/stream/{media_type}", headers={"Accept-Encoding": encoding})
+    assert "content-encoding" not in response.headers
+    assert response.text == BODY
+
+
+def test_gzip_stream_of_other_types_decompresses():
+    with TestClient(app).stream("GET", "/stream/application/json", headers={"Accept-Encoding": "gzip"}) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        assert gzip.decompress(b"".join(response.iter_raw())).decode() == BODY
@@ -0,0 +1,34 @@
+"""JsonStream must decode a document the same whatever the chunk boundaries."""
+
+import io
+import json
+
+import pytest
+
+from acv_cli.jsonstream import JsonStream
+
+DOCUMENTS = [
+    {"session_id": "s", "cost": 12.5, "messages": []},
+    {"a": 1e5, "b": -3, "c": 0.25e-2, "d": [1, -2.5, 3E+2], "e": True, "f": None, "g": "x"},
+    {"messages": [{"n": 10}, {"n": 200.75}, {"n": -0.5}], "total": 12345678901234567890},
+]
+
+
+def _read(text: str, chunk_size: int) -> dict:
+    stream = JsonStream(io.StringIO(text), chunk_size=chunk_size)
+    return {
+        key: list(value) if key == "messages" else value
+        for key, value in stream.iter_object(frozenset({"messages"}))
+    }
+
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7])
+def test_numbers_split_across_chunks(document, chunk_size):
+    text = json.dumps(document)
+    assert _read(text, chunk_size) == json.loads(text)
+
+
+def test_number_at_default_buffer_edge():
+    document = {"session_id": "x" * 65506, "cost": 12.5, "messages": []}
+    assert _read(json.dumps(document), 1 << 16) == document
@@ -0,0 +1,21 @@
+"""Re-indexing a knowledge item replaces its search and related-graph rows."""
+
+from acv_cli.db import Database
+from acv_cli.models import Category, KnowledgeItem
+
+
+def test_reindexing_replaces_fts_row_and_clears_related(tmp_path):
+    db = Database(str(tmp_path / "index.db"))
+    db.add_knowledge_item(KnowledgeItem(id="other", title="giraffe", category=Category.TECH_NOTES), "other.md")
+    for summary in ("zebra", "zebra stripes", "zebra crossing"):
+        item = KnowledgeItem(id="note", title="zebra notes", summary=summary, category=Category.TECH_NOTES)
+        db.add_knowledge_item(item, "note.md")
+        if summary == "zebra":
+            db.write_related({"note": [("other", 0.5)], "other": [("note", 0.5)]})
+            assert db.items_without_related() == []
+
+    assert [row["id"] for row in db.search_fts("zebra")] == ["note"]
+    assert db.search_fts("stripes") == []
+    assert db.search_fts("crossing")[0]["summary"] == "zebra crossing"
+    assert db.items_without_related() == ["note"]
+    assert db.related_neighbours(["note"]) == {}
@@ -0,0 +1,31 @@
+"""Listing validators must change when entries are removed."""
+
+from fastapi.testclient import TestClient
+
+from acv_cli.knowledge import KnowledgeManager
+from acv_cli.models import Category
+
+
+def test_knowledge_listing_after_delete_is_not_a_304(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    from acv_api.app import app
+
+    mgr = KnowledgeManager()
+    paths = [
+        mgr.create_knowledge_item(f"Note {i}", "body", Category.TECH_NOTES, [], ["claude"])[1]
+        for i in range(2)
+    ]
+    with TestClient(app) as client:
+        first = client.get("/api/knowledge")
+        assert len(first.json()) == 2
+        assert "last-modified" not in first.headers
+
+        # Deleting a file leaves the newest mtime unchanged.
+        (tmp_path / paths[0]).unlink()
+        again = client.get(
+            "/api/knowledge",
+            headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"},
+        )
+        assert again.status_code == 200
+        assert len(again.json()) == 1
+        assert client.get("/api/knowledge", headers={"If-None-Match": first.headers["etag"]}).status_code == 200
@@ -0,0 +1,38 @@
+"""Live logs of recorders that died without an end marker count as ended."""
+
+import asyncio
+import os
+import time
+
+from acv_api.live import LiveHub
+from acv_cli.live import LiveLogPublisher
+
+
+def test_stale_log_is_not_live_and_ends_its_feed(tmp_path):
+    publisher = LiveLogPublisher("s1", live_dir=tmp_path, flush_interval=0.01)
+    publisher.publish({"role": "assistant", "content": "hi"})
+    time.sleep(0.1)
+    hub = LiveHub(tmp_path, poll_interval=0.01, idle_timeout=60)
+    assert hub.is_live("s1")
+
+    # The recorder is gone: nothing writes or touches the log any more.
+    publisher._closed.set()
+    publisher._flusher.join()
+    os.utime(publisher.path, (time.time() - 120, time.time() - 120))
+    assert not hub.is_live("s1")
+
+    async def events():
+        return [event async for event in hub.subscribe("s1")]
+
+    received = asyncio.run(events())
+    assert [event["type"] for event in received] == ["messages", "session_end"]
+    assert received[-1]["reason"] == "idle"
+
+
+def test_quiet_publisher_keeps_its_log_fresh(tmp_path):
+    publisher = LiveLogPublisher("s2", live_dir=tmp_path, flush_interval=0.01, keepalive=0.05)
+    os.utime(publisher.path, (time.time() - 120, time.time() - 120))
+    time.sleep(0.2)
+    assert LiveHub(tmp_path, idle_timeout=1).is_live("s2")
+    publisher.close()
+    assert not publisher.path.exists()
@@ -0,0 +1,37 @@
+"""Op log writes from several processes (``group_commit = false``)."""
+
+import multiprocessing
+import sqlite3
+
+from acv_cli.oplog import SESSION, OpLog
+
+PROCESSES = 3
+RECORDS = 300
+
+
+def _record(db_path: str, worker: int) -> list[str]:
+    log = OpLog(db_path, settings={"group_commit": False})
+    errors = []
+    for i in range(RECORDS):
+        try:
+            log.record(SESSION, f"session-{worker}-{i}").result()
+        except Exception as e:
+            errors.append(repr(e))
+    return errors
+
+
+def test_record_without_group_commit_from_several_processes(tmp_path):
+    db_path = str(tmp_path / "index.db")
+    origin = OpLog(db_path).origin
+
+    with multiprocessing.get_context("spawn").Pool(PROCESSES) as pool:
+        results = pool.starmap(_record, [(db_path, worker) for worker in range(PROCESSES)])
+
+    assert [error for errors in results for error in errors] == []
+    conn = sqlite3.connect(db_path)
+    seqs = [row[0] for row in conn.execute("SELECT seq FROM oplog WHERE origin = ? ORDER BY seq", (origin,))]
+    clock = int(conn.execute("SELECT value FROM oplog_meta WHERE key = 'clock'").fetchone()[0])
+    conn.close()
+    total = PROCESSES * RECORDS
+    assert seqs == list(range(1, total + 1))
+    assert clock == total
@@ -0,0 +1,52 @@
+"""Requested profiles need the token, or a loopback client when none is set."""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from acv_api.profiling import ProfilingMiddleware
+
+inner = FastAPI()
+
+
+@inner.get("/ping")
+def ping():
+    return {"ok": True}
+
+
+def _client(tmp_path, monkeypatch, token: str, host: str) -> TestClient:
+    monkeypatch.chdir(tmp_path)
+    middleware = ProfilingMiddleware(inner)
+    middleware.enabled = True
+    middleware.token = token
+    middleware.output_dir = tmp_path / "profiles"
+    return TestClient(middleware, client=(host, 50000))
+
+
+@pytest.mark.parametrize("token, host, sent, allowed", [
+    ("", "127.0.0.1", None, True),
+    ("", "::1", None, True),
+    ("", "192.168.1.20", None, False),
+    ("", "testclient", None, False),
+    ("secret", "192.168.1.20", "secret", True),
+    ("secret", "127.0.0.1", None, False),
+    ("secret", "127.0.0.1", "wrong", False),
+])
+def test_requested_profile_authorization(tmp_path, monkeypatch, token, host, sent, allowed):
+    headers = {"X-Profile": "collapsed"}
+    if sent is not None:
+        headers["X-Profile-Token"] = sent
+    response = _client(tmp_path, monkeypatch, token, host).get("/ping", headers=headers)
+    assert response.json() == {"ok": True}
+    if allowed:
+        assert "x-profile-path" in response.headers
+    else:
+        assert response.headers["x-profile-status"] == "forbidden"
+        assert not (tmp_path / "profiles").exists()
+
+
+def test_sampled_profiles_need_no_token(tmp_path, monkeypatch):
+    client = _client(tmp_path, monkeypatch, "", "192.168.1.20")
+    client.app.sample_rate = 1.0
+    response = client.get("/ping")
+    assert "x-profile-path" in response.headers
@@ -0,0 +1,28 @@
+"""/api/search: the result cache must not change what a query returns."""
+
+from fastapi.testclient import TestClient
+
+from acv_cli.models import Category, KnowledgeItem
+
+
+def _ids(response) -> list[str]:
+    return sorted(row["id"] for row in response.json()["results"])
+
+
+def test_cache_key_normalization_does_not_change_results(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    from acv_api.app import app
+
+    with TestClient(app) as client:
+        db = app.state.db
+        for item_id, title in (("double", "alpha  beta"), ("single", "alpha beta"), ("other", "gamma")):
+            db.add_knowledge_item(KnowledgeItem(id=item_id, title=title, category=Category.TECH_NOTES), "x.md")
+
+        assert _ids(client.get("/api/search", params={"q": "alpha beta"})) == ["single"]
+        # Same cache key modulo whitespace, but LIKE matches the spaces literally.
+        assert _ids(client.get("/api/search", params={"q": "alpha  beta"})) == ["double"]
+        assert _ids(client.get("/api/search", params={"q": "ALPHA  BETA"})) == ["double"]
+        assert _ids(client.get("/api/search", params={"q": "   "})) == []
+
+        streamed = client.get("/api/search", params={"q": "alpha  beta", "stream": "json"}).json()
+        assert sorted(row["id"] for row in streamed) == ["double"]
@@ -0,0 +1,37 @@
+"""SessionManager working on a vault other than the configured one."""
+
+from acv_cli.sessions import SessionManager
+
+
+def _paths(root):
+    return {
+        "base_dir": str(root),
+        "sessions_dir": str(root / "sessions"),
+        "knowledge_dir": str(root / "knowledge"),
+        "db_path": str(root / "index.db"),
+        "archive_dir": str(root / "archive"),
+    }
+
+
+def _session(i: int) -> dict:
+    return {
+        "session_id": f"2025-01-0{i + 1}T10-00-00-claude",
+        "created_at": f"2025-01-0{i + 1}T10:00:00",
+        "model_source": "claude",
+        "messages": [{"role": "user", "content": "hello", "timestamp": f"2025-01-0{i + 1}T10:00:00"}],
+    }
+
+
+def test_listing_uses_the_data_paths_override(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    configured = SessionManager()
+    for i in range(3):
+        configured.save_session(_session(i))
+
+    other = SessionManager(_paths(tmp_path / "other"))
+    assert other.list_sessions() == []
+    assert other.listing_fingerprint() == (0, 0, 0)
+
+    other.save_session(_session(5))
+    assert [s["session_id"] for s in other.list_sessions()] == ["2025-01-06T10-00-00-claude"]
+    assert len(configured.list_sessions()) == 3
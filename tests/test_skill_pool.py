@@ -0,0 +1,31 @@
+"""One-off skill commands: argument order and resource limits."""
+
+import sys
+
+import pytest
+
+from acv_cli.skill_pool import SkillError, run_command
+
+SCRIPT = """
+import json, sys
+args = sys.argv[1:]
+if "--allocate-mb" in args:
+    blob = bytearray(int(args[args.index("--allocate-mb") + 1]) * 1024 * 1024)
+print(json.dumps({"args": args, "input": json.load(open(args[0]))}))
+"""
+
+
+def test_input_path_comes_before_params(tmp_path):
+    (tmp_path / "skill.py").write_text(SCRIPT)
+    result = run_command("python skill.py", tmp_path, {"a": 1}, {"max_items": 3})
+    assert result["input"] == {"a": 1}
+    assert result["args"][0].endswith(".json")
+    assert result["args"][1:] == ["--max-items", "3"]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="no rlimits on Windows")
+def test_memory_limit_applies_to_the_command(tmp_path):
+    (tmp_path / "skill.py").write_text(SCRIPT)
+    assert run_command("python skill.py", tmp_path, {}, {"allocate_mb": 50}, memory_mb=1024)["input"] == {}
+    with pytest.raises(SkillError, match="MemoryError"):
+        run_command("python skill.py", tmp_path, {}, {"allocate_mb": 1024}, memory_mb=256)
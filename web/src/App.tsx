@@ -1,6 +1,7 @@
 import { BrowserRouter, Routes, Route } from 'react-router-dom'
 import { Layout } from './components/layout/Layout'
 import { SessionsPage } from './pages/SessionsPage'
+import { SessionPage } from './pages/SessionPage'
 import { KnowledgePage } from './pages/KnowledgePage'
 import { SkillsPage } from './pages/SkillsPage'
 
@@ -11,6 +12,7 @@ export function App() {
         <Route path="/" element={<Layout />}>
           <Route index element={<SessionsPage />} />
           <Route path="sessions" element={<SessionsPage />} />
+          <Route path="sessions/:sessionId" element={<SessionPage />} />
           <Route path="knowledge" element={<KnowledgePage />} />
           <Route path="skills" element={<SkillsPage />} />
         </Route>
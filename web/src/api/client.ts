@@ -45,6 +45,32 @@ export interface KnowledgeItem {
   summary?: string
 }
 
+export interface RelatedItem extends KnowledgeItem {
+  score: number
+}
+
+export interface RelatedItems {
+  item_id: string
+  related: RelatedItem[]
+  pending: boolean
+}
+
+export interface KnowledgeRevision {
+  version: number
+  created_at: string
+  source: 'initial' | 'create' | 'update' | 'edit'
+  sha256: string
+  size: number
+  checkpoint: boolean
+  stored: number
+}
+
+export interface KnowledgeVersion extends KnowledgeRevision {
+  item_id: string
+  markdown: string
+  content: string
+}
+
 export interface Skill {
   skill_id: string
   name: string
@@ -81,13 +107,53 @@ export const api = {
     return fetchJson<Session>(`${API_BASE}/sessions/${id}`)
   },
 
+  async getSessionMessages(id: string, offset = 0, limit = 200) {
+    const params = new URLSearchParams({ offset: String(offset), limit: String(limit) })
+    return fetchJson<Session & { message_count: number; message_offset: number }>(
+      `${API_BASE}/sessions/${id}?${params}`
+    )
+  },
+
+  subscribeSession(id: string, onMessages: (messages: Message[]) => void, onEnd?: () => void) {
+    const source = new EventSource(`${API_BASE}/sessions/${id}/live`)
+    source.addEventListener('messages', (e) => {
+      onMessages(JSON.parse((e as MessageEvent).data).messages)
+    })
+    const close = () => {
+      source.close()
+      onEnd?.()
+    }
+    source.addEventListener('session_end', close)
+    source.addEventListener('dropped', close)
+    return () => source.close()
+  },
+
   // Knowledge
-  async listKnowledge(category?: string, limit = 50) {
+  async listKnowledge(category?: string, limit = 50, model?: string) {
     const params = new URLSearchParams({ limit: String(limit) })
     if (category) params.append('category', category)
+    if (model) params.append('model', model)
     return fetchJson<KnowledgeItem[]>(`${API_BASE}/knowledge?${params}`)
   },
 
+  async getSessionKnowledge(id: string, limit = 50) {
+    const params = new URLSearchParams({ limit: String(limit) })
+    return fetchJson<KnowledgeItem[]>(`${API_BASE}/sessions/${id}/knowledge?${params}`)
+  },
+
+  async getRelated(id: string, limit = 10) {
+    const params = new URLSearchParams({ limit: String(limit) })
+    return fetchJson<RelatedItems>(`${API_BASE}/knowledge/${id}/related?${params}`)
+  },
+
+  async getHistory(id: string) {
+    return fetchJson<{ item_id: string; versions: KnowledgeRevision[] }>(`${API_BASE}/knowledge/${id}/history`)
+  },
+
+  async getVersion(id: string, version: number) {
+    return fetchJson<KnowledgeVersion>(`${API_BASE}/knowledge/${id}/versions/${version}`)
+  },
+
   async createKnowledge(data: {
     title: string
     content: string
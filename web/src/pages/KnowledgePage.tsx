@@ -1,5 +1,5 @@
 import { useState, useEffect } from 'react'
-import { api, type KnowledgeItem } from '../api/client'
+import { api, type KnowledgeItem, type RelatedItems } from '../api/client'
 import { format } from 'date-fns'
 import { Search, BookOpen, Lightbulb, Cpu, Sparkles } from 'lucide-react'
 
@@ -22,6 +22,8 @@ export function KnowledgePage() {
   const [loading, setLoading] = useState(true)
   const [search, setSearch] = useState('')
   const [categoryFilter, setCategoryFilter] = useState<string | null>(null)
+  const [selected, setSelected] = useState<string | null>(null)
+  const [related, setRelated] = useState<RelatedItems | null>(null)
 
   useEffect(() => {
     loadKnowledge()
@@ -36,6 +38,13 @@ export function KnowledgePage() {
     }
   }
 
+  useEffect(() => {
+    setRelated(null)
+    if (selected) {
+      api.getRelated(selected).then(setRelated).catch(() => setRelated(null))
+    }
+  }, [selected])
+
   const filteredItems = items.filter(item =>
     item.title.toLowerCase().includes(search.toLowerCase()) ||
     item.summary?.toLowerCase().includes(search.toLowerCase()) ||
@@ -103,7 +112,11 @@ export function KnowledgePage() {
         {filteredItems.map(item => {
           const Icon = categoryIcons[item.category] || BookOpen
           return (
-            <div key={item.id} className="card p-4 hover:shadow-md transition-shadow">
+            <div
+              key={item.id}
+              className="card p-4 hover:shadow-md transition-shadow cursor-pointer"
+              onClick={() => setSelected(selected === item.id ? null : item.id)}
+            >
               <div className="flex items-start gap-4">
                 <div className={`p-2 rounded-lg bg-gray-100`}>
                   <Icon className="w-5 h-5 text-gray-600" />
@@ -129,6 +142,25 @@ export function KnowledgePage() {
                       <span key={tag} className="text-xs text-gray-400">#{tag}</span>
                     ))}
                   </div>
+                  {selected === item.id && related?.item_id === item.id && (
+                    <div className="mt-3 pt-3 border-t border-gray-100">
+                      <div className="text-sm font-medium text-gray-900 mb-2">Related notes</div>
+                      {related.pending && (
+                        <p className="text-sm text-gray-400">Still being indexed...</p>
+                      )}
+                      {!related.pending && related.related.length === 0 && (
+                        <p className="text-sm text-gray-400">No related notes</p>
+                      )}
+                      <ul className="space-y-1 text-sm">
+                        {related.related.map(r => (
+                          <li key={r.id} className="flex items-center gap-2">
+                            <span className="badge badge-gray">{r.category}</span>
+                            <span className="text-gray-700">{r.title}</span>
+                          </li>
+                        ))}
+                      </ul>
+                    </div>
+                  )}
                 </div>
               </div>
             </div>
@@ -0,0 +1,124 @@
+import { useState, useEffect } from 'react'
+import { useParams, useNavigate } from 'react-router-dom'
+import { api, type KnowledgeItem, type Session } from '../api/client'
+import { format } from 'date-fns'
+import { ArrowLeft, ChevronLeft, ChevronRight } from 'lucide-react'
+
+// Messages per page; the API only decodes the requested page, however long the session is.
+const PAGE_SIZE = 100
+
+type SessionPageData = Session & { message_count: number; message_offset: number }
+
+export function SessionPage() {
+  const { sessionId = '' } = useParams()
+  const navigate = useNavigate()
+  const [data, setData] = useState<SessionPageData | null>(null)
+  const [offset, setOffset] = useState(0)
+  const [loading, setLoading] = useState(true)
+  const [error, setError] = useState<string | null>(null)
+  const [derived, setDerived] = useState<KnowledgeItem[]>([])
+
+  useEffect(() => {
+    loadPage()
+  }, [sessionId, offset])
+
+  useEffect(() => {
+    api.getSessionKnowledge(sessionId).then(setDerived).catch(() => setDerived([]))
+  }, [sessionId])
+
+  const loadPage = async () => {
+    setLoading(true)
+    try {
+      setData(await api.getSessionMessages(sessionId, offset, PAGE_SIZE))
+      setError(null)
+    } catch (e) {
+      setError(e instanceof Error ? e.message : String(e))
+    } finally {
+      setLoading(false)
+    }
+  }
+
+  if (error) {
+    return <div className="text-center py-12 text-gray-500">Session not found ({error})</div>
+  }
+  if (!data) {
+    return <div className="text-center py-12 text-gray-500">Loading session...</div>
+  }
+
+  const total = data.message_count
+  const end = Math.min(offset + data.messages.length, total)
+
+  const pager = (
+    <div className="flex items-center justify-between my-4 text-sm text-gray-500">
+      <span>
+        Messages {total ? offset + 1 : 0}–{end} of {total}
+      </span>
+      <div className="flex gap-2">
+        <button
+          className="btn btn-secondary"
+          disabled={loading || offset === 0}
+          onClick={() => setOffset(Math.max(offset - PAGE_SIZE, 0))}
+        >
+          <ChevronLeft className="w-4 h-4" />
+        </button>
+        <button
+          className="btn btn-secondary"
+          disabled={loading || end >= total}
+          onClick={() => setOffset(offset + PAGE_SIZE)}
+        >
+          <ChevronRight className="w-4 h-4" />
+        </button>
+      </div>
+    </div>
+  )
+
+  return (
+    <div>
+      <button className="flex items-center gap-1 text-sm text-gray-500 mb-4" onClick={() => navigate('/sessions')}>
+        <ArrowLeft className="w-4 h-4" /> Sessions
+      </button>
+
+      <div className="flex items-center gap-2 mb-1">
+        <span className="badge badge-accent capitalize">{data.model_source}</span>
+        {data.project && <span className="text-sm text-gray-500">@{data.project}</span>}
+        {data.tags.map(tag => (
+          <span key={tag} className="badge badge-gray">#{tag}</span>
+        ))}
+      </div>
+      <h2 className="text-2xl font-semibold text-gray-900">{data.session_id}</h2>
+      <div className="text-sm text-gray-400">
+        {format(new Date(data.created_at), 'yyyy-MM-dd HH:mm')}
+      </div>
+
+      {derived.length > 0 && (
+        <div className="card p-4 mt-4">
+          <div className="text-sm font-medium text-gray-900 mb-2">Knowledge from this session</div>
+          <ul className="space-y-1 text-sm">
+            {derived.map(item => (
+              <li key={item.id} className="flex items-center gap-2">
+                <span className="badge badge-gray">{item.category}</span>
+                <span className="text-gray-700">{item.title}</span>
+              </li>
+            ))}
+          </ul>
+        </div>
+      )}
+
+      {pager}
+
+      <div className="space-y-3">
+        {data.messages.map((msg, i) => (
+          <div key={offset + i} className="card p-4">
+            <div className="flex items-center justify-between mb-2 text-sm">
+              <span className="font-medium text-gray-900 capitalize">{msg.role}</span>
+              <span className="text-gray-400">#{offset + i + 1}</span>
+            </div>
+            <pre className="whitespace-pre-wrap text-sm text-gray-700 font-sans">{msg.content}</pre>
+          </div>
+        ))}
+      </div>
+
+      {data.messages.length > 0 && pager}
+    </div>
+  )
+}